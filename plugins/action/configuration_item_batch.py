@@ -7,10 +7,38 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import csv
+import io
+import itertools
+import json
 
+from ansible.errors import AnsibleActionFail, AnsibleError
+from ansible.module_utils._text import to_bytes, to_text
+from ansible.module_utils.common.validation import check_type_int
+from ansible.module_utils.six import string_types, text_type
 from ansible.plugins.action import ActionBase
 from ansible.utils.vars import merge_hash
-from jinja2 import Environment
+from jinja2 import Environment, nodes
+
+from ..module_utils.stats import merge_summaries
+
+MODULE = "servicenow.itsm.configuration_item_batch"
+
+DATASET_FILE_FORMATS = ("jsonl", "csv")
+
+DEFAULT_DATASET_CHUNK_SIZE = 1000
+
+# Options that the action handles and does not pass to the module.
+_DATASET_FILE_OPTIONS = ("dataset_file", "dataset_file_format", "dataset_chunk_size")
+
+# Markers of filters that need the environment or the context as their first
+# argument, for Jinja 3 and Jinja 2 respectively.
+_PASS_ARG_MARKERS = (
+    "jinja_pass_arg",
+    "contextfilter",
+    "evalcontextfilter",
+    "environmentfilter",
+)
 
 
 def validate(name, args, required, typ):
@@ -27,6 +55,201 @@ def validate(name, args, required, typ):
     return messages
 
 
+def _compile_const(env, node):
+    value = node.value
+    return lambda row: value
+
+
+def _compile_name(env, node):
+    if node.ctx != "load":
+        return None
+    name = node.name
+
+    def lookup(row):
+        if name in row:
+            return row[name]
+        if name in env.globals:
+            return env.globals[name]
+        return env.undefined(name=name)
+
+    return lookup
+
+
+def _compile_getattr(env, node):
+    inner = _compile_expression(env, node.node)
+    if inner is None:
+        return None
+    attr = node.attr
+    return lambda row: env.getattr(inner(row), attr)
+
+
+def _compile_getitem(env, node):
+    if not isinstance(node.arg, nodes.Const):
+        return None
+    inner = _compile_expression(env, node.node)
+    if inner is None:
+        return None
+    key = node.arg.value
+    return lambda row: env.getitem(inner(row), key)
+
+
+def _compile_filter(env, node):
+    if node.node is None:
+        return None
+    func = env.filters.get(node.name)
+    if func is None or any(getattr(func, m, None) for m in _PASS_ARG_MARKERS):
+        return None
+    if node.dyn_args is not None or node.dyn_kwargs is not None:
+        return None
+    inner = _compile_expression(env, node.node)
+    args = [_compile_expression(env, a) for a in node.args]
+    kwargs = [(k.key, _compile_expression(env, k.value)) for k in node.kwargs]
+    if inner is None or None in args or None in [v for _k, v in kwargs]:
+        return None
+    return lambda row: func(
+        inner(row), *[a(row) for a in args], **dict((k, v(row)) for k, v in kwargs)
+    )
+
+
+# Compilers of the supported expression nodes. Each returns None if it cannot
+# compile its node.
+_COMPILERS = {
+    nodes.Const: _compile_const,
+    nodes.Name: _compile_name,
+    nodes.Getattr: _compile_getattr,
+    nodes.Getitem: _compile_getitem,
+    nodes.Filter: _compile_filter,
+}
+
+
+def _compile_expression(env, node):
+    """
+    Compile a simple Jinja expression into a function of the dataset row.
+
+    Supported are variable names, attribute and constant item lookups,
+    constants and filters that take no context, with simple arguments. The
+    lookups go through env.getattr and env.getitem and the filters are the
+    ones from the environment, so the values are the same as in a rendered
+    template. Returns None for all other expressions.
+    """
+    compiler = _COMPILERS.get(type(node))
+    if compiler is None:
+        return None
+    return compiler(env, node)
+
+
+def compile_template(env, template):
+    """
+    Return a function that renders the {{ template }} for a dataset row.
+
+    Simple expressions are evaluated directly, which is much faster than
+    rendering a template for every row. The rest is rendered by Jinja.
+    """
+    source = "{{" + template + "}}"
+    body = env.parse(source).body
+    if len(body) == 1 and isinstance(body[0], nodes.Output):
+        output = body[0].nodes
+        if len(output) == 1 and not isinstance(output[0], nodes.TemplateData):
+            evaluate = _compile_expression(env, output[0])
+            if evaluate is not None:
+                return lambda row: text_type(evaluate(row))
+
+    t = env.from_string(source)
+    return lambda row: t.render(**row)
+
+
+def dataset_file_format(path, file_format=None):
+    if file_format:
+        return file_format
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_jsonl(f, path):
+    for lineno, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            raise AnsibleActionFail("{0}:{1}: {2}".format(path, lineno, e))
+        if not isinstance(row, dict):
+            raise AnsibleActionFail(
+                "{0}:{1}: rows should be JSON objects".format(path, lineno)
+            )
+        yield row
+
+
+def read_csv(f, path):
+    reader = csv.DictReader(f)
+    for row in reader:
+        if None in row:
+            raise AnsibleActionFail(
+                "{0}:{1}: row has more values than the header".format(
+                    path, reader.line_num
+                )
+            )
+        yield row
+
+
+def read_dataset(path, file_format, name=None):
+    """
+    Yield the rows of a JSONL or CSV dataset file one by one.
+
+    Errors refer to the file as name, which defaults to the path.
+    """
+    reader = read_csv if file_format == "csv" else read_jsonl
+    with io.open(
+        to_bytes(path, errors="surrogate_or_strict"), "r", encoding="utf-8", newline=""
+    ) as f:
+        for row in reader(f, name or path):
+            yield row
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def merge_chunk_results(results, offset, chunk_result):
+    """
+    Add the result of a module run for the rows that start at offset.
+
+    Returns False if the run failed for another reason than failed items,
+    after which the remaining rows should not be synced.
+    """
+    results["changed"] = results["changed"] or chunk_result.get("changed", False)
+    results["records_raw"].extend(chunk_result.get("records_raw") or [])
+    if "changed_items" in chunk_result:
+        results.setdefault("changed_items", []).extend(
+            dict(item, index=item["index"] + offset)
+            for item in chunk_result["changed_items"]
+        )
+    for key in ("warnings", "deprecations"):
+        if chunk_result.get(key):
+            results.setdefault(key, []).extend(chunk_result[key])
+    for key, count in (chunk_result.get("summary") or {}).items():
+        summary = results.setdefault("summary", {})
+        summary[key] = summary.get(key, 0) + count
+    if "api_stats" in chunk_result:
+        results["api_stats"] = merge_summaries(
+            [results.get("api_stats", {}), chunk_result["api_stats"]]
+        )
+
+    if not chunk_result.get("failed"):
+        return True
+    if "failed_items" not in chunk_result:
+        results.update(failed=True, msg=chunk_result.get("msg"))
+        return False
+    results.setdefault("failed_items", []).extend(
+        dict(f, index=f["index"] + offset) for f in chunk_result["failed_items"]
+    )
+    return True
+
+
 class ActionModule(ActionBase):
     def run(self, _tmp=None, task_vars=None):
         self._supports_check_mode = True
@@ -41,6 +264,18 @@ class ActionModule(ActionBase):
             if err_msgs:
                 return dict(result, failed=True, msg=" ".join(err_msgs))
 
+            if self._task.args.get("dataset_file") is not None:
+                if wrap_async:
+                    return dict(
+                        result,
+                        failed=True,
+                        msg="dataset_file cannot be used with async tasks",
+                    )
+                try:
+                    return merge_hash(result, self.run_dataset_file(task_vars))
+                except AnsibleActionFail as e:
+                    return merge_hash(result, e.result)
+
             args = dict(
                 self._task.args,
                 dataset=self.build_asset(
@@ -52,7 +287,7 @@ class ActionModule(ActionBase):
             return merge_hash(
                 result,
                 self._execute_module(
-                    module_name="servicenow.itsm.configuration_item_batch",
+                    module_name=MODULE,
                     module_args=args,
                     task_vars=task_vars,
                     wrap_async=wrap_async,
@@ -68,20 +303,102 @@ class ActionModule(ActionBase):
         # We only validate arguments that we use. We let the module
         # validate the rest (like auth data).
         messages = []
-        messages.extend(validate("dataset", args, required=True, typ=list))
+        if args.get("dataset_file") is None:
+            messages.extend(validate("dataset", args, required=True, typ=list))
+        else:
+            if args.get("dataset") is not None:
+                messages.append("dataset and dataset_file are mutually exclusive")
+            if args.get("relations"):
+                messages.append("relations cannot be used with dataset_file")
+            if args.get("sync") == "authoritative":
+                messages.append("sync=authoritative cannot be used with dataset_file")
+            messages.extend(
+                validate("dataset_file", args, required=True, typ=string_types)
+            )
+            file_format = args.get("dataset_file_format")
+            if file_format is not None and file_format not in DATASET_FILE_FORMATS:
+                messages.append(
+                    "dataset_file_format should be one of {0}".format(
+                        ", ".join(DATASET_FILE_FORMATS)
+                    )
+                )
+            chunk_size = args.get("dataset_chunk_size")
+            if chunk_size is not None:
+                try:
+                    if check_type_int(chunk_size) < 1:
+                        messages.append("dataset_chunk_size should be at least 1")
+                except TypeError:
+                    messages.append("dataset_chunk_size should be an integer")
         messages.extend(validate("map", args, required=True, typ=dict))
 
         return messages
 
+    def find_dataset_file(self, path):
+        try:
+            return self._find_needle("files", path)
+        except AnsibleError as e:
+            raise AnsibleActionFail(to_text(e))
+
+    def run_dataset_file(self, task_vars):
+        """
+        Sync the rows of the dataset file in chunks, one module run per chunk.
+
+        Only one chunk of rows is in memory at a time and the results of the
+        runs are merged as if the module synced the whole dataset at once.
+        """
+        args = self._task.args
+        path = self.find_dataset_file(args["dataset_file"])
+        file_format = dataset_file_format(path, args.get("dataset_file_format"))
+        chunk_size = check_type_int(
+            args.get("dataset_chunk_size") or DEFAULT_DATASET_CHUNK_SIZE
+        )
+        module_args = dict(
+            (k, v) for k, v in args.items() if k not in _DATASET_FILE_OPTIONS
+        )
+
+        results = dict(changed=False, records_raw=[])
+        offset = 0
+        # A vault encrypted file is decrypted into a temporary file.
+        real_path = self._loader.get_real_file(path)
+        try:
+            for rows in chunked(read_dataset(real_path, file_format, path), chunk_size):
+                chunk_result = self._execute_module(
+                    module_name=MODULE,
+                    module_args=dict(
+                        module_args, dataset=self.build_asset(args["map"], rows), map={}
+                    ),
+                    task_vars=task_vars,
+                )
+                if not merge_chunk_results(results, offset, chunk_result):
+                    return results
+                offset += len(rows)
+        except (IOError, OSError, UnicodeError, csv.Error) as e:
+            raise AnsibleActionFail(
+                "Cannot read dataset_file {0}: {1}".format(path, to_text(e))
+            )
+        finally:
+            self._loader.cleanup_tmp_file(real_path)
+
+        failures = results.get("failed_items")
+        if failures:
+            results.update(
+                failed=True,
+                msg="{0} of {1} dataset items failed, the first one ({2}) with: "
+                "{3}".format(
+                    len(failures), offset, failures[0]["index"], failures[0]["msg"]
+                ),
+            )
+        return results
+
     @staticmethod
     def build_asset(mapping, dataset):
         cmdb_items = [{} for _i in range(len(dataset))]
         env = Environment()
 
         for key, template in mapping.items():
-            t = env.from_string("{{" + template + "}}")
+            render = compile_template(env, template)
 
             for input, output in zip(dataset, cmdb_items):
-                output[key] = t.render(**input)
+                output[key] = render(input)
 
         return cmdb_items
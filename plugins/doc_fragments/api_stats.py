@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r"""
+options:
+  api_stats:
+    description:
+      - Return statistics about the requests the module made to the instance in the I(api_stats) key.
+      - The statistics contain the total number of requests, bytes sent and received, seconds spent
+        waiting for the instance, retries of overloaded requests, and the number of OAuth token requests.
+      - I(received_bytes) is the number of bytes received over the network, which is smaller than
+        I(decoded_bytes) when the instance compressed the responses.
+      - The same numbers are also reported for every HTTP method and endpoint in the I(endpoints) list.
+        Record sys_ids in endpoint paths are replaced with C({sys_id}).
+    type: bool
+    default: false
+    version_added: '2.11.0'
+"""
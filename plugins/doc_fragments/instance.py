@@ -128,4 +128,101 @@ options:
         default: True
         type: bool
         version_added: '2.3.0'
+      keep_alive:
+        description:
+          - Reuse HTTP/1.1 connections to the instance instead of opening a new
+            connection (and doing a new TLS handshake) for every request.
+          - Connections are kept in a thread-safe pool and transparently re-established
+            if the instance closes them.
+          - If not set, the value of the C(SN_KEEP_ALIVE) environment variable will be used.
+        type: bool
+        default: false
+        version_added: '2.11.0'
+      pool_size:
+        description:
+          - Maximum number of idle connections kept open per host when I(keep_alive=true).
+        type: int
+        default: 10
+        version_added: '2.11.0'
+      pool_idle_timeout:
+        description:
+          - Number of seconds an idle connection can stay in the pool before it is closed
+            instead of being reused.
+          - Only used when I(keep_alive=true).
+        type: float
+        default: 60
+        version_added: '2.11.0'
+      token_cache_path:
+        description:
+          - Path to a file in which OAuth access tokens are cached between module invocations.
+          - Tokens are cached per host, I(client_id), I(grant_type) and user, and are
+            refreshed shortly before they expire.
+          - The file is locked while it is in use, so it can be shared by parallel forks.
+          - Access tokens are stored unencrypted. The file is only readable by its owner.
+          - If not set, the value of the C(SN_TOKEN_CACHE_PATH) environment variable will be used.
+          - If not set by any means, every module invocation requests a new access token.
+          - Only used for OAuth authentication (when I(client_id) and I(client_secret) are set).
+        type: path
+        version_added: '2.11.0'
+      retries:
+        description:
+          - Number of times a request is retried when the instance responds with
+            C(429 Too Many Requests), C(502), C(503) or C(504).
+          - Retries are delayed by the time the instance asks for in its C(Retry-After) or
+            C(X-RateLimit-Reset) response header, or by a jittered exponential backoff.
+          - Set to C(0) to disable retries.
+          - If not set, the value of the C(SN_RETRIES) environment variable will be used.
+        type: int
+        default: 3
+        version_added: '2.11.0'
+      retry_methods:
+        description:
+          - HTTP methods of the requests that are retried.
+          - By default, only idempotent requests are retried. Add C(POST) or C(PATCH) to the list
+            to also retry requests that create or update records.
+        type: list
+        elements: str
+        choices: [ DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT ]
+        default: [ DELETE, GET, HEAD, OPTIONS, PUT ]
+        version_added: '2.11.0'
+      retry_max_wait:
+        description:
+          - Maximum total number of seconds spent waiting between the retries of a single request.
+          - If the instance asks us to wait longer, the request fails without waiting.
+        type: float
+        default: 60
+        version_added: '2.11.0'
+      batch_requests:
+        description:
+          - Combine independent requests into a single call to the ServiceNow Batch API
+            (C(/api/now/v1/batch)).
+          - Requests are only combined in the following cases.
+          - The lookups of the referenced records (users, groups, configuration items, problems,
+            change requests and standard change templates) in M(servicenow.itsm.catalog_request),
+            M(servicenow.itsm.change_request), M(servicenow.itsm.change_request_task) and
+            M(servicenow.itsm.problem_task).
+          - The removal of the attachments of a record in M(servicenow.itsm.change_request),
+            M(servicenow.itsm.configuration_item), M(servicenow.itsm.incident) and
+            M(servicenow.itsm.problem).
+          - The retirement of records with I(sync=authoritative) in
+            M(servicenow.itsm.configuration_item_batch).
+          - All the other requests are sent one at a time, whatever the value of this option.
+          - The user needs access to the Batch API on the instance.
+        type: bool
+        default: false
+        version_added: '2.11.0'
+      batch_max_requests:
+        description:
+          - Maximum number of requests combined into a single Batch API call.
+          - More requests are split into several calls.
+        type: int
+        default: 50
+        version_added: '2.11.0'
+      batch_max_payload_size:
+        description:
+          - Maximum size in bytes of the requests combined into a single Batch API call.
+          - A single request that is larger than this is still sent, alone.
+        type: int
+        default: 1048576
+        version_added: '2.11.0'
 """
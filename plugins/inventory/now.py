@@ -218,6 +218,142 @@ options:
     type: int
     default: 1000
     version_added: 2.5.0
+  page_workers:
+    description:
+      - Number of pages of records that are fetched concurrently.
+      - The plugin fetches the first page on its own. Once the instance reports the total number of
+        matching records, the remaining pages are fetched with up to I(page_workers) parallel requests
+        and reassembled in order.
+      - Keep this value below the number of concurrent requests the instance allows for the user.
+    type: int
+    default: 1
+    env:
+      - name: SN_PAGE_WORKERS
+    version_added: 2.11.0
+  pagination:
+    description:
+      - How the plugin pages through the records of the table.
+      - With V(offset), pages are requested with C(sysparm_offset). Deep offsets get slower on the
+        instance, and records that are inserted or deleted during the pull shift the page boundaries,
+        which can cause duplicated or skipped records.
+      - With V(keyset), records are ordered by C(sys_id) and every page starts after the last C(sys_id)
+        of the previous one. Every page costs the same, regardless of its depth, and there are no
+        duplicated or skipped records. This mode cannot be combined with C(ORDERBY) in I(sysparm_query)
+        and does not use I(page_workers).
+    type: str
+    choices: [ offset, keyset ]
+    default: offset
+    env:
+      - name: SN_PAGINATION
+    version_added: 2.11.0
+  count_strategy:
+    description:
+      - Which queries make the instance count the matching records.
+      - With V(every), every page is counted. This was the behavior before version 2.11.0, set this
+        value to keep it.
+      - With V(first), only the first page is counted. The total is used to page through the rest of
+        the records and to fetch them concurrently with I(page_workers). Records that are inserted
+        while the plugin pages through the table are not fetched.
+      - With V(never), no page is counted, and the plugin stops at the first empty page. Pages can be
+        shorter than I(sysparm_limit) when ACLs hide some of their records, so a short page does not
+        end the pull.
+    type: str
+    choices: [ every, first, never ]
+    default: first
+    env:
+      - name: SN_COUNT_STRATEGY
+    version_added: 2.11.0
+  adaptive_sysparm_limit:
+    description:
+      - Adjust the page size while the records are fetched.
+      - The first page uses I(sysparm_limit) (or I(enhanced_sysparm_limit) for the relationship
+        table). After every page, the page size moves towards the number of records the instance
+        returns in about five seconds, but it never more than doubles or halves from one page to the
+        next. A request that times out is retried with half the page size.
+      - Pages are fetched one at a time, so this does not use I(page_workers).
+      - The chosen page sizes are displayed with C(-v) and are a good starting point for
+        I(sysparm_limit) and I(enhanced_sysparm_limit).
+    type: bool
+    default: false
+    env:
+      - name: SN_ADAPTIVE_SYSPARM_LIMIT
+    version_added: 2.11.0
+  min_sysparm_limit:
+    description:
+      - Smallest page size I(adaptive_sysparm_limit) can choose.
+    type: int
+    default: 100
+    env:
+      - name: SN_MIN_SYSPARM_LIMIT
+    version_added: 2.11.0
+  max_sysparm_limit:
+    description:
+      - Largest page size I(adaptive_sysparm_limit) can choose.
+    type: int
+    default: 10000
+    env:
+      - name: SN_MAX_SYSPARM_LIMIT
+    version_added: 2.11.0
+  checkpoint_dir:
+    description:
+      - Directory where the plugin keeps checkpoints of the records it has fetched so far.
+      - If fetching the records fails midway, for example because a page timed out, the next run
+        with the same configuration picks up the saved records and continues from the page that
+        failed instead of starting over.
+      - Checkpoints are removed once all records are fetched. Checkpoints older than a day are not
+        resumed.
+      - With I(pagination=offset), records that are inserted or deleted between the runs shift the
+        page boundaries. Use I(pagination=keyset) to resume long pulls reliably.
+      - The fetched records are stored unencrypted, as JSON. The directory is created readable only
+        by its owner if it does not exist, and so are the checkpoint files.
+    type: path
+    env:
+      - name: SN_CHECKPOINT_DIR
+    version_added: 2.11.0
+  stream:
+    description:
+      - Decode records while the pages of records are downloaded, instead of reading
+        a complete page into memory first.
+      - This lowers the peak memory usage of the plugin when using a large I(sysparm_limit).
+    type: bool
+    default: false
+    env:
+      - name: SN_STREAM
+    version_added: 2.11.0
+  keep_alive:
+    description:
+      - Reuse HTTP/1.1 connections to the instance for all the queries the plugin makes,
+        instead of doing a new TCP and TLS handshake for every page of records.
+    type: bool
+    default: false
+    env:
+      - name: SN_KEEP_ALIVE
+    version_added: 2.11.0
+  token_cache_path:
+    description:
+      - Path to a file in which OAuth access tokens are cached between inventory refreshes and
+        module invocations that use the same file.
+      - See the I(instance.token_cache_path) option of the modules for details.
+    type: path
+    env:
+      - name: SN_TOKEN_CACHE_PATH
+    version_added: 2.11.0
+  retries:
+    description:
+      - Number of times a request is retried when the instance is overloaded and responds with
+        C(429 Too Many Requests), C(502), C(503) or C(504).
+      - Retries honor the C(Retry-After) and C(X-RateLimit-Reset) response headers.
+    type: int
+    default: 3
+    env:
+      - name: SN_RETRIES
+    version_added: 2.11.0
+  retry_max_wait:
+    description:
+      - Maximum total number of seconds spent waiting between the retries of a single request.
+    type: float
+    default: 60
+    version_added: 2.11.0
 
 """
 
@@ -547,6 +683,7 @@ from ..module_utils.relations import (
     enhance_records_with_rel_groups,
 )
 from ..module_utils.table import TableClient
+from ..module_utils.snow import PageSizer
 
 try:
     from ansible.template import trust_as_template as _trust_as_template
@@ -645,7 +782,9 @@ def fetch_records(table_client, table, query, fields=None, is_encoded_query=Fals
     if fields:
         snow_query["sysparm_fields"] = ",".join(fields)
 
-    return table_client.list_records(table, snow_query)
+    # Records are yielded as the pages arrive, while the next page is being
+    # fetched in the background.
+    return table_client.iter_records(table, snow_query)
 
 
 class ConstructableWithLookup(Constructable):
@@ -864,11 +1003,7 @@ class InventoryModule(BaseInventoryPlugin, ConstructableWithLookup, Cacheable):
                 pass
 
         if not records:
-            self.__populate_records_from_remote(enhanced, path, columns)
-            try:
-                records = self._cache[self.cache_key][self._cache_sub_key]
-            except KeyError:
-                pass
+            records = self.__populate_records_from_remote(enhanced, path, columns)
 
         self.fill_constructed(
             records,
@@ -898,7 +1033,14 @@ class InventoryModule(BaseInventoryPlugin, ConstructableWithLookup, Cacheable):
         self.update_cache = self.get_option("cache") and not cache
 
     def __populate_records_from_remote(self, enhanced, path, columns):
+        """
+        Yield the records of the table as they arrive. If caching is enabled,
+        the records are cached after the last one.
 
+        Referenced columns and relationship groups are added to all the
+        records at once, so with those the records are only yielded after the
+        last one is in.
+        """
         query = self.get_option("query")
         sysparm_query = self.get_option("sysparm_query")
 
@@ -922,6 +1064,8 @@ class InventoryModule(BaseInventoryPlugin, ConstructableWithLookup, Cacheable):
         )
 
         referenced_columns = [x for x in columns if "." in x]
+        if referenced_columns or enhanced:
+            records = list(records)
         if referenced_columns:
             self.__fetch_referenced_columns(
                 table_client,
@@ -935,7 +1079,37 @@ class InventoryModule(BaseInventoryPlugin, ConstructableWithLookup, Cacheable):
         if enhanced:
             self.__populate_enhanced_records_from_remote(enhanced_table_client, records)
 
-        self._cache[self.cache_key] = {self._cache_sub_key: records}
+        cached = [] if self.get_option("cache") else None
+        for record in records:
+            if cached is not None:
+                cached.append(record)
+            yield record
+
+        self.__display_client_stats(table_client, enhanced_table_client)
+        table_client.client.close()
+
+        if cached is not None:
+            self._cache[self.cache_key] = {self._cache_sub_key: cached}
+
+    def __display_client_stats(self, table_client, enhanced_table_client):
+        self.display.vv(
+            "ServiceNow API statistics: {0}".format(table_client.client.stats.summary())
+        )
+        if table_client.page_sizer:
+            self.display.v(
+                "ServiceNow sysparm_limit: {0}".format(
+                    table_client.page_sizer.summary()
+                )
+            )
+        if (
+            enhanced_table_client is not table_client
+            and enhanced_table_client.page_sizer
+        ):
+            self.display.v(
+                "ServiceNow enhanced_sysparm_limit: {0}".format(
+                    enhanced_table_client.page_sizer.summary()
+                )
+            )
 
     def __populate_enhanced_records_from_remote(self, table_client, records):
         enhanced_query = self.get_option("enhanced_query")
@@ -960,25 +1134,57 @@ class InventoryModule(BaseInventoryPlugin, ConstructableWithLookup, Cacheable):
 
     def __create_table_client(self):
         try:
-            client = Client(**self._get_instance())
+            client = Client(
+                keep_alive=self.get_option("keep_alive"),
+                token_cache_path=self.get_option("token_cache_path"),
+                retries=self.get_option("retries"),
+                retry_max_wait=self.get_option("retry_max_wait"),
+                **self._get_instance()
+            )
         except ServiceNowError as e:
             raise AnsibleParserError(e)
 
+        options = dict(
+            stream=self.get_option("stream"),
+            page_workers=self.get_option("page_workers"),
+            pagination=self.get_option("pagination"),
+            count_strategy=self.get_option("count_strategy"),
+            checkpoint_dir=self.get_option("checkpoint_dir"),
+        )
         sysparm_limit = self.get_option("sysparm_limit")
         if sysparm_limit:
-            table_client = TableClient(client, batch_size=sysparm_limit)
+            table_client = TableClient(
+                client,
+                batch_size=sysparm_limit,
+                page_sizer=self.__create_page_sizer(sysparm_limit),
+                **options
+            )
         else:
-            table_client = TableClient(client)
+            table_client = TableClient(
+                client, page_sizer=self.__create_page_sizer(1000), **options
+            )
 
         enhanced_table_client = table_client
         enhanced_sysparm_limit = self.get_option("enhanced_sysparm_limit")
         if self.get_option("enhanced") and enhanced_sysparm_limit:
             enhanced_table_client = TableClient(
-                client, batch_size=enhanced_sysparm_limit
+                client,
+                batch_size=enhanced_sysparm_limit,
+                page_sizer=self.__create_page_sizer(enhanced_sysparm_limit),
+                **options
             )
 
         return table_client, enhanced_table_client
 
+    def __create_page_sizer(self, sysparm_limit):
+        if not self.get_option("adaptive_sysparm_limit"):
+            return None
+        return PageSizer(
+            sysparm_limit,
+            minimum=self.get_option("min_sysparm_limit"),
+            maximum=self.get_option("max_sysparm_limit"),
+        )
+
     def __get_query_columns(self, columns):
         query_limit_columns = self.get_option("query_limit_columns")
         query_additional_columns = self.get_option("query_additional_columns")
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from . import errors
+
+# Aggregate functions of the Aggregate API and the query parameters that list
+# the fields to compute them for.
+FUNCTIONS = dict(
+    avg="sysparm_avg_fields",
+    sum="sysparm_sum_fields",
+    min="sysparm_min_fields",
+    max="sysparm_max_fields",
+)
+
+
+def _number(value):
+    # The Aggregate API returns all numbers as strings. Minimum and maximum
+    # values of non-numeric fields (dates, strings) are left as they are.
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            pass
+    return value
+
+
+def _stats(data):
+    stats = dict()
+    if "count" in data:
+        stats["count"] = int(data["count"])
+    for function in FUNCTIONS:
+        if function in data:
+            stats[function] = dict(
+                (field, _number(value)) for field, value in data[function].items()
+            )
+    return stats
+
+
+def _group(data):
+    group = dict()
+    display = dict()
+    for field in data.get("groupby_fields", []):
+        group[field["field"]] = field["value"]
+        if "display_value" in field:
+            display[field["field"]] = field["display_value"]
+    result = dict(group_by=group, **_stats(data.get("stats", {})))
+    if display:
+        result["display_value"] = display
+    return result
+
+
+def _params(query, count, fields, group_by, having, order_by, display_value):
+    params = dict()
+    if query:
+        params["sysparm_query"] = query
+    if count:
+        params["sysparm_count"] = "true"
+    for function, names in fields.items():
+        if names:
+            params[FUNCTIONS[function]] = ",".join(names)
+    if group_by:
+        params["sysparm_group_by"] = ",".join(group_by)
+    if having:
+        params["sysparm_having"] = having
+    if order_by:
+        params["sysparm_orderby"] = ",".join(order_by)
+    if display_value is not None:
+        params["sysparm_display_value"] = display_value
+    return params
+
+
+def _result(result, group_by):
+    if not group_by:
+        return _stats(result.get("stats", {}))
+    # Instances return a single group as a dict.
+    if isinstance(result, dict):
+        result = [result]
+    return [_group(group) for group in result]
+
+
+class AggregateClient:
+    """
+    Client for the Aggregate API (api/now/stats).
+
+    The instance computes counts, sums, averages and extremes of the records
+    that match a query, so only the results are transferred instead of all
+    the records.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def path(self, table):
+        return "/".join(self.client.api_path + ("stats", table))
+
+    def aggregate(
+        self,
+        table,
+        query=None,
+        count=True,
+        avg=None,
+        sum=None,
+        min=None,
+        max=None,
+        group_by=None,
+        having=None,
+        order_by=None,
+        display_value=None,
+    ):
+        """
+        Return the aggregates of the table records that match the query.
+
+        table          -- table name (ex: "incident")
+        query          -- encoded query that selects the records
+        count          -- if true, count the records
+        avg, sum,
+        min, max       -- lists of fields to compute the aggregate for
+        group_by       -- list of fields to group the records by
+        having         -- aggregate^field^operator^value condition that
+                          groups must meet
+        order_by       -- list of fields or aggregates to order the groups by
+        display_value  -- true, false or all, for the values of group_by
+                          fields
+
+        Without group_by, the result is a single dict with a count key and a
+        key for every aggregate function that maps fields to values.
+        Otherwise, the result is a list of such dicts, one per group, with
+        the values of the group_by fields under the group_by key.
+        """
+        fields = dict(avg=avg, sum=sum, min=min, max=max)
+        if not count and not any(fields.values()):
+            raise errors.ServiceNowError(
+                "At least one aggregate is required: count or one of {0}.".format(
+                    ", ".join(sorted(FUNCTIONS))
+                )
+            )
+
+        params = _params(
+            query, count, fields, group_by, having, order_by, display_value
+        )
+        response = self.client.get(self.path(table), query=params)
+        if response.status != 200:
+            # The Aggregate API responds with 404 to unknown tables.
+            raise errors.UnexpectedAPIResponse(response.status, response.data)
+
+        return _result(response.json["result"], group_by)
@@ -158,6 +158,50 @@ SHARED_SPECS = dict(
                 type="bool",
                 default=True,
             ),
+            keep_alive=dict(
+                type="bool",
+                default=False,
+                fallback=(env_fallback, ["SN_KEEP_ALIVE"]),
+            ),
+            pool_size=dict(
+                type="int",
+                default=10,
+            ),
+            pool_idle_timeout=dict(
+                type="float",
+                default=60,
+            ),
+            token_cache_path=dict(
+                type="path",
+                fallback=(env_fallback, ["SN_TOKEN_CACHE_PATH"]),
+            ),
+            retries=dict(
+                type="int",
+                default=3,
+                fallback=(env_fallback, ["SN_RETRIES"]),
+            ),
+            retry_methods=dict(
+                type="list",
+                elements="str",
+                choices=["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"],
+                default=["DELETE", "GET", "HEAD", "OPTIONS", "PUT"],
+            ),
+            retry_max_wait=dict(
+                type="float",
+                default=60,
+            ),
+            batch_requests=dict(
+                type="bool",
+                default=False,
+            ),
+            batch_max_requests=dict(
+                type="int",
+                default=50,
+            ),
+            batch_max_payload_size=dict(
+                type="int",
+                default=1048576,
+            ),
         ),
         required_together=[
             ("client_id", "client_secret"),
@@ -214,6 +258,7 @@ SHARED_SPECS = dict(
             ),
         ),
     ),
+    api_stats=dict(type="bool", default=False),
     sysparm_display_value=dict(
         type="str",
         choices=[
@@ -8,10 +8,11 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import collections
+import itertools
 import mimetypes
 import os
 
-from . import errors
+from . import errors, snow
 
 
 def _path(api_path, *subpaths):
@@ -26,11 +27,19 @@ class AttachmentClient:
         self.batch_size = batch_size
 
     def list_records(self, query=None):
+        return [r for page in self._iter_pages(query) for r in page]
+
+    def iter_records(self, query=None):
+        # Fetch the next page in the background while the caller works on
+        # the current one.
+        records = itertools.chain.from_iterable(self._iter_pages(query))
+        return snow.prefetch(records, self.batch_size)
+
+    def _iter_pages(self, query=None):
         base_query = dict(query or {}, sysparm_limit=self.batch_size)
 
         offset = 0
         total = 1  # Dummy value that ensures loop executes at least once
-        result = []
 
         while offset < total:
             response = self.client.get(
@@ -38,12 +47,10 @@ class AttachmentClient:
                 query=dict(base_query, sysparm_offset=offset),
             )
 
-            result.extend(response.json["result"])
+            yield response.json["result"]
             total = int(response.headers["x-total-count"])
             offset += self.batch_size
 
-        return result
-
     def create_record(self, query, data, mime_type, check_mode):
         if check_mode:
             return query
@@ -85,10 +92,22 @@ class AttachmentClient:
             self.client.delete(_path(self.client.api_path, record["sys_id"]))
 
     def delete_attached_records(self, table, table_sys_id, check_mode):
-        for record in self.list_records(
-            dict(table_name=table, table_sys_id=table_sys_id)
-        ):
-            self.delete_record(record, check_mode)
+        records = self.list_records(dict(table_name=table, table_sys_id=table_sys_id))
+        if check_mode or not getattr(self.client, "batch_requests", False):
+            for record in records:
+                self.delete_record(record, check_mode)
+            return
+
+        with self.client.batch() as batch:
+            pending = [
+                batch.delete(_path(self.client.api_path, record["sys_id"]))
+                for record in records
+            ]
+        for request in pending:
+            if request.response.status not in (200, 204):
+                raise errors.UnexpectedAPIResponse(
+                    request.response.status, request.response.data
+                )
 
     def update_records(self, table, table_sys_id, metadata_dict, records, check_mode):
         mapped_records = dict((r["file_name"], r) for r in records)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import base64
+import itertools
+import json
+
+from ansible.module_utils.common.text.converters import to_bytes
+
+from .errors import ServiceNowError
+
+BATCH_PATH = "api/now/v1/batch"
+
+# Defaults for the limits of a single Batch API request. Instances reject
+# batches that take too long to execute, so it is better to send a few
+# smaller batches than one huge batch.
+MAX_REQUESTS = 50
+MAX_PAYLOAD_SIZE = 1024 * 1024
+
+
+class BatchRequest:
+    """
+    Request that is queued in a batch.
+
+    The response is available once the batch is flushed.
+    """
+
+    def __init__(self, id, method, url, headers, body=None):
+        self.id = id
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self._response = None
+
+    @property
+    def response(self):
+        if self._response is None:
+            raise ServiceNowError(
+                "Batched request {0} {1} has not been sent yet.".format(
+                    self.method, self.url
+                )
+            )
+        return self._response
+
+    def to_json(self):
+        data = dict(
+            id=self.id,
+            method=self.method,
+            url=self.url,
+            headers=[dict(name=k, value=v) for k, v in sorted(self.headers.items())],
+        )
+        if self.body is not None:
+            data["body"] = base64.b64encode(to_bytes(self.body)).decode("ascii")
+        return data
+
+
+class Batch:
+    """
+    Queue of requests that are sent to the instance through the Batch API.
+
+    Requests are queued with add (or one of its shortcuts) and sent when the
+    batch is flushed, which also happens when the batch is used as a context
+    manager. Queued requests are split into as many Batch API requests as
+    needed to keep every one of them within max_requests sub-requests and
+    max_payload_size bytes. Sub-requests that the instance did not service
+    in time are sent again in the next Batch API request.
+    """
+
+    def __init__(
+        self, client, max_requests=MAX_REQUESTS, max_payload_size=MAX_PAYLOAD_SIZE
+    ):
+        self.client = client
+        self.max_requests = max_requests
+        self.max_payload_size = max_payload_size
+
+        self._queue = []
+        self._request_ids = itertools.count(1)
+        self._batch_ids = itertools.count(1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def add(self, method, path, query=None, data=None):
+        # Sub-request URLs are relative to the instance.
+        url = self.client._url(path, query)[len(self.client.host) :]
+        headers = dict(Accept="application/json")
+        body = None
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+            body = self.client.json_codec.dumps(data)
+
+        request = BatchRequest(
+            str(next(self._request_ids)), method, url or "/", headers, body
+        )
+        self._queue.append(request)
+        return request
+
+    def get(self, path, query=None):
+        return self.add("GET", path, query=query)
+
+    def post(self, path, data, query=None):
+        return self.add("POST", path, query=query, data=data)
+
+    def patch(self, path, data, query=None):
+        return self.add("PATCH", path, query=query, data=data)
+
+    def delete(self, path, query=None):
+        return self.add("DELETE", path, query=query)
+
+    def flush(self):
+        queue, self._queue = self._queue, []
+        while queue:
+            chunk, queue = self._split(queue)
+            queue = self._send(chunk) + queue
+
+    def _split(self, queue):
+        size = 0
+        for i, request in enumerate(queue):
+            size += len(json.dumps(request.to_json()))
+            # Always send at least one request, even an oversized one.
+            if i and (i >= self.max_requests or size > self.max_payload_size):
+                return queue[:i], queue[i:]
+        return queue, []
+
+    def _send(self, chunk):
+        payload = dict(
+            batch_request_id=str(next(self._batch_ids)),
+            rest_requests=[r.to_json() for r in chunk],
+        )
+        serviced = dict(
+            (r["id"], r)
+            for r in self.client.post(BATCH_PATH, payload).json.get(
+                "serviced_requests", []
+            )
+        )
+
+        unserviced = []
+        for request in chunk:
+            if request.id in serviced:
+                request._response = self._response(serviced[request.id])
+            else:
+                unserviced.append(request)
+
+        if len(unserviced) == len(chunk):
+            raise ServiceNowError(
+                "Instance did not service any of the {0} batched requests.".format(
+                    len(chunk)
+                )
+            )
+        return unserviced
+
+    def _response(self, data):
+        body = base64.b64decode(data["body"]) if data.get("body") else b""
+        return self.client._make_response(
+            data["status_code"],
+            body,
+            [(h["name"], h["value"]) for h in data.get("headers", [])],
+        )
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import time
+
+from .errors import ServiceNowError
+from .locked_file import LockedFile, dump_line, parse_line
+
+VERSION = 1
+
+# Checkpoints older than this many seconds are discarded instead of resumed,
+# because the records in them are likely out of date.
+MAX_AGE = 24 * 60 * 60
+
+# Query parameters that only control paging and do not change which records
+# a listing returns.
+_PAGING_PARAMETERS = ("sysparm_limit", "sysparm_offset")
+
+
+def fingerprint(host, username, api_path, query, pagination):
+    """
+    Return the key of the checkpoint of a listing.
+
+    Listings with the same key return the same records, regardless of the
+    page size they use.
+    """
+    query = dict(
+        (k, v) for k, v in (query or {}).items() if k not in _PAGING_PARAMETERS
+    )
+    data = json.dumps(
+        [host.rstrip("/"), username or "", api_path.strip("/"), query, pagination],
+        sort_keys=True,
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class Checkpoint(LockedFile):
+    """
+    Pages of records that a listing has fetched so far.
+
+    The checkpoint is a JSON lines file. The first line identifies the
+    listing and every following line holds the records of one page and the
+    pagination state after it. Pages are appended as they arrive, so a
+    listing that fails midway leaves all its complete pages behind.
+
+    If another process holds the lock of the checkpoint, the checkpoint is
+    inactive: it loads no pages and saves none, and the listing runs as if
+    there was no checkpoint.
+    """
+
+    kind = "checkpoint"
+
+    def __init__(self, directory, key, max_age=MAX_AGE):
+        super(Checkpoint, self).__init__(
+            os.path.join(os.path.expanduser(directory), key + ".jsonl")
+        )
+        self.key = key
+        self.max_age = max_age
+
+    def load(self):
+        """
+        Yield (state, records) for all the saved pages, in order.
+
+        Missing, stale and foreign checkpoints have no pages.
+        """
+        if not self.active:
+            return
+
+        try:
+            f = open(self.path, "rb")
+        except (IOError, OSError):
+            return
+
+        with f:
+            header = parse_line(f.readline())
+            if not header or header.get("version") != VERSION:
+                return
+            if header.get("key") != self.key:
+                return
+            if header.get("created", 0) + self.max_age < time.time():
+                return
+
+            for entry in self._entries(f):
+                yield entry["state"], entry["records"]
+
+    def save(self, state, records):
+        if not self.active:
+            return
+
+        try:
+            if not self._file:
+                # Append to the pages that were loaded.
+                self._append(dict(version=VERSION, key=self.key, created=time.time()))
+            self._file.write(dump_line(dict(state=state, records=records)))
+            self._file.flush()
+        except (IOError, OSError) as e:
+            raise ServiceNowError(
+                "Cannot write checkpoint {0}: {1}".format(self.path, e)
+            )
+
+    def remove(self):
+        """
+        Remove the checkpoint of a listing that completed.
+        """
+        if not self.active:
+            return
+
+        if self._file:
+            self._file.close()
+            self._file = None
+        self._size = 0
+        # The lock file goes too, while it is still locked, so that another
+        # listing cannot hold a lock on it.
+        for path in (self.path, self.lock_path):
+            try:
+                os.remove(path)
+            except (IOError, OSError):
+                pass
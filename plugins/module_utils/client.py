@@ -7,21 +7,184 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import functools
+import hashlib
 import json
+import socket
 import ssl
+import time
+import zlib
 
+from ansible.module_utils.common.text.converters import to_bytes
 from ansible.module_utils.six import PY2
 from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
 from ansible.module_utils.six.moves.urllib.parse import quote, urlencode
 from ansible.module_utils.urls import Request, basic_auth_header
 
-from .errors import AuthError, ServiceNowError, UnexpectedAPIResponse
+from .batch import MAX_PAYLOAD_SIZE, MAX_REQUESTS, Batch
+from .connection_pool import ConnectionPool
+from .errors import (
+    AuthError,
+    RequestTimeout,
+    ServiceNowError,
+    UnexpectedAPIResponse,
+)
+from .json_stream import iter_array
+from .retry import IDEMPOTENT_METHODS, RetryPolicy
+from .stats import APIStats
+from .token_cache import TokenCache, cache_key
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ujson
+
+    HAS_UJSON = True
+except ImportError:
+    HAS_UJSON = False
 
 DEFAULT_HEADERS = dict(Accept="application/json")
 
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+def decompress(data, content_encoding):
+    encoding = (content_encoding or "").strip().lower()
+    if not data or encoding not in ("gzip", "x-gzip", "deflate"):
+        return data
+
+    try:
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(data)
+            except zlib.error:
+                # Some servers send raw deflate streams without the zlib header.
+                return zlib.decompress(data, -zlib.MAX_WBITS)
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    except zlib.error as e:
+        raise ServiceNowError(
+            "Failed to decompress {0} response: {1}".format(encoding, e)
+        )
+
+
+class Decompressor:
+    """
+    Incremental counterpart of the decompress function.
+
+    Used for streamed responses, where the body is decompressed one chunk at
+    a time while it is being read from the socket.
+    """
+
+    def __init__(self, content_encoding):
+        self.encoding = (content_encoding or "").strip().lower()
+        if self.encoding in ("gzip", "x-gzip"):
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == "deflate":
+            self._obj = zlib.decompressobj()
+        else:
+            self._obj = None
+        self._started = False
+
+    def decompress(self, data):
+        if self._obj is None:
+            return data
+
+        try:
+            try:
+                return self._obj.decompress(data)
+            except zlib.error:
+                if self.encoding != "deflate" or self._started:
+                    raise
+                # Raw deflate stream without the zlib header.
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+                return self._obj.decompress(data)
+        except zlib.error as e:
+            raise ServiceNowError(
+                "Failed to decompress {0} response: {1}".format(self.encoding, e)
+            )
+        finally:
+            self._started = True
+
+    def flush(self):
+        if self._obj is None:
+            return b""
+        return self._obj.flush()
+
+
+class JSONCodec:
+    """
+    JSON encoder and decoder from the standard library.
+
+    Other codecs use faster third-party libraries, but behave the same way:
+    loads accepts text or bytes and raises ValueError on invalid input, and
+    dumps returns compact text. Since the third-party libraries have no
+    support for object hooks, they fall back to the standard library when a
+    hook is given.
+    """
+
+    name = "json"
+
+    def loads(self, data, object_hook=None):
+        return json.loads(data, object_hook=object_hook)
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":"))
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def loads(self, data, object_hook=None):
+        if object_hook:
+            # Applying the hook in Python code is slower than the standard
+            # library, which calls the hook while decoding.
+            return super(OrjsonCodec, self).loads(data, object_hook)
+        return orjson.loads(data)
+
+    def dumps(self, obj):
+        return orjson.dumps(obj).decode("utf-8")
+
+
+class UjsonCodec(JSONCodec):
+    name = "ujson"
+
+    def loads(self, data, object_hook=None):
+        if object_hook:
+            return super(UjsonCodec, self).loads(data, object_hook)
+        return ujson.loads(data)
+
+    def dumps(self, obj):
+        return ujson.dumps(obj, escape_forward_slashes=False)
+
+
+JSON_CODECS = dict(json=JSONCodec, orjson=OrjsonCodec, ujson=UjsonCodec)
+
+
+def get_json_codec(name="auto"):
+    """
+    Return the JSON codec with the given name.
+
+    The auto codec is the fastest one that is available on the system.
+    """
+    available = dict(json=True, orjson=HAS_ORJSON, ujson=HAS_UJSON)
+    if name == "auto":
+        name = "orjson" if HAS_ORJSON else "ujson" if HAS_UJSON else "json"
+    if name not in JSON_CODECS:
+        raise ServiceNowError("Unknown JSON codec '{0}'.".format(name))
+    if not available[name]:
+        raise ServiceNowError(
+            "JSON codec '{0}' requires the {0} Python library.".format(name)
+        )
+    return JSON_CODECS[name]()
+
 
 class Response:
-    def __init__(self, status, data, headers=None, json_decoder_hook=None):
+    def __init__(self, status, data, headers=None, json_decoder_hook=None, codec=None):
         self.status = status
         self.data = data
         # [('h1', 'v1'), ('H2', 'V2')] -> {'h1': 'v1', 'h2': 'V2'}
@@ -31,18 +194,125 @@ class Response:
 
         self._json = None
         self.json_decoder_hook = json_decoder_hook
+        self.codec = codec or JSONCodec()
+
+    @property
+    def json(self):
+        if self._json is None:
+            try:
+                self._json = self.codec.loads(
+                    self.data, object_hook=self.json_decoder_hook
+                )
+            except ValueError:
+                raise ServiceNowError(
+                    "Received invalid JSON response: {0}".format(self.data)
+                )
+        return self._json
+
+
+class StreamingResponse:
+    """
+    Successful response whose body is read from the socket on demand.
+
+    The records of a {"result": [...]} body can be decoded one by one with
+    iter_records, without holding the raw body in memory. Streaming always
+    uses the standard library decoder, since it is the only one that can
+    decode a value from the middle of a buffer. The data and json attributes
+    are still available, but they read the whole body.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        status,
+        raw_resp,
+        headers=None,
+        json_decoder_hook=None,
+        codec=None,
+        record=None,
+        start=None,
+    ):
+        self.status = status
+        self.headers = (
+            dict((k.lower(), v) for k, v in dict(headers).items()) if headers else {}
+        )
+        self.json_decoder_hook = json_decoder_hook
+        self.codec = codec or JSONCodec()
+
+        self._raw = raw_resp
+        # Called with the number of received and decoded bytes and the
+        # elapsed time once the body has been read.
+        self._record = record
+        self._start = time.time() if start is None else start
+        self._consumed = False
+        self._data = None
+        self._json = None
+        # Size of the decoded body, known once the body is consumed.
+        self.decoded_bytes = None
+
+    def iter_content(self):
+        if self._consumed:
+            raise ServiceNowError("Response body has already been consumed.")
+        self._consumed = True
+
+        decompressor = Decompressor(self.headers.get("content-encoding"))
+        received = decoded = 0
+        try:
+            while True:
+                try:
+                    chunk = self._raw.read(self.chunk_size)
+                except socket.timeout as e:
+                    raise RequestTimeout("Request timed out: {0}".format(e))
+                if not chunk:
+                    break
+                received += len(chunk)
+                data = decompressor.decompress(chunk)
+                decoded += len(data)
+                if data:
+                    yield data
+
+            data = decompressor.flush()
+            decoded += len(data)
+            if data:
+                yield data
+        finally:
+            self.close()
+            self.decoded_bytes = decoded
+            if self._record:
+                self._record(received, decoded, time.time() - self._start)
+
+    def iter_records(self):
+        try:
+            for record in iter_array(
+                self.iter_content(), "result", self.json_decoder_hook
+            ):
+                yield record
+        except ValueError as e:
+            raise ServiceNowError("Received invalid JSON response: {0}".format(e))
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = b"".join(self.iter_content())
+        return self._data
 
     @property
     def json(self):
         if self._json is None:
             try:
-                self._json = json.loads(self.data, object_hook=self.json_decoder_hook)
+                self._json = self.codec.loads(
+                    self.data, object_hook=self.json_decoder_hook
+                )
             except ValueError:
                 raise ServiceNowError(
                     "Received invalid JSON response: {0}".format(self.data)
                 )
         return self._json
 
+    def close(self):
+        self._raw.close()
+
 
 class Client:
     def __init__(
@@ -63,6 +333,17 @@ class Client:
         timeout=None,
         validate_certs=None,
         json_decoder_hook=None,
+        keep_alive=False,
+        pool_size=10,
+        pool_idle_timeout=60,
+        token_cache_path=None,
+        retries=3,
+        retry_methods=IDEMPOTENT_METHODS,
+        retry_max_wait=60,
+        json_codec="auto",
+        batch_requests=False,
+        batch_max_requests=MAX_REQUESTS,
+        batch_max_payload_size=MAX_PAYLOAD_SIZE,
     ):
         if not (host or "").startswith(("https://", "http://")):
             raise ServiceNowError(
@@ -87,9 +368,38 @@ class Client:
         self.timeout = timeout
         self.validate_certs = validate_certs
         self.json_decoder_hook = json_decoder_hook
+        self.json_codec = get_json_codec(json_codec)
+
+        # Helpers that can combine several requests into one use the Batch API
+        # only if this is set.
+        self.batch_requests = batch_requests
+        self.batch_max_requests = batch_max_requests
+        self.batch_max_payload_size = batch_max_payload_size
+
+        self.token_cache = TokenCache(token_cache_path) if token_cache_path else None
+        self.stats = APIStats()
+        self.retry_policy = RetryPolicy(
+            retries=retries, methods=retry_methods, max_wait=retry_max_wait
+        )
 
         self._auth_header = None
-        self._client = Request()
+        self._auth_from_cache = False
+        if keep_alive:
+            self._client = ConnectionPool(
+                maxsize=pool_size,
+                idle_timeout=pool_idle_timeout,
+                timeout=timeout,
+                validate_certs=validate_certs is not False,
+                client_cert=client_certificate_file,
+                client_key=client_key_file,
+            )
+        else:
+            self._client = Request()
+
+    def close(self):
+        # Only the keep-alive transport holds on to sockets between requests.
+        if isinstance(self._client, ConnectionPool):
+            self._client.close()
 
     @property
     def auth_header(self):
@@ -151,6 +461,25 @@ class Client:
             )
 
     def _login_oauth(self):
+        if not self.token_cache:
+            access_token, _expires_in = self._fetch_oauth_token()
+            return self._login_token(access_token, is_api_key=False)
+
+        key = self._token_cache_key()
+        # Holding the lock while fetching the token makes parallel forks wait
+        # for the first one instead of all of them requesting a new token.
+        with self.token_cache.locked():
+            access_token = self.token_cache.get(key)
+            if access_token:
+                self._auth_from_cache = True
+            else:
+                access_token, expires_in = self._fetch_oauth_token()
+                if expires_in:
+                    self.token_cache.set(key, access_token, expires_in)
+        return self._login_token(access_token, is_api_key=False)
+
+    def _fetch_oauth_token(self):
+        self.stats.add_auth()
         auth_data = self._login_oauth_generate_auth_data()
         resp = self._request(
             "POST",
@@ -161,10 +490,53 @@ class Client:
         if resp.status != 200:
             raise UnexpectedAPIResponse(resp.status, resp.data)
 
-        access_token = resp.json["access_token"]
-        return self._login_token(access_token, is_api_key=False)
+        return resp.json["access_token"], resp.json.get("expires_in")
+
+    def _token_cache_key(self):
+        if self.grant_type == "refresh_token":
+            # There is no username to tell refresh token grants apart.
+            user = hashlib.sha256(to_bytes(self.refresh_token)).hexdigest()
+        else:
+            user = self.username
+        return cache_key(
+            self.host,
+            self.client_id,
+            self.grant_type,
+            user,
+            secrets=(self.client_secret, self.password),
+        )
+
+    def _invalidate_cached_token(self):
+        """
+        Drop a cached access token that the instance rejected.
+
+        Returns True if there was such a token, in which case the caller can
+        retry the request with a freshly obtained one.
+        """
+        if not self._auth_from_cache:
+            return False
+
+        with self.token_cache.locked():
+            self.token_cache.invalidate(self._token_cache_key())
+        self._auth_from_cache = False
+        self._auth_header = None
+        return True
 
     def _request(self, method, path, data=None, headers=None):
+        return self._send(method, path, data, headers, stream=False)
+
+    def _stream_request(self, method, path, data=None, headers=None):
+        return self._send(method, path, data, headers, stream=True)
+
+    def _send(self, method, path, data, headers, stream):
+        headers = dict(headers or {})
+        if not any(k.lower() == "accept-encoding" for k in headers):
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+        record = functools.partial(
+            self._record, method, path, len(to_bytes(data)) if data is not None else 0
+        )
+        start = time.time()
         try:
             raw_resp = self._client.open(
                 method,
@@ -175,10 +547,15 @@ class Client:
                 validate_certs=self.validate_certs,
                 client_cert=self.client_certificate_file,
                 client_key=self.client_key_file,
+                # We decompress responses ourselves to support deflate and to
+                # be able to measure the number of transferred bytes.
+                decompress=False,
             )
         except HTTPError as e:
             # Wrong username/password, or expired access token
             if e.code == 401:
+                # Release the connection of the unread response.
+                e.close()
                 raise AuthError(
                     "Failed to authenticate with the instance: {0} {1}".format(
                         e.code, e.reason
@@ -186,50 +563,132 @@ class Client:
                 )
             # Other HTTP error codes do not necessarily mean errors.
             # This is for the caller to decide.
-            return Response(e.code, e.read(), e.headers)
-        except URLError as e:
-            raise ServiceNowError(e.reason)
-        except ssl.SSLError as e:
-            if self.client_certificate_file:
-                raise ServiceNowError(
-                    "Failed to communicate with instance due to SSL error, likely related to the client certificate or key. "
-                    "Ensure the files are accessible on the Ansible host and in the correct format (see module documentation)."
-                )
-            raise
+            return self._response(e.code, e.read(), e.headers, record, start)
+        except (URLError, socket.timeout, ssl.SSLError) as e:
+            raise self._map_transport_error(e)
 
         if PY2:
-            return Response(
-                raw_resp.getcode(),
-                raw_resp.read(),
-                raw_resp.info(),
+            status, resp_headers = raw_resp.getcode(), raw_resp.info()
+        else:
+            status, resp_headers = raw_resp.status, raw_resp.headers
+        if stream and status == 200:
+            return StreamingResponse(
+                status,
+                raw_resp,
+                resp_headers,
                 self.json_decoder_hook,
+                self.json_codec,
+                record,
+                start,
             )
-        return Response(
-            raw_resp.status, raw_resp.read(), raw_resp.headers, self.json_decoder_hook
-        )
+        try:
+            raw_data = raw_resp.read()
+        except socket.timeout as e:
+            raise self._map_transport_error(e)
+        return self._response(status, raw_data, resp_headers, record, start)
 
-    def request(self, method, path, query=None, data=None, headers=None, bytes=None):
+    def _map_transport_error(self, error):
+        """
+        Return the error to raise for a request that did not get a response.
+        """
+        if isinstance(error, URLError):
+            if isinstance(error.reason, socket.timeout):
+                return RequestTimeout("Request timed out: {0}".format(error.reason))
+            return ServiceNowError(error.reason)
+        if isinstance(error, socket.timeout):
+            return RequestTimeout("Request timed out: {0}".format(error))
+        if self.client_certificate_file:
+            return ServiceNowError(
+                "Failed to communicate with instance due to SSL error, likely related to the client certificate or key. "
+                "Ensure the files are accessible on the Ansible host and in the correct format (see module documentation)."
+            )
+        return error
+
+    def _response(self, status, raw_data, headers, record, start):
+        content_encoding = headers.get("Content-Encoding") if headers else None
+        data = decompress(raw_data, content_encoding)
+        record(len(raw_data or ""), len(data or ""), time.time() - start)
+        return self._make_response(status, data, headers)
+
+    def _make_response(self, status, data, headers):
+        return Response(status, data, headers, self.json_decoder_hook, self.json_codec)
+
+    def _record(self, method, url, sent_bytes, received_bytes, decoded_bytes, elapsed):
+        self.stats.add(method, url, sent_bytes, received_bytes, elapsed, decoded_bytes)
+
+    def request(
+        self,
+        method,
+        path,
+        query=None,
+        data=None,
+        headers=None,
+        bytes=None,
+        stream=False,
+    ):
         # Make sure we only have one kind of payload
         if data is not None and bytes is not None:
             raise AssertionError(
                 "Cannot have JSON and binary payload in a single request."
             )
 
+        url = self._url(path, query)
+        if data is not None:
+            data = self.json_codec.dumps(data)
+        elif bytes is not None:
+            data = bytes
+
+        waited = 0
+        attempt = 0
+        while True:
+            resp = self._authenticated_request(
+                method, url, data, headers, bytes, stream
+            )
+            if not self.retry_policy.should_retry(method, resp.status, attempt):
+                return resp
+
+            delay = self.retry_policy.delay(attempt, resp.headers)
+            if waited + delay > self.retry_policy.max_wait:
+                # Waiting any longer is not worth it. Let the caller handle
+                # the last response.
+                return resp
+            self.stats.add_retry(method, url)
+            time.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    def _url(self, path, query=None):
         escaped_path = quote(path.strip("/"))
         if escaped_path:
             escaped_path = "/" + escaped_path
         url = "{0}{1}".format(self.host, escaped_path)
         if query:
             url = "{0}?{1}".format(url, urlencode(query))
+        return url
+
+    def _authenticated_request(self, method, url, data, headers, bytes, stream=False):
+        # Only successful responses are streamed. All others are small and
+        # are read right away, like with the _request method.
+        send = self._stream_request if stream else self._request
+        try:
+            return send(
+                method, url, data=data, headers=self._headers(headers, data, bytes)
+            )
+        except AuthError:
+            if not self._invalidate_cached_token():
+                raise
+        return send(method, url, data=data, headers=self._headers(headers, data, bytes))
+
+    def _headers(self, headers, data, bytes):
         headers = dict(headers or DEFAULT_HEADERS, **self.auth_header)
         if self.custom_headers:
             headers = dict(headers, **self.custom_headers)
-        if data is not None:
-            data = json.dumps(data, separators=(",", ":"))
+        if data is not None and bytes is None:
             headers["Content-type"] = "application/json"
-        elif bytes is not None:
-            data = bytes
-        return self._request(method, url, data=data, headers=headers)
+        return headers
+
+    def batch(self):
+        return Batch(self, self.batch_max_requests, self.batch_max_payload_size)
 
     def get(self, path, query=None):
         resp = self.request("GET", path, query=query)
@@ -237,6 +696,12 @@ class Client:
             return resp
         raise UnexpectedAPIResponse(resp.status, resp.data)
 
+    def get_stream(self, path, query=None):
+        resp = self.request("GET", path, query=query, stream=True)
+        if resp.status in (200, 404):
+            return resp
+        raise UnexpectedAPIResponse(resp.status, resp.data)
+
     def post(self, path, data, query=None):
         resp = self.request("POST", path, data=data, query=query)
         if resp.status in (200, 201):
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import socket
+import ssl
+import threading
+import time
+
+from ansible.module_utils.common.text.converters import to_bytes
+from ansible.module_utils.six.moves import http_client
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible.module_utils.six.moves.urllib.parse import urlsplit
+from ansible.module_utils.six.moves.urllib.request import getproxies, proxy_bypass
+from ansible.module_utils.urls import make_context
+
+# Errors that signal that the server closed a kept-alive socket while it was
+# sitting idle in the pool. Requests that fail with one of these on a reused
+# connection are retried once on a fresh connection.
+try:
+    STALE_CONNECTION_ERRORS = (http_client.BadStatusLine, ConnectionError)
+except NameError:  # Python 2
+    STALE_CONNECTION_ERRORS = (http_client.BadStatusLine, socket.error)
+
+
+class PooledResponse:
+    """
+    Response wrapper that hands the connection back to the pool once the body
+    has been consumed.
+
+    Mimics the parts of the urllib response interface that the Client uses
+    (status, headers, read) so both transports can be handled the same way.
+    """
+
+    def __init__(self, pool, key, conn, raw):
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._raw = raw
+        self.status = raw.status
+        self.reason = raw.reason
+        self.headers = raw.msg
+
+    def getcode(self):
+        return self.status
+
+    def info(self):
+        return self.headers
+
+    def read(self, amt=None):
+        try:
+            data = self._raw.read() if amt is None else self._raw.read(amt)
+        except Exception:
+            self.close()
+            raise
+
+        if amt is None or not data:
+            self.release()
+        return data
+
+    def release(self):
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        if self._raw.will_close or not self._raw.isclosed():
+            # Either the server asked us to close the socket or the body was
+            # not fully read. In both cases the socket cannot be reused.
+            conn.close()
+        else:
+            self._pool.put(self._key, conn)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of persistent HTTP/1.1 connections, keyed by host.
+
+    maxsize       -- maximum number of idle connections kept per host. Extra
+                     connections are closed when they are returned.
+    idle_timeout  -- idle connections older than this many seconds are closed
+                     instead of being reused. Expired connections of all hosts
+                     are closed whenever a connection is taken from or
+                     returned to the pool.
+    """
+
+    def __init__(
+        self,
+        maxsize=10,
+        idle_timeout=60,
+        timeout=None,
+        validate_certs=True,
+        client_cert=None,
+        client_key=None,
+    ):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.validate_certs = validate_certs
+        self.client_cert = client_cert
+        self.client_key = client_key
+
+        self._lock = threading.Lock()
+        self._idle = {}  # (scheme, host, port) -> [(conn, last_used), ...]
+        self._context = None
+
+    def open(self, method, url, data=None, headers=None, **kwargs):
+        # Extra keyword arguments (timeout, validate_certs, ...) are accepted
+        # for signature compatibility with ansible.module_utils.urls.Request.
+        # Their values are fixed when the pool is created.
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        target = parts.path or "/"
+        if parts.query:
+            target = "{0}?{1}".format(target, parts.query)
+
+        data = to_bytes(data, nonstring="passthru")
+        headers = dict(headers or {})
+        headers.setdefault("User-agent", "ansible-httpget")
+
+        conn, reused = self.get(key)
+        if isinstance(conn, _ProxiedHTTPConnection):
+            target = url
+        try:
+            raw = self._send(conn, method, target, data, headers)
+        except STALE_CONNECTION_ERRORS as e:
+            if not reused:
+                raise URLError(e)
+            conn = self._new_connection(key)
+            try:
+                raw = self._send(conn, method, target, data, headers)
+            except STALE_CONNECTION_ERRORS as e:
+                raise URLError(e)
+
+        resp = PooledResponse(self, key, conn, raw)
+        if resp.status >= 400:
+            # Keep the error reporting of urllib, which the Client relies on.
+            raise HTTPError(url, resp.status, resp.reason, resp.headers, resp)
+        return resp
+
+    def get(self, key):
+        conn = None
+        with self._lock:
+            expired = self._prune(time.time())
+            idle = self._idle.get(key)
+            if idle:
+                conn, _last_used = idle.pop()
+        _close_all(expired)
+        if conn is not None:
+            return conn, True
+        return self._new_connection(key), False
+
+    def put(self, key, conn):
+        now = time.time()
+        with self._lock:
+            expired = self._prune(now)
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append((conn, now))
+                conn = None
+        _close_all(expired)
+        if conn is not None:
+            conn.close()
+
+    def _prune(self, now):
+        # Drop the expired idle connections and return them, so that they can
+        # be closed once the lock is released. Call with the lock held.
+        expired = []
+        for idle in self._idle.values():
+            expired.extend(c for c, t in idle if now - t > self.idle_timeout)
+            idle[:] = [(c, t) for c, t in idle if now - t <= self.idle_timeout]
+        return expired
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _last_used in connections:
+                conn.close()
+
+    @staticmethod
+    def _send(conn, method, target, data, headers):
+        try:
+            conn.request(method, target, body=data, headers=headers)
+            return conn.getresponse()
+        except STALE_CONNECTION_ERRORS:
+            conn.close()
+            raise
+        except ssl.SSLError:
+            conn.close()
+            raise
+        except (socket.error, http_client.HTTPException) as e:
+            conn.close()
+            raise URLError(e)
+
+    def _new_connection(self, key):
+        scheme, host, port = key
+        proxy = self._get_proxy(scheme, host)
+
+        if scheme == "https":
+            if self._context is None:
+                self._context = make_context(
+                    validate_certs=self.validate_certs,
+                    client_cert=self.client_cert,
+                    client_key=self.client_key,
+                )
+            if proxy:
+                conn = http_client.HTTPSConnection(
+                    proxy.hostname,
+                    proxy.port,
+                    timeout=self.timeout,
+                    context=self._context,
+                )
+                conn.set_tunnel(host, port)
+                return conn
+            return http_client.HTTPSConnection(
+                host, port, timeout=self.timeout, context=self._context
+            )
+
+        if proxy:
+            return _ProxiedHTTPConnection(proxy.hostname, proxy.port, self.timeout)
+        return http_client.HTTPConnection(host, port, timeout=self.timeout)
+
+    @staticmethod
+    def _get_proxy(scheme, host):
+        proxy = getproxies().get(scheme)
+        if not proxy or proxy_bypass(host):
+            return None
+        return urlsplit(proxy)
+
+
+def _close_all(connections):
+    for conn in connections:
+        conn.close()
+
+
+class _ProxiedHTTPConnection(http_client.HTTPConnection):
+    # Plain HTTP requests are sent to the proxy with an absolute URL as the
+    # request target, which is how ConnectionPool.open recognizes them.
+    def __init__(self, host, port, timeout):
+        http_client.HTTPConnection.__init__(self, host, port, timeout=timeout)
@@ -16,7 +16,12 @@ class AuthError(ServiceNowError):
     pass
 
 
+class RequestTimeout(ServiceNowError):
+    pass
+
+
 class UnexpectedAPIResponse(ServiceNowError):
     def __init__(self, status, data):
+        self.status = status
         self.message = "Unexpected response - {0} {1}".format(status, data)
         super(UnexpectedAPIResponse, self).__init__(self.message)
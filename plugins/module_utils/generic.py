@@ -12,8 +12,27 @@ from ..module_utils.api import FIELD_SYS_ID, FIELD_ATTRIBUTES_NAME
 
 
 class GenericClient(snow.SNowClient):
-    def __init__(self, client, batch_size=1000):
-        super(GenericClient, self).__init__(client, batch_size)
+    def __init__(
+        self,
+        client,
+        batch_size=1000,
+        stream=False,
+        page_workers=1,
+        pagination="offset",
+        count_strategy="every",
+        page_sizer=None,
+        checkpoint_dir=None,
+    ):
+        super(GenericClient, self).__init__(
+            client,
+            batch_size,
+            stream,
+            page_workers,
+            pagination,
+            count_strategy,
+            page_sizer,
+            checkpoint_dir,
+        )
 
     def list_records(self, api_path, query=None):
         """
@@ -25,6 +44,16 @@ class GenericClient(snow.SNowClient):
         """
         return self.list(api_path, query)
 
+    def iter_records(self, api_path, query=None):
+        """
+        Yield records from api_path as the pages arrive.
+        The next page is fetched in the background while the caller processes the current one.
+
+        api_path    -- full path (ex: "api/now/cmdb/instance/cmdb_ci_linux_server"
+        query       -- query in SNow format
+        """
+        return super(GenericClient, self).iter_records(api_path, query)
+
     def get_record(self, api_path, query, must_exist=False):
         """
         Return a record matched by the query.
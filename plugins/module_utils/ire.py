@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+from . import errors
+
+DEFAULT_DATA_SOURCE = "ServiceNow"
+
+# IRE operation of items that the instance identified but did not modify.
+NO_CHANGE = "NO_CHANGE"
+
+
+class IREItem:
+    """
+    Outcome of identifying and reconciling a single configuration item.
+    """
+
+    def __init__(self, data):
+        self.class_name = data.get("className")
+        self.operation = data.get("operation")
+        self.sys_id = data.get("sysId") or None
+        self.errors = data.get("errors") or []
+
+    @property
+    def error(self):
+        if not self.errors:
+            return None
+        return "; ".join(
+            "{0}: {1}".format(e.get("error", "ERROR"), e.get("message", ""))
+            for e in self.errors
+        )
+
+    @property
+    def changed(self):
+        return not self.errors and self.operation not in (None, NO_CHANGE)
+
+
+def chunk_items(count, relations, chunk_size):
+    """
+    Split the indexes of count items into chunks of about chunk_size.
+
+    Related items always end up in the same chunk, because a request can
+    only relate the items it contains. A group of related items that is
+    larger than chunk_size forms a chunk of its own.
+    """
+    parents = list(range(count))
+
+    def root(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    for relation in relations or []:
+        parents[root(relation["parent"])] = root(relation["child"])
+
+    groups = {}
+    order = []
+    for i in range(count):
+        r = root(i)
+        if r not in groups:
+            groups[r] = []
+            order.append(r)
+        groups[r].append(i)
+
+    chunks = []
+    chunk = []
+    for r in order:
+        group = groups[r]
+        if chunk and len(chunk) + len(group) > chunk_size:
+            chunks.append(chunk)
+            chunk = []
+        chunk.extend(group)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class IREClient:
+    """
+    Client for the CMDB Identification and Reconciliation API.
+
+    The instance matches the items against its identification rules, then
+    inserts or updates them and their relations in a single request.
+    """
+
+    def __init__(self, client, data_source=DEFAULT_DATA_SOURCE):
+        self.client = client
+        self.data_source = data_source
+
+    def path(self, dry_run=False):
+        parts = self.client.api_path + ("identifyreconcile",)
+        if dry_run:
+            parts += ("query",)
+        return "/".join(parts)
+
+    def identify_reconcile(self, class_name, items, relations=None, dry_run=False):
+        """
+        Identify and reconcile items, and return an IREItem for each of them.
+
+        class_name  -- table of the items (ex: "cmdb_ci_linux_server")
+        items       -- list of dicts with the field values of the items
+        relations   -- list of dicts with parent and child indexes into
+                       items and the relationship type
+        dry_run     -- if true, only identify the items without changing
+                       anything on the instance
+        """
+        payload = dict(
+            items=[dict(className=class_name, values=values) for values in items],
+            relations=[
+                dict(parent=r["parent"], child=r["child"], type=r["type"])
+                for r in relations or []
+            ],
+        )
+        response = self.client.post(
+            self.path(dry_run),
+            payload,
+            query=dict(sysparm_data_source=self.data_source),
+        )
+
+        result = response.json["result"]
+        # Some releases return the output as a JSON encoded string.
+        if not isinstance(result, dict):
+            result = json.loads(result)
+
+        outputs = result.get("items", [])
+        if len(outputs) != len(items):
+            raise errors.ServiceNowError(
+                "Identification and reconciliation returned {0} items for {1} "
+                "inputs.".format(len(outputs), len(items))
+            )
+        return [IREItem(output) for output in outputs]
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import threading
+
+from .errors import ServiceNowError
+from .locked_file import LockedFile, dump_line, parse_line
+
+VERSION = 1
+
+
+def payload_hash(payload):
+    """
+    Return a hash of the field values that an item sets on its record.
+    """
+    data = json.dumps(payload, sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def entry_key(table, columns, identity):
+    return json.dumps([table, list(columns), list(identity)])
+
+
+class Journal(LockedFile):
+    """
+    Records that a batch sync left in sync with its items.
+
+    The journal is a JSON lines file. The first line holds the version and
+    every following line one synced item: the table, the identifying columns
+    and values, the hash of the item's values and the sys_id, sys_updated_on
+    and sys_mod_count of the record after the sync. Items are appended as
+    they are synced, so a sync that fails midway leaves all its completed
+    items behind. Later lines supersede earlier ones with the same key.
+
+    If another process holds the lock of the journal, the journal is
+    inactive: it has no entries and records none.
+    """
+
+    kind = "journal"
+
+    def __init__(self, path):
+        super(Journal, self).__init__(os.path.expanduser(path))
+        self.entries = {}
+
+        self._write_lock = threading.Lock()
+
+    def __enter__(self):
+        self._lock()
+        if not self.active:
+            return self
+
+        try:
+            self._open()
+        except (IOError, OSError) as e:
+            self.__exit__(None, None, None)
+            raise ServiceNowError("Cannot open journal {0}: {1}".format(self.path, e))
+        except ServiceNowError:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def _open(self):
+        lines = self._load()
+        # Superseded lines are dropped once they outnumber live ones.
+        if lines > 2 * len(self.entries):
+            self._compact()
+        else:
+            self._append(dict(version=VERSION))
+
+    def _load(self):
+        """
+        Load the entries and return the number of lines in the file.
+
+        A missing file has no entries.
+        """
+        try:
+            f = open(self.path, "rb")
+        except (IOError, OSError):
+            return 0
+
+        lines = 0
+        with f:
+            first = f.readline()
+            header = parse_line(first)
+            if header is None and not first.endswith(b"\n"):
+                # The header itself was only partially written.
+                return 0
+            if not isinstance(header, dict) or header.get("version") != VERSION:
+                raise ServiceNowError(
+                    "{0} is not a version {1} journal".format(self.path, VERSION)
+                )
+
+            for entry in self._entries(f):
+                lines += 1
+                self.entries[entry.pop("key")] = entry
+        return lines
+
+    def _compact(self):
+        tmp_path = self.path + ".tmp"
+        fd = os.open(tmp_path, os.O_CREAT | os.O_TRUNC | os.O_WRONLY, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(dump_line(dict(version=VERSION)))
+            for key, entry in self.entries.items():
+                f.write(dump_line(dict(entry, key=key)))
+        os.rename(tmp_path, self.path)
+        self._file = open(self.path, "ab")
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def record(self, key, hash, record):
+        """
+        Record that the item with the key and the hash is in sync with the
+        record. Safe to call from several threads.
+        """
+        if not self.active:
+            return
+
+        entry = dict(
+            hash=hash,
+            sys_id=record["sys_id"],
+            sys_updated_on=record.get("sys_updated_on"),
+            sys_mod_count=record.get("sys_mod_count"),
+        )
+        with self._write_lock:
+            self.entries[key] = entry
+            try:
+                self._file.write(dump_line(dict(entry, key=key)))
+                self._file.flush()
+            except (IOError, OSError) as e:
+                raise ServiceNowError(
+                    "Cannot write journal {0}: {1}".format(self.path, e)
+                )
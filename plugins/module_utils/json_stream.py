@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"[-+0-9.eE]*")
+
+
+class _Reader:
+    """
+    Text buffer that is refilled from an iterable of UTF-8 encoded chunks.
+
+    Consumed text is dropped from the buffer on every refill, so the reader
+    never holds more than the value that is currently being decoded and the
+    chunk that completed it.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buf = self.buf[self.pos :] + text
+                self.pos = 0
+                return True
+
+        self.eof = True
+        # Raises UnicodeDecodeError (a ValueError) on a truncated character.
+        self._decoder.decode(b"", True)
+        return False
+
+    def peek(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON data")
+
+    def expect(self, *tokens):
+        token = self.peek()
+        if token not in tokens:
+            raise ValueError(
+                "Expected {0} at position {1}, found {2!r}".format(
+                    " or ".join(tokens), self.pos, token
+                )
+            )
+        self.pos += 1
+        return token
+
+    def value(self, decoder):
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                # The value is (most likely) not complete yet.
+                if not self.fill():
+                    raise
+                continue
+
+            # A number at the end of the buffer may continue in the next chunk.
+            if _NUMBER.match(self.buf, self.pos).end() == len(self.buf) and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+    def drain(self):
+        # Read the rest of the stream, so the connection can be reused.
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                raise ValueError("Extra data after the end of JSON document")
+            if not self.fill():
+                return
+
+
+def iter_array(chunks, key="result", object_hook=None):
+    """
+    Decode the JSON object in chunks and yield items of its key array.
+
+    Items are yielded as soon as they are decoded, which makes it possible
+    to process large {"result": [...]} responses without holding the raw
+    body or the complete list of items in memory. Other members of the
+    object are decoded and discarded.
+
+    chunks       -- iterable of UTF-8 encoded byte strings.
+    key          -- name of the member that holds the array.
+    object_hook  -- hook that is passed to the JSON decoder.
+
+    Raises ValueError if the data is not valid JSON or if the object has no
+    key member that holds an array.
+    """
+    decoder = json.JSONDecoder(object_hook=object_hook)
+    reader = _Reader(chunks)
+    found = False
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            name = reader.value(decoder)
+            reader.expect(":")
+            if name == key:
+                found = True
+                reader.expect("[")
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield reader.value(decoder)
+                        if reader.expect(",", "]") == "]":
+                            break
+            else:
+                reader.value(decoder)
+
+            if reader.expect(",", "}") == "}":
+                break
+
+    reader.drain()
+    if not found:
+        raise ValueError("JSON object has no '{0}' member".format(key))
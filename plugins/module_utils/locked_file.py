@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import errno
+import fcntl
+import json
+import os
+
+from .errors import ServiceNowError
+
+
+def parse_line(line):
+    """
+    Return the data of a JSON line, or None if the line is not complete.
+    """
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        return json.loads(line.decode("utf-8"))
+    except ValueError:
+        return None
+
+
+def dump_line(data):
+    return (json.dumps(data, sort_keys=True) + "\n").encode("utf-8")
+
+
+class LockedFile:
+    """
+    A JSON lines file that only one process at a time writes to.
+
+    The file is locked through <path>.lock while it is open. If another
+    process holds the lock, the file is inactive and the subclass must
+    neither read nor write it. Lines are appended as they are produced, so
+    the last line can be only partially written if a process dies midway.
+    Such a line is dropped before new lines are appended.
+    """
+
+    # What the file holds, for error messages.
+    kind = "file"
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.active = False
+
+        self._lock_fd = None
+        self._file = None
+        # Size of the valid part of the file.
+        self._size = 0
+
+    def __enter__(self):
+        self._lock()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self.active:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            self.active = False
+        os.close(self._lock_fd)
+
+    def _lock(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory, 0o700)
+            self._lock_fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR, 0o600)
+        except (IOError, OSError) as e:
+            raise ServiceNowError(
+                "Cannot open {0} {1}: {2}".format(self.kind, self.path, e)
+            )
+
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self.active = True
+        except (IOError, OSError) as e:
+            if e.errno not in (errno.EAGAIN, errno.EACCES):
+                raise
+
+    def _entries(self, f):
+        """
+        Yield the data of the lines that follow the current position of f.
+
+        Stops at the first line that was only partially written. The valid
+        part of the file ends after the last yielded line.
+        """
+        self._size = f.tell()
+        for line in iter(f.readline, b""):
+            entry = parse_line(line)
+            if entry is None:
+                return
+            self._size = f.tell()
+            yield entry
+
+    def _append(self, header):
+        """
+        Open the file for appending after its valid part.
+
+        A file without a valid part is started over with the header line.
+        """
+        if self._size:
+            self._file = open(self.path, "r+b")
+            self._file.truncate(self._size)
+            self._file.seek(self._size)
+            return
+
+        fd = os.open(self.path, os.O_CREAT | os.O_TRUNC | os.O_WRONLY, 0o600)
+        self._file = os.fdopen(fd, "wb")
+        self._file.write(dump_line(header))
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import random
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+# Methods that can be safely repeated. POST and PATCH requests are only
+# retried if the user explicitly asks for it.
+IDEMPOTENT_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PUT")
+
+# Responses that signal a temporary overload of the instance.
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Values of X-RateLimit-Reset above this are UNIX timestamps, not deltas.
+_EPOCH_THRESHOLD = 10**9
+
+
+class RetryPolicy:
+    """
+    Decide whether and when a failed request should be sent again.
+
+    retries        -- maximum number of retries for a single request.
+    methods        -- HTTP methods that are retried.
+    backoff_factor -- base delay in seconds. The delay before the n-th retry is
+                      a random value between 0 and backoff_factor * 2 ** n.
+    max_backoff    -- upper limit for a single computed delay.
+    max_wait       -- maximum total time in seconds spent waiting between the
+                      retries of a single request.
+    """
+
+    def __init__(
+        self,
+        retries=3,
+        methods=IDEMPOTENT_METHODS,
+        statuses=RETRY_STATUSES,
+        backoff_factor=0.5,
+        max_backoff=30,
+        max_wait=60,
+    ):
+        self.retries = retries
+        self.methods = set(m.upper() for m in methods)
+        self.statuses = set(statuses)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_wait = max_wait
+
+    def should_retry(self, method, status, attempt):
+        return (
+            attempt < self.retries
+            and method.upper() in self.methods
+            and status in self.statuses
+        )
+
+    def delay(self, attempt, headers):
+        # The instance knows best when it will accept our requests again.
+        delay = self.delay_from_headers(headers)
+        if delay is not None:
+            return delay
+
+        # Full jitter keeps parallel forks from retrying in lockstep.
+        backoff = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, backoff)
+
+    @staticmethod
+    def delay_from_headers(headers):
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                date = parsedate_tz(retry_after)
+                if date:
+                    return max(0.0, mktime_tz(date) - time.time())
+
+        reset = headers.get("x-ratelimit-reset")
+        if reset:
+            try:
+                reset = float(reset)
+            except ValueError:
+                return None
+            if reset > _EPOCH_THRESHOLD:
+                reset -= time.time()
+            return max(0.0, reset)
+
+        return None
@@ -8,51 +8,626 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
-from . import errors
+import collections
+import functools
+import itertools
+import re
+import sys
+import threading
+import time
+
+from ansible.module_utils.six import reraise
+from ansible.module_utils.six.moves.queue import Empty, Full, Queue
+from ansible.module_utils.six.moves.urllib.parse import parse_qsl, urlsplit
+
+from . import checkpoint, errors
+from .client import StreamingResponse
+
+_DONE = object()
+
+# Number of records that prefetch hands over to the caller at a time.
+PREFETCH_CHUNK_SIZE = 100
+
+
+class _Prefetcher(threading.Thread):
+    """
+    Thread that reads records into a bounded queue, in chunks.
+
+    Exceptions are queued too and re-raised by get.
+    """
+
+    def __init__(self, records, chunk_size, depth):
+        super(_Prefetcher, self).__init__()
+        self.daemon = True
+        self.records = records
+        self.chunk_size = chunk_size
+        self.queue = Queue(maxsize=depth)
+        self.stopping = threading.Event()
+
+    def run(self):
+        try:
+            records = iter(self.records)
+            while True:
+                chunk = list(itertools.islice(records, self.chunk_size))
+                if not chunk:
+                    break
+                if not self._put(chunk):
+                    return
+            self._put(_DONE)
+        except Exception:
+            self._put(sys.exc_info())
+        finally:
+            close = getattr(self.records, "close", None)
+            if close:
+                close()
+
+    def _put(self, item):
+        while not self.stopping.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def get(self):
+        item = self.queue.get()
+        if isinstance(item, tuple):
+            reraise(*item)
+        return item
+
+    def stop(self):
+        self.stopping.set()
+        # Unblock the thread if it is waiting for a free slot.
+        try:
+            while True:
+                self.queue.get_nowait()
+        except Empty:
+            pass
+        self.join()
+
+
+def prefetch(records, ahead=1000):
+    """
+    Yield the records, reading up to about ahead records in advance.
+
+    Records are read in a background thread, so that the next page is
+    downloaded and decoded while the caller processes the current one. Only
+    the records read ahead are held in memory. Exceptions raised while
+    reading records are re-raised in the caller, once it reaches the record
+    that failed.
+
+    The background thread is stopped when the generator is closed, and the
+    generator waits for it, so the client is not used after iteration ends.
+    """
+    chunk_size = max(1, min(ahead, PREFETCH_CHUNK_SIZE))
+    prefetcher = _Prefetcher(records, chunk_size, max(1, ahead // chunk_size))
+    prefetcher.start()
+    try:
+        for chunk in iter(prefetcher.get, _DONE):
+            for record in chunk:
+                yield record
+    finally:
+        prefetcher.stop()
+
+
+class _Result:
+    """
+    Result of a call that a worker makes, available once the call is done.
+    """
+
+    def __init__(self):
+        self.value = None
+        self.error = None
+        self._done = threading.Event()
+
+    def set(self, value=None, error=None):
+        self.value = value
+        self.error = error
+        self._done.set()
+
+    def get(self):
+        self._done.wait()
+        if self.error:
+            reraise(*self.error)
+        return self.value
+
+
+def _work(func, tasks):
+    for item, result in iter(tasks.get, _DONE):
+        try:
+            result.set(func(item))
+        except Exception:
+            result.set(error=sys.exc_info())
+
+
+def ordered_map(func, items, workers):
+    """
+    Yield func(item) for all items, in the order of items.
+
+    The calls are made by a pool of up to workers threads that take the
+    items from a queue. At most workers items are in progress at any time
+    and results are yielded as soon as all the results before them are in.
+    The first exception raised by func is re-raised once its result is due.
+    """
+    tasks = Queue()
+    threads = []
+    pending = collections.deque()
+    try:
+        for item in items:
+            if len(threads) < workers:
+                thread = threading.Thread(target=_work, args=(func, tasks))
+                thread.daemon = True
+                thread.start()
+                threads.append(thread)
+            result = _Result()
+            tasks.put((item, result))
+            pending.append(result)
+            if len(pending) >= workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        # Workers finish the items in progress before they stop.
+        for _thread in threads:
+            tasks.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+
+def and_query(query, condition):
+    """
+    Return the encoded query with the condition added to every ^NQ part.
+
+    The condition then applies to all the records the query matches.
+    """
+    parts = query.split("^NQ") if query else [""]
+    return "^NQ".join("^".join(p for p in (part, condition) if p) for part in parts)
+
+
+def keyset_query(query, last_sys_id=None):
+    """
+    Return the encoded query for the page of records after last_sys_id.
+    """
+    if "ORDERBY" in (query or ""):
+        raise errors.ServiceNowError(
+            "Keyset pagination orders records by sys_id and cannot be combined "
+            "with ORDERBY in the query."
+        )
+
+    if last_sys_id:
+        query = and_query(query, "sys_id>{0}".format(last_sys_id))
+    return "^".join(p for p in (query, "ORDERBYsys_id") if p)
+
+
+_NEXT_LINK = re.compile(r'<([^>]*)>\s*;\s*rel="next"')
+
+
+def next_link_offset(link):
+    """
+    Return the sysparm_offset of the rel="next" URL in the Link header.
+
+    Returns None if there is no next page.
+    """
+    match = _NEXT_LINK.search(link)
+    if not match:
+        return None
+    query = dict(parse_qsl(urlsplit(match.group(1)).query))
+    return int(query.get("sysparm_offset", 0))
+
+
+class PageSizer:
+    """
+    Page size that follows the observed cost of pages.
+
+    The size starts at initial and moves towards the number of records that
+    the instance returns in target_time seconds and that take at most
+    target_bytes bytes, but never changes by more than a factor of two per
+    page and always stays within [minimum, maximum]. A timed out request
+    halves the size.
+    """
+
+    def __init__(
+        self,
+        initial,
+        minimum=100,
+        maximum=10000,
+        target_time=5.0,
+        target_bytes=16 * 1024 * 1024,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_time = target_time
+        self.target_bytes = target_bytes
+        self.initial = self._bounded(initial)
+        self.size = self.initial
+        self.smallest = self.size
+        self.largest = self.size
+        self.pages = 0
+        self.timeouts = 0
+
+    def _bounded(self, size):
+        return max(self.minimum, min(self.maximum, int(size)))
+
+    def _set(self, size):
+        self.size = self._bounded(size)
+        self.smallest = min(self.smallest, self.size)
+        self.largest = max(self.largest, self.size)
+
+    def update(self, records, elapsed, size_bytes):
+        """
+        Adjust the size after a page of records was fetched.
+
+        Pages without records say nothing about the cost of a record and do
+        not change the size.
+        """
+        self.pages += 1
+        if not records:
+            return
+
+        ideal = self.target_time * records / max(elapsed, 0.001)
+        if size_bytes:
+            ideal = min(ideal, self.target_bytes * records / size_bytes)
+        self._set(max(self.size // 2, min(self.size * 2, ideal)))
+
+    def shrink(self):
+        """
+        Halve the size after a timed out request.
+
+        Returns False if the size is already at the minimum and the request
+        should not be retried.
+        """
+        self.timeouts += 1
+        if self.size <= self.minimum:
+            return False
+        self._set(self.size // 2)
+        return True
+
+    def summary(self):
+        return dict(
+            initial=self.initial,
+            final=self.size,
+            smallest=self.smallest,
+            largest=self.largest,
+            pages=self.pages,
+            timeouts=self.timeouts,
+        )
+
+
+def _body_size(response):
+    if isinstance(response, StreamingResponse):
+        return response.decoded_bytes
+    return len(response.data or b"")
+
+
+def _sys_id(record):
+    # Records have sys_id as a dict if sysparm_display_value is set to all.
+    sys_id = record["sys_id"]
+    return sys_id["value"] if isinstance(sys_id, dict) else sys_id
+
+
+class _Page:
+    """
+    Records of one page, decoded as they are iterated over.
+
+    Once all the records were iterated over, count is their number, last the
+    last record and state what a listing needs to resume after the page, as
+    returned by cursor(page). Fields in hidden are only used to compute the
+    state and are left out of the records.
+    """
+
+    def __init__(self, response, records, limit):
+        self.response = response
+        self.limit = limit
+        self.cursor = None
+        self.hidden = ()
+        self.count = 0
+        self.last = None
+        self.state = None
+
+        self._records = records
+
+    def __iter__(self):
+        for record in self._records:
+            self.count += 1
+            self.last = record
+            if self.hidden:
+                record = dict((k, v) for k, v in record.items() if k not in self.hidden)
+            yield record
+        self.state = self.cursor(self)
+
+
+def _records(pages):
+    """
+    Yield the records of the pages and close the pages once done.
+    """
+    try:
+        for page in pages:
+            for record in page:
+                yield record
+    finally:
+        pages.close()
+
+
+def _keyset_state(last_sys_id, page):
+    if page.last is not None:
+        last_sys_id = _sys_id(page.last)
+    # Only an empty page is the last one, because ACLs can make pages short.
+    return dict(last_sys_id=last_sys_id, done=page.count == 0)
+
+
+def _offset_state(offset, total, page):
+    headers = page.response.headers
+    if total is not None:
+        offset += page.limit
+        done = offset >= total
+    elif "link" in headers:
+        offset = next_link_offset(headers["link"])
+        done = offset is None
+    else:
+        # Only an empty page is the last one, because ACLs can make pages
+        # short.
+        done = page.count == 0
+        offset += page.limit
+    return dict(offset=offset, done=done)
 
 
 class SNowClient:
-    def __init__(self, client, batch_size=1000):
+    def __init__(
+        self,
+        client,
+        batch_size=1000,
+        stream=False,
+        page_workers=1,
+        pagination="offset",
+        count_strategy="every",
+        page_sizer=None,
+        checkpoint_dir=None,
+    ):
         self.client = client
         self.batch_size = batch_size
+        # Decode records while pages are downloaded instead of reading whole
+        # pages into memory first.
+        self.stream = stream
+        # Number of pages that are fetched concurrently once the total number
+        # of records is known.
+        self.page_workers = page_workers
+        # Either offset (sysparm_offset) or keyset (sys_id ordered) pagination.
+        self.pagination = pagination
+        # Which pages make the instance count the matching records: every,
+        # first or never. Without a count, the client follows the Link
+        # header or stops at the first empty page.
+        self.count_strategy = count_strategy
+        # Optional PageSizer that adjusts the page size to the observed cost
+        # of pages. Pages are then fetched one at a time.
+        self.page_sizer = page_sizer
+        # Directory for checkpoints that let a failed listing resume where it
+        # stopped instead of starting over.
+        self.checkpoint_dir = checkpoint_dir
 
     def list(self, api_path, query=None):
+        return list(_records(self._iter_pages(api_path, query)))
+
+    def iter_records(self, api_path, query=None):
+        """
+        Yield records from api_path page by page.
+
+        The next page is fetched in the background while the caller works
+        on the records of the current one, so records can be processed as
+        they arrive instead of after the last page is in.
+
+        api_path    -- full path (ex: "api/now/table/incident")
+        query       -- query in SNow format
+        """
+        return prefetch(_records(self._iter_pages(api_path, query)), self.batch_size)
+
+    def _iter_pages(self, api_path, query=None):
         base_query = self._sanitize_query(query)
         base_query["sysparm_limit"] = self.batch_size
+        get = self.client.get_stream if self.stream else self.client.get
 
-        offset = 0
-        total = 1  # Dummy value that ensures loop executes at least once
-        result = []
+        if self.pagination == "keyset":
+            # Check the query before the first request is made.
+            keyset_query(base_query.get("sysparm_query"))
+            pages = functools.partial(
+                self._iter_keyset_pages, api_path, base_query, get
+            )
+        else:
+            pages = functools.partial(
+                self._iter_offset_pages, api_path, base_query, get
+            )
+
+        if not self.checkpoint_dir:
+            return pages()
+
+        key = checkpoint.fingerprint(
+            self.client.host,
+            self.client.username,
+            api_path,
+            base_query,
+            self.pagination,
+        )
+        return self._iter_checkpointed_pages(
+            checkpoint.Checkpoint(self.checkpoint_dir, key), pages
+        )
+
+    @staticmethod
+    def _iter_checkpointed_pages(checkpoint, pages):
+        """
+        Yield the pages saved in the checkpoint, then fetch and save the rest.
+
+        Fetched pages are read whole, because they are saved before their
+        records are yielded. The checkpoint is removed once the last page is
+        in.
+        """
+        with checkpoint:
+            state = None
+            for state, records in checkpoint.load():
+                yield records
+
+            if not (state and state["done"]):
+                for page in pages(state):
+                    records = list(page)
+                    checkpoint.save(page.state, records)
+                    yield records
+            checkpoint.remove()
 
-        while offset < total:
-            response = self.client.get(
-                api_path,
-                query=dict(base_query, sysparm_offset=offset),
+    def _fetch_page(self, api_path, query, get, whole=False):
+        """
+        Return a _Page with the records of a single page.
+
+        Streamed records are decoded while the page is iterated over, unless
+        whole is set. With a page sizer, the page is requested with its
+        current size, the size is adjusted to the cost of the page, and timed
+        out requests are retried with smaller pages. Such pages are always
+        read whole, because a page cannot be retried once some of its records
+        were used.
+        """
+        if not self.page_sizer:
+            response = get(api_path, query=query)
+            records = self._page_records(response)
+            if whole:
+                records = list(records)
+            return _Page(response, records, self.batch_size)
+
+        while True:
+            limit = self.page_sizer.size
+            start = time.time()
+            try:
+                response = get(api_path, query=dict(query, sysparm_limit=limit))
+                page = list(self._page_records(response))
+            except errors.RequestTimeout:
+                if not self.page_sizer.shrink():
+                    raise
+                continue
+            self.page_sizer.update(len(page), time.time() - start, _body_size(response))
+            return _Page(response, page, limit)
+
+    def _iter_keyset_pages(self, api_path, base_query, get, resume=None):
+        """
+        Yield the pages of records ordered by sys_id.
+
+        Every page starts after the last sys_id of the previous one, so the
+        instance does not have to skip rows to find it, and records that are
+        inserted or deleted during the pull do not shift later pages.
+        """
+        query = dict(base_query, sysparm_no_count="true")
+        fields = base_query.get("sysparm_fields")
+        hidden = ()
+        if fields:
+            fields = [f.strip() for f in fields.split(",")]
+            if "sys_id" not in fields:
+                # The last sys_id of every page is needed for the next one.
+                query["sysparm_fields"] = ",".join(fields + ["sys_id"])
+                hidden = ("sys_id",)
+
+        last_sys_id = resume["last_sys_id"] if resume else None
+        while True:
+            query["sysparm_query"] = keyset_query(
+                base_query.get("sysparm_query"), last_sys_id
             )
+            page = self._fetch_page(api_path, dict(query), get)
+            page.hidden = hidden
+            page.cursor = functools.partial(_keyset_state, last_sys_id)
+            yield page
+            if page.state["done"]:
+                return
+            last_sys_id = page.state["last_sys_id"]
 
-            result.extend(response.json["result"])
-            # This is a header only for Table API.
-            # When using this client for generic api, the header is not present anymore
-            # and we need to find a new method to break from the loop
-            # It can be removed from Table API but for it's better to keep it for now.
-            if "x-total-count" in response.headers:
-                total = int(response.headers["x-total-count"])
-            else:
-                if len(response.json["result"]) == 0:
-                    break
+    def _iter_offset_pages(self, api_path, base_query, get, resume=None):
+        """
+        Yield the pages of records requested by offset.
+        """
+        count_strategy = self.count_strategy
+        if str(base_query.get("sysparm_no_count", "")).lower() == "true":
+            count_strategy = "never"
 
-            offset += self.batch_size
+        start = resume["offset"] if resume else 0
 
-        return result
+        def fetch(offset, total=None, whole=False):
+            query = dict(base_query, sysparm_offset=offset)
+            if count_strategy == "never" or (
+                count_strategy == "first" and offset != start
+            ):
+                query["sysparm_no_count"] = "true"
+            page = self._fetch_page(api_path, query, get, whole)
+            # Only the Table API reports the total number of records, and
+            # only if it was asked to count them.
+            if "x-total-count" in page.response.headers:
+                total = int(page.response.headers["x-total-count"])
+            page.cursor = functools.partial(_offset_state, offset, total)
+            return page, total
+
+        offset = start
+        total = None
+        while True:
+            page, total = fetch(offset, total)
+            yield page
+            if page.state["done"]:
+                return
+            offset = page.state["offset"]
+
+            if self.page_workers > 1 and total is not None and not self.page_sizer:
+                # All remaining offsets are known, fetch them concurrently.
+                # Concurrently fetched pages are read whole by the workers.
+                offsets = range(offset, total, self.batch_size)
+                pages = ordered_map(
+                    lambda o: fetch(o, total, whole=True)[0], offsets, self.page_workers
+                )
+                for page in pages:
+                    yield page
+                return
+
+    @staticmethod
+    def _page_records(response):
+        if isinstance(response, StreamingResponse):
+            return response.iter_records()
+        return response.json["result"]
 
     def get(self, api_path, query, must_exist=False):
         records = self.list(api_path, query)
+        return self._single_record(api_path, query, records, len(records), must_exist)
 
-        if len(records) > 1:
-            raise errors.ServiceNowError(
-                "{0} {1} records match the {2} query.".format(
-                    len(records), api_path, query
+    def get_many(self, lookups, must_exist=False):
+        """
+        Return the records matched by the lookups, in the same order.
+
+        lookups     -- list of (api_path, query) pairs. Every query must match
+                       at most one record.
+        must_exist  -- if true, every query must match exactly one record.
+
+        If the client has batching enabled, all lookups are sent in as few
+        Batch API requests as possible. Otherwise, this is the same as
+        calling get for every lookup.
+        """
+        if not getattr(self.client, "batch_requests", False):
+            return [self.get(path, query, must_exist) for path, query in lookups]
+
+        with self.client.batch() as batch:
+            # Two records are enough to tell if the query is ambiguous. The
+            # total count header tells the exact number.
+            pending = [
+                batch.get(
+                    path, dict(self._sanitize_query(dict(query)), sysparm_limit=2)
                 )
+                for path, query in lookups
+            ]
+
+        records = []
+        for (path, query), request in zip(lookups, pending):
+            response = request.response
+            if response.status != 200:
+                raise errors.UnexpectedAPIResponse(response.status, response.data)
+            result = response.json["result"]
+            count = int(response.headers.get("x-total-count", len(result)))
+            records.append(self._single_record(path, query, result, count, must_exist))
+        return records
+
+    @staticmethod
+    def _single_record(api_path, query, records, count, must_exist):
+        if count > 1:
+            raise errors.ServiceNowError(
+                "{0} {1} records match the {2} query.".format(count, api_path, query)
             )
 
         if must_exist and not records:
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+import threading
+
+from ansible.module_utils.six.moves.urllib.parse import urlsplit
+
+# Record identifiers in paths are replaced with a placeholder, so that all
+# requests for records of a table are counted as requests to one endpoint.
+_SYS_ID = re.compile(r"(?<=/)[0-9a-f]{32}(?=/|$)")
+
+
+def endpoint(url):
+    """
+    Return the path of the url, with sys_ids replaced by a placeholder.
+    """
+    return _SYS_ID.sub("{sys_id}", urlsplit(url).path) or "/"
+
+
+class _Counters:
+    def __init__(self):
+        self.requests = 0
+        self.sent_bytes = 0
+        self.received_bytes = 0
+        self.decoded_bytes = 0
+        self.elapsed = 0.0
+        self.retries = 0
+
+    def summary(self):
+        return dict(
+            requests=self.requests,
+            sent_bytes=self.sent_bytes,
+            received_bytes=self.received_bytes,
+            decoded_bytes=self.decoded_bytes,
+            elapsed=round(self.elapsed, 3),
+            retries=self.retries,
+        )
+
+
+class APIStats:
+    """
+    Number of HTTP requests the client made, grouped by method and endpoint.
+
+    Every HTTP exchange is counted, which includes the retried requests and
+    the requests for OAuth access tokens. Byte counts are the sizes of the
+    request and response bodies as they were transferred, except for
+    decoded_bytes, which is the size of the response bodies after
+    decompression.
+    """
+
+    def __init__(self):
+        self.auth_requests = 0
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def add(self, method, url, sent_bytes, received_bytes, elapsed, decoded_bytes=None):
+        """
+        Count a request. Without decoded_bytes, the response was not
+        compressed.
+        """
+        if decoded_bytes is None:
+            decoded_bytes = received_bytes
+        with self._lock:
+            counters = self._counters(method, url)
+            counters.requests += 1
+            counters.sent_bytes += sent_bytes
+            counters.received_bytes += received_bytes
+            counters.decoded_bytes += decoded_bytes
+            counters.elapsed += elapsed
+
+    def add_retry(self, method, url):
+        with self._lock:
+            self._counters(method, url).retries += 1
+
+    def add_auth(self):
+        with self._lock:
+            self.auth_requests += 1
+
+    def _counters(self, method, url):
+        key = (method.upper(), endpoint(url))
+        if key not in self._endpoints:
+            self._endpoints[key] = _Counters()
+        return self._endpoints[key]
+
+    def summary(self):
+        with self._lock:
+            totals = _Counters()
+            endpoints = []
+            for (method, path), counters in sorted(self._endpoints.items()):
+                totals.requests += counters.requests
+                totals.sent_bytes += counters.sent_bytes
+                totals.received_bytes += counters.received_bytes
+                totals.decoded_bytes += counters.decoded_bytes
+                totals.elapsed += counters.elapsed
+                totals.retries += counters.retries
+                endpoints.append(dict(counters.summary(), method=method, endpoint=path))
+
+            return dict(
+                totals.summary(), auth_requests=self.auth_requests, endpoints=endpoints
+            )
+
+
+def merge_summaries(summaries):
+    """
+    Combine the api_stats summaries of several module runs into one.
+    """
+    totals = _Counters()
+    auth_requests = 0
+    endpoints = {}
+    for summary in summaries:
+        auth_requests += summary.get("auth_requests", 0)
+        for e in summary.get("endpoints", []):
+            counters = endpoints.setdefault((e["method"], e["endpoint"]), _Counters())
+            for c in (counters, totals):
+                c.requests += e["requests"]
+                c.sent_bytes += e["sent_bytes"]
+                c.received_bytes += e["received_bytes"]
+                c.decoded_bytes += e.get("decoded_bytes", e["received_bytes"])
+                c.elapsed += e["elapsed"]
+                c.retries += e["retries"]
+
+    return dict(
+        totals.summary(),
+        auth_requests=auth_requests,
+        endpoints=[
+            dict(counters.summary(), method=method, endpoint=path)
+            for (method, path), counters in sorted(endpoints.items())
+        ],
+    )
+
+
+def api_stats_result(module, client):
+    """
+    Return the api_stats module result if the user asked for it.
+
+    Meant to be merged into the module result:
+
+        module.exit_json(changed=changed, **api_stats_result(module, client))
+    """
+    if not module.params.get("api_stats"):
+        return {}
+    return dict(api_stats=client.stats.summary())
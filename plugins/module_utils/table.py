@@ -18,15 +18,45 @@ def _query(original=None):
 
 
 class TableClient(snow.SNowClient):
-    def __init__(self, client, batch_size=1000):
-        super(TableClient, self).__init__(client, batch_size)
+    def __init__(
+        self,
+        client,
+        batch_size=1000,
+        stream=False,
+        page_workers=1,
+        pagination="offset",
+        count_strategy="every",
+        page_sizer=None,
+        checkpoint_dir=None,
+    ):
+        super(TableClient, self).__init__(
+            client,
+            batch_size,
+            stream,
+            page_workers,
+            pagination,
+            count_strategy,
+            page_sizer,
+            checkpoint_dir,
+        )
 
     def list_records(self, table, query=None):
         return self.list(self.path(table), query)
 
+    def iter_records(self, table, query=None):
+        return super(TableClient, self).iter_records(self.path(table), query)
+
     def get_record(self, table, query, must_exist=False):
         return self.get(self.path(table), query, must_exist)
 
+    def get_records(self, lookups, must_exist=False):
+        """
+        Return the records matched by the (table, query) lookups, in order.
+        """
+        return self.get_many(
+            [(self.path(table), query) for table, query in lookups], must_exist
+        )
+
     def get_record_by_sys_id(self, table, sys_id, must_exist=False):
         return self.get_by_sys_id(self.path(table), sys_id, must_exist)
 
@@ -58,36 +88,78 @@ class TableClient(snow.SNowClient):
         return "/".join(["api/now/table", table] + list(itertools.chain(subpaths)))
 
 
-def find_user(table_client, user_id):
+def user_lookup(user_id):
     # TODO: Maybe add a lookup-by-email option too?
-    return table_client.get_record("sys_user", dict(user_name=user_id), must_exist=True)
+    return "sys_user", dict(user_name=user_id)
+
+
+def assignment_group_lookup(assignment_name):
+    return "sys_user_group", dict(name=assignment_name)
+
+
+def find_references(table_client, lookups):
+    """
+    Resolve several references to records at once.
+
+    lookups -- dict that maps payload fields to (table, query) pairs, such as
+               the ones that user_lookup and assignment_group_lookup return.
+
+    Return a dict that maps the payload fields to the sys_ids of the matched
+    records. Every lookup must match exactly one record.
+    """
+    if not lookups:
+        return {}
+
+    fields = list(lookups)
+    records = table_client.get_records(
+        [lookups[field] for field in fields], must_exist=True
+    )
+    return dict((field, record["sys_id"]) for field, record in zip(fields, records))
+
+
+def find_user(table_client, user_id):
+    return table_client.get_record(*user_lookup(user_id), must_exist=True)
 
 
 def find_assignment_group(table_client, assignment_name):
     return table_client.get_record(
-        "sys_user_group", dict(name=assignment_name), must_exist=True
+        *assignment_group_lookup(assignment_name), must_exist=True
     )
 
 
+def standard_change_template_lookup(template_name):
+    return "std_change_producer_version", dict(name=template_name)
+
+
+def change_request_lookup(change_request_number):
+    return "change_request", dict(number=change_request_number)
+
+
+def configuration_item_lookup(item_name):
+    return "cmdb_ci", dict(name=item_name)
+
+
+def problem_lookup(problem_number):
+    return "problem", dict(number=problem_number)
+
+
 def find_standard_change_template(table_client, template_name):
     return table_client.get_record(
-        "std_change_producer_version",
-        dict(name=template_name),
-        must_exist=True,
+        *standard_change_template_lookup(template_name), must_exist=True
     )
 
 
 def find_change_request(table_client, change_request_number):
     return table_client.get_record(
-        "change_request", dict(number=change_request_number), must_exist=True
+        *change_request_lookup(change_request_number), must_exist=True
     )
 
 
 def find_configuration_item(table_client, item_name):
-    return table_client.get_record("cmdb_ci", dict(name=item_name), must_exist=True)
+    return table_client.get_record(
+        *configuration_item_lookup(item_name), must_exist=True
+    )
 
 
 def find_problem(table_client, problem_number):
-    return table_client.get_record(
-        "problem", dict(number=problem_number), must_exist=True
-    )
+    return table_client.get_record(*problem_lookup(problem_number), must_exist=True)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from .errors import ServiceNowError
+
+# Cached tokens are treated as expired this many seconds before their real
+# expiration, so that a token does not expire while a module is using it.
+REFRESH_MARGIN = 60
+
+
+def _digest(parts):
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def cache_key(host, client_id, grant_type, user, secrets=()):
+    """
+    Return the cache key for a token.
+
+    The key is a digest, so the cache file does not reveal which users or
+    client applications have tokens in it. It includes a hash of the
+    secrets, such as the client secret and the password, so that tokens
+    cached with old credentials are not used after the credentials change.
+    """
+    parts = [host.rstrip("/"), client_id or "", grant_type or "", user or ""]
+    parts.append(_digest([secret or "" for secret in secrets]))
+    return _digest(parts)
+
+
+class TokenCache:
+    """
+    OAuth access token cache that is shared between processes.
+
+    Tokens are stored in a JSON file next to their expiration time. All access
+    to the file happens while holding an exclusive lock on a separate lock
+    file, which makes the cache safe to use from parallel Ansible forks.
+    """
+
+    def __init__(self, path, refresh_margin=REFRESH_MARGIN):
+        self.path = os.path.expanduser(path)
+        self.refresh_margin = refresh_margin
+
+    @contextlib.contextmanager
+    def locked(self):
+        directory = os.path.dirname(self.path)
+        try:
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory, 0o700)
+            lock_fd = os.open(self.path + ".lock", os.O_CREAT | os.O_RDWR, 0o600)
+        except (IOError, OSError) as e:
+            raise ServiceNowError(
+                "Cannot open token cache {0}: {1}".format(self.path, e)
+            )
+
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            yield self
+        finally:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+            os.close(lock_fd)
+
+    def get(self, key):
+        entry = self._load().get(key)
+        if not entry:
+            return None
+        if entry["expires_at"] - self.refresh_margin <= time.time():
+            return None
+        return entry["access_token"]
+
+    def set(self, key, access_token, expires_in):
+        now = time.time()
+        tokens = dict((k, v) for k, v in self._load().items() if v["expires_at"] > now)
+        tokens[key] = dict(
+            access_token=access_token, expires_at=now + float(expires_in)
+        )
+        self._dump(tokens)
+
+    def invalidate(self, key):
+        tokens = self._load()
+        if tokens.pop(key, None):
+            self._dump(tokens)
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            # A missing or corrupted cache is the same as an empty one.
+            return {}
+
+    def _dump(self, tokens):
+        # Write to a temporary file first so that readers never see a
+        # partially written cache.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(tokens, f)
+            os.chmod(tmp_path, 0o600)
+            os.rename(tmp_path, self.path)
+        except (IOError, OSError) as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise ServiceNowError(
+                "Cannot write token cache {0}: {1}".format(self.path, e)
+            )
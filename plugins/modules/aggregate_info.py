@@ -0,0 +1,219 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: aggregate_info
+
+author:
+  - ServiceNow ITSM Collection Contributors (@ansible-collections)
+
+short_description: Count and aggregate ServiceNow table records
+
+description:
+  - Compute counts, sums, averages, minimums and maximums of the records of a table, optionally
+    grouped by one or more fields.
+  - The instance computes the aggregates with the Aggregate API, so only the results are
+    transferred instead of all the matching records.
+  - For more information, refer to the ServiceNow Aggregate API documentation at
+    U(https://docs.servicenow.com/bundle/xanadu-api-reference/page/integrate/inbound-rest/concept/c_AggregateAPI.html).
+
+version_added: 2.11.0
+
+extends_documentation_fragment:
+  - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
+  - servicenow.itsm.query
+  - servicenow.itsm.sysparm_display_value
+
+seealso:
+  - module: servicenow.itsm.api_info
+
+options:
+  table:
+    description:
+      - Name of the table to aggregate the records of.
+    type: str
+    required: true
+  count:
+    description:
+      - Count the records that match the query.
+    type: bool
+    default: true
+  avg:
+    description:
+      - Fields to compute the average value of.
+    type: list
+    elements: str
+  sum:
+    description:
+      - Fields to compute the sum of.
+    type: list
+    elements: str
+  min:
+    description:
+      - Fields to compute the minimum value of.
+    type: list
+    elements: str
+  max:
+    description:
+      - Fields to compute the maximum value of.
+    type: list
+    elements: str
+  group_by:
+    description:
+      - Fields to group the records by.
+      - Aggregates are computed for every group and returned in RV(groups) instead of RV(aggregate).
+    type: list
+    elements: str
+  having:
+    description:
+      - Condition that groups must meet to be returned, in the C(aggregate^field^operator^value)
+        format. For example, C(count^priority^>^3).
+    type: str
+  order_by:
+    description:
+      - Fields or aggregates to order the groups by, for example C(assignment_group) or
+        C(COUNT^DESC).
+    type: list
+    elements: str
+"""
+
+EXAMPLES = r"""
+- name: Count open incidents
+  servicenow.itsm.aggregate_info:
+    table: incident
+    sysparm_query: active=true
+  register: result
+
+- name: Count open P1 incidents per assignment group
+  servicenow.itsm.aggregate_info:
+    table: incident
+    query:
+      - active: = true
+        priority: = 1
+    group_by:
+      - assignment_group
+    sysparm_display_value: "true"
+    order_by:
+      - COUNT^DESC
+  register: result
+
+- name: Average reassignment count and longest outage of closed incidents per category
+  servicenow.itsm.aggregate_info:
+    table: incident
+    sysparm_query: state=7
+    avg:
+      - reassignment_count
+    max:
+      - business_duration
+    group_by:
+      - category
+  register: result
+"""
+
+RETURN = r"""
+aggregate:
+  description:
+    - Aggregates of all the records that match the query.
+    - I(count) is the number of records. The other keys map every field to the value of the
+      aggregate function.
+  returned: when I(group_by) is not set
+  type: dict
+  sample:
+    count: 42
+    avg:
+      reassignment_count: 1.25
+groups:
+  description:
+    - Aggregates of every group of records.
+    - I(group_by) holds the values of the I(group_by) fields that identify the group and
+      I(display_value) their display values, if the instance returned them.
+  returned: when I(group_by) is set
+  type: list
+  sample:
+    - group_by:
+        assignment_group: 287ebd7da9fe198100f92cc8d1d2154e
+      display_value:
+        assignment_group: Network
+      count: 12
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils import aggregate, arguments, client, errors, query, stats
+
+
+def build_query(module):
+    if module.params["query"]:
+        parsed, err = query.parse_query(module.params["query"])
+        if err:
+            raise errors.ServiceNowError(err)
+        return query.serialize_query(parsed)
+    return module.params["sysparm_query"]
+
+
+def run(module, aggregate_client):
+    return aggregate_client.aggregate(
+        module.params["table"],
+        query=build_query(module),
+        count=module.params["count"],
+        avg=module.params["avg"],
+        sum=module.params["sum"],
+        min=module.params["min"],
+        max=module.params["max"],
+        group_by=module.params["group_by"],
+        having=module.params["having"],
+        order_by=module.params["order_by"],
+        display_value=module.params["sysparm_display_value"],
+    )
+
+
+def main():
+    module = AnsibleModule(
+        supports_check_mode=True,
+        argument_spec=dict(
+            arguments.get_spec(
+                "instance",
+                "api_stats",
+                "query",
+                "sysparm_display_value",
+                "sysparm_query",
+            ),
+            table=dict(type="str", required=True),
+            count=dict(type="bool", default=True),
+            avg=dict(type="list", elements="str"),
+            sum=dict(type="list", elements="str"),
+            min=dict(type="list", elements="str"),
+            max=dict(type="list", elements="str"),
+            group_by=dict(type="list", elements="str"),
+            having=dict(type="str"),
+            order_by=dict(type="list", elements="str"),
+        ),
+        mutually_exclusive=[("sysparm_query", "query")],
+    )
+
+    try:
+        snow_client = client.Client(**module.params["instance"])
+        aggregate_client = aggregate.AggregateClient(snow_client)
+        result = run(module, aggregate_client)
+        if module.params["group_by"]:
+            result = dict(groups=result)
+        else:
+            result = dict(aggregate=result)
+        module.exit_json(
+            changed=False, **dict(result, **stats.api_stats_result(module, snow_client))
+        )
+    except errors.ServiceNowError as e:
+        module.fail_json(msg=str(e))
+
+
+if __name__ == "__main__":
+    main()
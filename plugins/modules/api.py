@@ -25,6 +25,7 @@ seealso:
   - module: servicenow.itsm.api_info
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id
 options:
   sys_id:
@@ -283,7 +284,7 @@ record:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, client, errors, table, generic
+from ..module_utils import arguments, client, errors, table, generic, stats
 from ..module_utils.api import (
     ACTION_DELETE,
     ACTION_PATCH,
@@ -346,6 +347,7 @@ def main():
     arg_spec = dict(
         arguments.get_spec(
             "instance",
+            "api_stats",
             "sys_id",  # necessary for deleting and patching a resource, not relevant if creating a resource
         ),
         resource=dict(type="str"),
@@ -386,7 +388,12 @@ def main():
             _client = table.TableClient(snow_client)
 
         changed, record, diff = run(module, _client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        module.exit_json(
+            changed=changed,
+            record=record,
+            diff=diff,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -22,6 +22,7 @@ description:
 version_added: 2.0.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id.info
 seealso:
   - module: servicenow.itsm.api
@@ -81,6 +82,99 @@ options:
       - Default is set to C(false).
     type: bool
     default: False
+  stream:
+    description:
+      - Decode records while the pages of records are downloaded, instead of reading
+        a complete page into memory first.
+      - This lowers the peak memory usage when retrieving large pages of records, at the
+        cost of some CPU time.
+    type: bool
+    default: false
+    version_added: 2.11.0
+  page_workers:
+    description:
+      - Number of pages of records that are fetched concurrently.
+      - The first page is fetched on its own. Once the instance reports the total number of
+        matching records, the remaining pages are fetched with up to I(page_workers) parallel
+        requests and reassembled in order.
+      - Has no effect on APIs that do not report the total number of records, or when I(no_count=true).
+    type: int
+    default: 1
+    version_added: 2.11.0
+  pagination:
+    description:
+      - How the module pages through the records.
+      - With V(offset), pages are requested with C(sysparm_offset).
+      - With V(keyset), records are ordered by C(sys_id) and every page starts after the last
+        C(sys_id) of the previous one. Every page costs the same regardless of its depth, and
+        records that are inserted or deleted during the pull do not cause duplicated or skipped
+        records. This mode cannot be combined with C(ORDERBY) in I(sysparm_query) and does not
+        use I(page_workers).
+    type: str
+    choices: [ offset, keyset ]
+    default: offset
+    version_added: 2.11.0
+  count_strategy:
+    description:
+      - Which queries make the instance count the matching records.
+      - With V(every), every page is counted. This was the behavior before version 2.11.0, set this
+        value to keep it.
+      - With V(first), only the first page is counted. The total is used to page through the rest of
+        the records and to fetch them concurrently with I(page_workers). Records that are inserted
+        while the module pages through the table are not fetched.
+      - With V(never), no page is counted. The module follows the C(Link) header if the API returns
+        one, and stops at the first empty page otherwise. Pages can be shorter than the page size
+        when ACLs hide some of their records, so a short page does not end the pull.
+      - I(no_count=true) implies V(never).
+    type: str
+    choices: [ every, first, never ]
+    default: first
+    version_added: 2.11.0
+  sysparm_limit:
+    description:
+      - Maximum number of records returned in a single page.
+      - With I(adaptive_sysparm_limit=true), this is the size of the first page.
+    type: int
+    default: 1000
+    version_added: 2.11.0
+  adaptive_sysparm_limit:
+    description:
+      - Adjust the page size while the records are retrieved.
+      - After every page, the page size moves towards the number of records the instance returns
+        in about five seconds, but it never more than doubles or halves from one page to the next.
+        A request that times out is retried with half the page size.
+      - Pages are fetched one at a time, so this does not use I(page_workers).
+      - The page sizes the module ended up using are returned in RV(page_size) and are a good
+        starting point for I(sysparm_limit).
+    type: bool
+    default: false
+    version_added: 2.11.0
+  min_sysparm_limit:
+    description:
+      - Smallest page size I(adaptive_sysparm_limit) can choose.
+    type: int
+    default: 100
+    version_added: 2.11.0
+  max_sysparm_limit:
+    description:
+      - Largest page size I(adaptive_sysparm_limit) can choose.
+    type: int
+    default: 10000
+    version_added: 2.11.0
+  checkpoint_dir:
+    description:
+      - Directory where the module keeps a checkpoint of the records it has retrieved so far.
+      - If the module fails midway, for example because a page timed out, the next run with the
+        same parameters picks up the saved records and continues from the page that failed instead
+        of starting over.
+      - The checkpoint is removed once all records are retrieved. Checkpoints older than a day
+        are not resumed.
+      - With I(pagination=offset), records that are inserted or deleted between the runs shift the
+        page boundaries. Use I(pagination=keyset) to resume long retrievals reliably.
+      - The retrieved records are stored unencrypted, as JSON. The directory is created readable
+        only by its owner if it does not exist, and so are the checkpoint files.
+    type: path
+    version_added: 2.11.0
 """
 
 EXAMPLES = """
@@ -118,6 +212,16 @@ EXAMPLES = """
 - name: Retrieve all linux servers
   servicenow.itsm.api_info:
     api_path: api/now/cmdb/instance/cmdb_ci_linux_server
+
+- name: Retrieve all incidents and let the module find a good page size
+  servicenow.itsm.api_info:
+    resource: incident
+    adaptive_sysparm_limit: true
+  register: result
+
+- name: Show the page size the module settled on
+  ansible.builtin.debug:
+    msg: "{{ result.page_size.final }}"
 """
 
 RETURN = r"""
@@ -216,11 +320,35 @@ records:
       work_notes: ""
       work_notes_list: ""
       work_start: ""
+page_size:
+  description:
+    - Page sizes chosen by I(adaptive_sysparm_limit).
+    - I(final) is the size of the last page, I(smallest) and I(largest) are the bounds of all the
+      sizes used, and I(timeouts) is the number of requests that timed out.
+  returned: when I(adaptive_sysparm_limit=true)
+  type: dict
+  version_added: 2.11.0
+  sample:
+    initial: 1000
+    final: 4000
+    smallest: 1000
+    largest: 4000
+    pages: 7
+    timeouts: 0
 """
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, client, errors, table, utils, generic
+from ..module_utils import (
+    arguments,
+    client,
+    errors,
+    table,
+    utils,
+    generic,
+    snow,
+    stats,
+)
 from ..module_utils.api import (
     FIELD_COLUMNS_NAME,
     POSSIBLE_FILTER_PARAMETERS,
@@ -240,7 +368,7 @@ def run(module, client):
 
 def main():
     arg_spec = dict(
-        arguments.get_spec("instance", "sys_id"),
+        arguments.get_spec("instance", "api_stats", "sys_id"),
         resource=dict(type="str"),
         api_path=dict(type="str"),
         sysparm_query=dict(type="str"),
@@ -268,6 +396,17 @@ def main():
             type="bool",
             default=False,  # to enforce False when this parameter is omitted from a playbook
         ),  # Do not execute a select count(*) on table (default: false)
+        stream=dict(type="bool", default=False),
+        page_workers=dict(type="int", default=1),
+        pagination=dict(type="str", choices=["offset", "keyset"], default="offset"),
+        count_strategy=dict(
+            type="str", choices=["every", "first", "never"], default="first"
+        ),
+        sysparm_limit=dict(type="int", default=1000),
+        adaptive_sysparm_limit=dict(type="bool", default=False),
+        min_sysparm_limit=dict(type="int", default=100),
+        max_sysparm_limit=dict(type="int", default=10000),
+        checkpoint_dir=dict(type="path"),
     )
 
     module = AnsibleModule(
@@ -280,13 +419,30 @@ def main():
     try:
         snow_client = client.Client(**module.params["instance"])
 
+        options = dict(
+            stream=module.params["stream"],
+            page_workers=module.params["page_workers"],
+            pagination=module.params["pagination"],
+            count_strategy=module.params["count_strategy"],
+            batch_size=module.params["sysparm_limit"],
+            checkpoint_dir=module.params["checkpoint_dir"],
+        )
+        if module.params["adaptive_sysparm_limit"]:
+            options["page_sizer"] = snow.PageSizer(
+                module.params["sysparm_limit"],
+                minimum=module.params["min_sysparm_limit"],
+                maximum=module.params["max_sysparm_limit"],
+            )
         if module.params["api_path"]:
-            _client = generic.GenericClient(snow_client)
+            _client = generic.GenericClient(snow_client, **options)
         else:
-            _client = table.TableClient(snow_client)
+            _client = table.TableClient(snow_client, **options)
 
         records = run(module, _client)
-        module.exit_json(changed=False, record=records)
+        result = stats.api_stats_result(module, snow_client)
+        if _client.page_sizer:
+            result["page_size"] = _client.page_sizer.summary()
+        module.exit_json(changed=False, record=records, **result)
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
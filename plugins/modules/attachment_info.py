@@ -22,6 +22,7 @@ description:
 version_added: 2.0.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
 
 options:
   dest:
@@ -89,7 +90,7 @@ import time
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, attachment, client, errors
+from ..module_utils import arguments, attachment, client, errors, stats
 
 
 def run(module, attachment_client):
@@ -123,7 +124,7 @@ def run(module, attachment_client):
 
 def main():
     module_args = dict(
-        arguments.get_spec("instance"),
+        arguments.get_spec("instance", "api_stats"),
         # Overwrites sys_id from SHARED_SPECS to add required=True
         sys_id=dict(
             type="str",
@@ -144,7 +145,9 @@ def main():
         snow_client = client.Client(**module.params["instance"])
         attachment_client = attachment.AttachmentClient(snow_client)
         record = run(module, attachment_client)
-        module.exit_json(changed=True, record=record)
+        module.exit_json(
+            changed=True, record=record, **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
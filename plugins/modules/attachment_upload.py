@@ -24,6 +24,7 @@ description:
 version_added: 2.2.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.attachments
 seealso:
   - module: servicenow.itsm.attachment_info
@@ -91,7 +92,7 @@ records:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, attachment, client, errors
+from ..module_utils import arguments, attachment, client, errors, stats
 
 
 def run(module, attachment_client):
@@ -128,7 +129,7 @@ def run(module, attachment_client):
 
 def main():
     module_args = dict(
-        arguments.get_spec("instance", "attachments"),
+        arguments.get_spec("instance", "api_stats", "attachments"),
         table_sys_id=dict(
             type="str",
             required=True,
@@ -148,7 +149,12 @@ def main():
         snow_client = client.Client(**module.params["instance"])
         attachment_client = attachment.AttachmentClient(snow_client)
         changed, records, diff = run(module, attachment_client)
-        module.exit_json(changed=changed, records=records, diff=diff)
+        module.exit_json(
+            changed=changed,
+            records=records,
+            diff=diff,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -21,6 +21,7 @@ description:
 version_added: 2.7.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id
   - servicenow.itsm.number
   - servicenow.itsm.attachments
@@ -220,7 +221,7 @@ record:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, client, errors, table, utils
+from ..module_utils import arguments, client, errors, stats, table, utils
 from ..module_utils.utils import get_mapper
 
 # Direct payload fields that don't need special processing
@@ -330,26 +331,19 @@ def build_payload(module, table_client):
         payload = dict()
     payload.update(utils.filter_dict(module.params, *DIRECT_PAYLOAD_FIELDS))
 
-    # Handle user lookups using existing table utilities
-    if module.params.get("requested_for"):
-        user = table.find_user(table_client, module.params["requested_for"])
-        payload["requested_for"] = user["sys_id"]
+    # Resolve all user and group references at once, which takes a single
+    # request when the Batch API is enabled.
+    lookups = dict()
+    for field in ("requested_for", "requested_by", "assigned_to"):
+        if module.params.get(field):
+            lookups[field] = table.user_lookup(module.params[field])
 
-    if module.params.get("requested_by"):
-        user = table.find_user(table_client, module.params["requested_by"])
-        payload["requested_by"] = user["sys_id"]
-
-    if module.params.get("assigned_to"):
-        user = table.find_user(table_client, module.params["assigned_to"])
-        payload["assigned_to"] = user["sys_id"]
-
-    # Handle group lookup using existing table utilities
     if module.params.get("assignment_group"):
-        group = table.find_assignment_group(
-            table_client, module.params["assignment_group"]
+        lookups["assignment_group"] = table.assignment_group_lookup(
+            module.params["assignment_group"]
         )
-        payload["assignment_group"] = group["sys_id"]
 
+    payload.update(table.find_references(table_client, lookups))
     return payload
 
 
@@ -362,7 +356,12 @@ def run(module, table_client):
 def main():
     module_args = dict(
         arguments.get_spec(
-            "instance", "sys_id", "number", "attachments", "catalog_request_mapping"
+            "instance",
+            "api_stats",
+            "sys_id",
+            "number",
+            "attachments",
+            "catalog_request_mapping",
         ),
         state=dict(
             type="str",
@@ -428,7 +427,12 @@ def main():
         snow_client = client.Client(**module.params["instance"])
         table_client = table.TableClient(snow_client)
         changed, record, diff = run(module, table_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        module.exit_json(
+            changed=changed,
+            record=record,
+            diff=diff,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -27,6 +27,7 @@ description:
 version_added: 1.0.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id
   - servicenow.itsm.number
   - servicenow.itsm.attachments
@@ -217,6 +218,7 @@ from ..module_utils import (
     attachment,
     client,
     errors,
+    stats,
     table,
     utils,
     validation,
@@ -349,24 +351,26 @@ def build_payload(module, table_client):
     if module.params["hold_reason"]:
         payload["on_hold_reason"] = module.params["hold_reason"]
 
+    # Resolve all references at once, which takes a single request when the
+    # Batch API is enabled.
+    lookups = dict()
     if module.params["requested_by"]:
-        user = table.find_user(table_client, module.params["requested_by"])
-        payload["requested_by"] = user["sys_id"]
+        lookups["requested_by"] = table.user_lookup(module.params["requested_by"])
 
     if module.params["assignment_group"]:
-        assignment_group = table.find_assignment_group(
-            table_client, module.params["assignment_group"]
+        lookups["assignment_group"] = table.assignment_group_lookup(
+            module.params["assignment_group"]
         )
-        payload["assignment_group"] = assignment_group["sys_id"]
-
-    if module.params["assignment_group_id"]:
-        payload["assignment_group"] = module.params["assignment_group_id"]
 
     if module.params["template"]:
-        standard_change_template = table.find_standard_change_template(
-            table_client, module.params["template"]
+        lookups["std_change_producer_version"] = table.standard_change_template_lookup(
+            module.params["template"]
         )
-        payload["std_change_producer_version"] = standard_change_template["sys_id"]
+
+    payload.update(table.find_references(table_client, lookups))
+
+    if module.params["assignment_group_id"]:
+        payload["assignment_group"] = module.params["assignment_group_id"]
 
     return payload
 
@@ -380,7 +384,12 @@ def run(module, table_client, attachment_client):
 def main():
     module_args = dict(
         arguments.get_spec(
-            "instance", "sys_id", "number", "attachments", "change_request_mapping"
+            "instance",
+            "api_stats",
+            "sys_id",
+            "number",
+            "attachments",
+            "change_request_mapping",
         ),
         state=dict(
             type="str",
@@ -466,7 +475,12 @@ def main():
         table_client = table.TableClient(snow_client)
         attachment_client = attachment.AttachmentClient(snow_client)
         changed, record, diff = run(module, table_client, attachment_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        module.exit_json(
+            changed=changed,
+            record=record,
+            diff=diff,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
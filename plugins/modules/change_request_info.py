@@ -26,6 +26,7 @@ description:
 version_added: 1.0.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id.info
   - servicenow.itsm.number.info
   - servicenow.itsm.query
@@ -205,7 +206,16 @@ records:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, attachment, client, errors, query, table, utils
+from ..module_utils import (
+    arguments,
+    attachment,
+    client,
+    errors,
+    query,
+    stats,
+    table,
+    utils,
+)
 from ..module_utils.change_request import PAYLOAD_FIELDS_MAPPING
 from ..module_utils.utils import get_mapper
 
@@ -284,7 +294,7 @@ def run(module, table_client, attachment_client):
                 dict(table_name="change_request", table_sys_id=record["sys_id"]),
             ),
         )
-        for record in table_client.list_records("change_request", query)
+        for record in table_client.iter_records("change_request", query)
     ]
 
 
@@ -294,6 +304,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "instance",
+                "api_stats",
                 "sys_id",
                 "number",
                 "query",
@@ -316,7 +327,11 @@ def main():
         table_client = table.TableClient(snow_client)
         attachment_client = attachment.AttachmentClient(snow_client)
         records = run(module, table_client, attachment_client)
-        module.exit_json(changed=False, records=records)
+        module.exit_json(
+            changed=False,
+            records=records,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -26,6 +26,7 @@ description:
 version_added: 1.3.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id
   - servicenow.itsm.number
   - servicenow.itsm.change_request_task_mapping
@@ -178,7 +179,7 @@ EXAMPLES = """
 
 from ..module_utils.utils import get_mapper
 from ..module_utils.change_request_task import PAYLOAD_FIELDS_MAPPING
-from ..module_utils import arguments, client, errors, table, utils, validation
+from ..module_utils import arguments, client, errors, stats, table, utils, validation
 from ansible.module_utils.basic import AnsibleModule
 
 DIRECT_PAYLOAD_FIELDS = (
@@ -290,37 +291,35 @@ def build_payload(module, table_client):
     if module.params["hold_reason"]:
         payload["on_hold_reason"] = module.params["hold_reason"]
 
-    # Map the configuration item
+    # Resolve all references at once, which takes a single request when the
+    # Batch API is enabled.
+    lookups = dict()
     if module.params["configuration_item"]:
-        configuration_item = table.find_configuration_item(
-            table_client, module.params["configuration_item"]
+        lookups["cmdb_ci"] = table.configuration_item_lookup(
+            module.params["configuration_item"]
         )
-        payload["cmdb_ci"] = configuration_item["sys_id"]
 
-    if module.params["configuration_item_id"]:
-        payload["cmdb_ci"] = module.params["configuration_item_id"]
-
-    # Map the change request
     if module.params["change_request_number"]:
-        configuration_item = table.find_change_request(
-            table_client, module.params["change_request_number"]
+        lookups["change_request"] = table.change_request_lookup(
+            module.params["change_request_number"]
         )
-        payload["change_request"] = configuration_item["sys_id"]
 
-    if module.params["change_request_id"]:
-        payload["change_request"] = module.params["change_request_id"]
-
-    # Map the assignee
     if module.params["assigned_to"]:
-        user = table.find_user(table_client, module.params["assigned_to"])
-        payload["assigned_to"] = user["sys_id"]
+        lookups["assigned_to"] = table.user_lookup(module.params["assigned_to"])
 
-    # Map the assigned group
     if module.params["assignment_group"]:
-        assignment_group = table.find_assignment_group(
-            table_client, module.params["assignment_group"]
+        lookups["assignment_group"] = table.assignment_group_lookup(
+            module.params["assignment_group"]
         )
-        payload["assignment_group"] = assignment_group["sys_id"]
+
+    payload.update(table.find_references(table_client, lookups))
+
+    # Ids take precedence over the resolved references.
+    if module.params["configuration_item_id"]:
+        payload["cmdb_ci"] = module.params["configuration_item_id"]
+
+    if module.params["change_request_id"]:
+        payload["change_request"] = module.params["change_request_id"]
 
     if module.params["assignment_group_id"]:
         payload["assignment_group"] = module.params["assignment_group"]
@@ -337,7 +336,7 @@ def run(module, table_client):
 def main():
     module_args = dict(
         arguments.get_spec(
-            "instance", "sys_id", "number", "change_request_task_mapping"
+            "instance", "api_stats", "sys_id", "number", "change_request_task_mapping"
         ),
         configuration_item=dict(
             type="str",
@@ -424,7 +423,12 @@ def main():
         snow_client = client.Client(**module.params["instance"])
         table_client = table.TableClient(snow_client)
         changed, record, diff = run(module, table_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        module.exit_json(
+            changed=changed,
+            record=record,
+            diff=diff,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
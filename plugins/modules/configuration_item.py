@@ -32,6 +32,7 @@ description:
 version_added: 1.0.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id
   - servicenow.itsm.attachments
   - servicenow.itsm.configuration_item_mapping
@@ -269,7 +270,7 @@ record:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, attachment, client, errors, table, utils
+from ..module_utils import arguments, attachment, client, errors, stats, table, utils
 from ..module_utils.configuration_item import PAYLOAD_FIELDS_MAPPING
 from ..module_utils.utils import get_mapper
 
@@ -420,7 +421,11 @@ def run(module, table_client, attachment_client):
 def main():
     module_args = dict(
         arguments.get_spec(
-            "instance", "sys_id", "attachments", "configuration_item_mapping"
+            "instance",
+            "api_stats",
+            "sys_id",
+            "attachments",
+            "configuration_item_mapping",
         ),
         state=dict(
             type="str",
@@ -488,7 +493,12 @@ def main():
         table_client = table.TableClient(snow_client)
         attachment_client = attachment.AttachmentClient(snow_client)
         changed, record, diff = run(module, table_client, attachment_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        module.exit_json(
+            changed=changed,
+            record=record,
+            diff=diff,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -26,6 +26,7 @@ description:
 version_added: 1.2.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
 
 seealso:
   - module: servicenow.itsm.configuration_item
@@ -40,16 +41,46 @@ options:
   id_column_set:
     description:
       - Columns that should be used to identify an existing record that we need to update.
-    required: true
+      - Required if I(engine=table). The C(ire) engine identifies records with the identification
+        rules of the instance and ignores this option.
     type: list
     elements: str
   dataset:
     description:
       - List of dictionaries that will be used as a data source.
       - Each item in a list represents one CMDB item.
-    required: true
+      - Exactly one of I(dataset) and I(dataset_file) is required.
     type: list
     elements: dict
+  dataset_file:
+    description:
+      - Path to a file on the controller with the data source, one CMDB item per row.
+      - The file is searched for like the source of the M(ansible.builtin.copy) module and can be
+        vault encrypted.
+      - The rows are read in chunks of I(dataset_chunk_size) and the module runs once per chunk,
+        so memory use does not grow with the size of the file. The results of the runs are merged.
+      - Cannot be used with I(relations) or in async tasks.
+      - Mutually exclusive with I(dataset).
+    type: path
+    version_added: 2.11.0
+  dataset_file_format:
+    description:
+      - Format of I(dataset_file).
+      - C(jsonl) files have one JSON object per line. C(csv) files have a header row with the column
+        names, and all the values are strings.
+      - If not set, files with the C(.csv) extension are read as C(csv) and all the other files
+        as C(jsonl).
+    type: str
+    choices:
+      - jsonl
+      - csv
+    version_added: 2.11.0
+  dataset_chunk_size:
+    description:
+      - Number of I(dataset_file) rows that one module run syncs.
+    type: int
+    default: 1000
+    version_added: 2.11.0
   map:
     description:
       - Transformation instructions on how to convert input data to CMDB items.
@@ -58,6 +89,164 @@ options:
       - Data is returned as string because ServiceNow API expect this
     required: true
     type: dict
+  concurrency:
+    description:
+      - Maximum number of configuration items that are created or updated at the same time.
+      - Items that share the values of I(id_column_set) are always synced one after the other, in
+        dataset order.
+      - With I(engine=ire), this is the number of chunks that are sent at the same time.
+      - Keep this value below the number of concurrent requests the instance allows for the user.
+    type: int
+    default: 1
+    version_added: 2.11.0
+  journal:
+    description:
+      - Path to a journal file on the host that runs the module.
+      - After every item that ends up in sync with its record, the module adds the values of
+        I(id_column_set), a hash of the item and the C(sys_id), C(sys_updated_on) and
+        C(sys_mod_count) of the record to the journal.
+      - When the module runs again, it skips the items whose hash matches the journal and whose
+        records did not change since, without fetching or updating their records. A rerun after a
+        failure then only syncs the items that were not synced yet.
+      - The records of skipped items in RV(records) only contain the values of the item and the
+        C(sys_id), C(sys_updated_on) and C(sys_mod_count) fields.
+      - If another run holds the lock on the journal, the module syncs all the items and does not
+        update the journal.
+      - Only valid with I(engine=table).
+    type: path
+    version_added: 2.11.0
+  sync:
+    description:
+      - How the dataset relates to the records of I(sys_class_name).
+      - With C(merge), the module creates and updates the records of the dataset items and leaves
+        all the other records alone.
+      - With C(authoritative), the dataset is the complete list of records in I(scope). After all
+        the items are synced, the module retires or deletes, as set by I(retire_action), the
+        records in I(scope) whose I(id_column_set) values do not match any dataset item.
+        Records that the module synced in the same run are never retired, even if the instance
+        identified them by other fields than I(id_column_set), as it can with I(engine=ire).
+      - An empty dataset would retire all the records in I(scope), so it fails unless
+        I(allow_empty_dataset) is set.
+      - Records are not retired if any of the items failed to sync.
+      - Cannot be used with I(dataset_file), because every chunk of the file would retire the
+        records of the other chunks.
+    type: str
+    choices:
+      - merge
+      - authoritative
+    default: merge
+    version_added: 2.11.0
+  scope:
+    description:
+      - Encoded query that selects the records that I(sync=authoritative) manages, for example
+        C(discovery_source=AWS^install_status!=7).
+      - Required if I(sync=authoritative). The records in scope are listed once, with only the
+        fields needed to identify them.
+      - Only records whose class is I(sys_class_name) are in scope. Records of its child classes,
+        for example C(cmdb_ci_linux_server) records for I(sys_class_name=cmdb_ci_server), are
+        never retired.
+    type: str
+    version_added: 2.11.0
+  allow_empty_dataset:
+    description:
+      - Retire all the records in I(scope) if the dataset is empty and I(sync=authoritative).
+      - By default, the module fails instead, so that a failed export that yields no items does not
+        retire all the records.
+    type: bool
+    default: false
+    version_added: 2.11.0
+  retire_action:
+    description:
+      - What I(sync=authoritative) does with the records in I(scope) that are not in the dataset.
+      - C(retire) sets the I(retired_values) fields on the records and skips the records that
+        already have them. C(delete) deletes the records.
+      - Every record is retired or deleted with a request of its own, up to I(concurrency) at the
+        same time. Enable I(batch_requests) in I(instance) to send the requests through the Batch API
+        instead, which takes one request per I(batch_max_requests) records.
+    type: str
+    choices:
+      - retire
+      - delete
+    default: retire
+    version_added: 2.11.0
+  retired_values:
+    description:
+      - Field values that mark a record as retired.
+    type: dict
+    default:
+      install_status: "7"
+    version_added: 2.11.0
+  result_mode:
+    description:
+      - What the module returns for the dataset items.
+      - With C(full), RV(records) contains the record of every item, in dataset order.
+      - With C(changed_only), RV(records) only contains the records of the items that were created
+        or updated, in dataset order.
+      - With C(summary), RV(records) is empty and RV(changed_items) lists the C(sys_id) and the
+        I(id_column_set) values of the created and updated items. RV(retired_records) are reduced
+        to the same fields. Use this mode for large datasets, where returning the full records
+        takes a lot of time and memory on the controller.
+      - RV(summary) is returned in all modes.
+    type: str
+    choices:
+      - full
+      - changed_only
+      - summary
+    default: full
+    version_added: 2.11.0
+  engine:
+    description:
+      - How configuration items are identified, created and updated.
+      - With C(table), the module looks up the records that match I(id_column_set) and creates or
+        updates them with the Table API, which takes up to two requests per item.
+      - With C(ire), the module sends items in chunks of I(chunk_size) to the CMDB Identification
+        and Reconciliation API, which identifies, creates and updates all the items of a chunk
+        in one request. The records of the items are then fetched in bulk.
+      - The C(ire) engine requires identification rules for I(sys_class_name) on the instance.
+    type: str
+    choices:
+      - table
+      - ire
+    default: table
+    version_added: 2.11.0
+  chunk_size:
+    description:
+      - Maximum number of items that the C(ire) engine sends in one request.
+      - Related items are always sent together, so a set of related items that is larger than
+        this value is sent in a single request.
+    type: int
+    default: 100
+    version_added: 2.11.0
+  data_source:
+    description:
+      - Discovery source that the C(ire) engine reports the items as coming from.
+      - Must be one of the choices of the C(discovery_source) field on the instance.
+    type: str
+    default: ServiceNow
+    version_added: 2.11.0
+  relations:
+    description:
+      - Relationships between dataset items that the C(ire) engine creates along with the items.
+      - Only valid with I(engine=ire).
+    type: list
+    elements: dict
+    version_added: 2.11.0
+    suboptions:
+      parent:
+        description:
+          - Position of the parent item in I(dataset), starting at 0.
+        type: int
+        required: true
+      child:
+        description:
+          - Position of the child item in I(dataset), starting at 0.
+        type: int
+        required: true
+      type:
+        description:
+          - Relationship type, for example C(Runs on::Runs).
+        type: str
+        required: true
 """
 
 EXAMPLES = r"""
@@ -89,6 +278,78 @@ EXAMPLES = r"""
     map:
       name: tags.Name
       ip_address: private_ip_address
+
+- name: Sync a large dataset with up to 8 concurrent writes
+  servicenow.itsm.configuration_item_batch:
+    sys_class_name: cmdb_ci_server
+    id_column_set: name
+    dataset: "{{ input_data }}"
+    map:
+      name: tags.Name
+      ip_address: private_ip_address
+    concurrency: 8
+
+- name: Sync a large inventory export in chunks of 5000 rows
+  servicenow.itsm.configuration_item_batch:
+    sys_class_name: cmdb_ci_server
+    id_column_set: name
+    dataset_file: servers.csv
+    dataset_chunk_size: 5000
+    map:
+      name: hostname
+      ip_address: ip
+
+- name: Sync a dataset so that reruns skip the items that are already in sync
+  servicenow.itsm.configuration_item_batch:
+    sys_class_name: cmdb_ci_server
+    id_column_set: name
+    dataset: "{{ input_data }}"
+    map:
+      name: tags.Name
+      ip_address: private_ip_address
+    journal: ~/.cache/servicenow/cmdb_ci_server.journal
+
+- name: Mirror the servers of an external inventory and retire the ones that are gone
+  servicenow.itsm.configuration_item_batch:
+    sys_class_name: cmdb_ci_server
+    id_column_set: name
+    dataset: "{{ inventory_servers }}"
+    map:
+      name: hostname
+      ip_address: ip
+      discovery_source: "'ServiceWatch'"
+    sync: authoritative
+    scope: discovery_source=ServiceWatch
+  register: result
+
+- name: Sync a large dataset and only return the counts and the changed items
+  servicenow.itsm.configuration_item_batch:
+    sys_class_name: cmdb_ci_server
+    id_column_set: name
+    dataset_file: servers.jsonl
+    map:
+      name: hostname
+      ip_address: ip
+    result_mode: summary
+  register: result
+
+- name: Sync servers and the dependencies between them with the IRE API
+  servicenow.itsm.configuration_item_batch:
+    sys_class_name: cmdb_ci_linux_server
+    engine: ire
+    data_source: ServiceNow
+    dataset:
+      - name: web-01
+        serial_number: SN-0001
+      - name: web-02
+        serial_number: SN-0002
+    map:
+      name: name
+      serial_number: serial_number
+    relations:
+      - parent: 0
+        child: 1
+        type: Depends on::Used by
 """
 
 
@@ -99,6 +360,8 @@ records:
     - Note that the fields of the returned records depend on the configuration
       item's I(sys_class_name).
     - Returning of values added in version 2.0.0.
+    - Only contains the records of created and updated items if I(result_mode=changed_only), and
+      is empty if I(result_mode=summary).
   returned: success
   type: list
   sample:
@@ -170,47 +433,741 @@ records:
         value: 04a96c0d3790200044e0bfc8bcbe5db3
       purchase_date: '2019-05-25'
       lease_id: ''
+summary:
+  description:
+    - Number of dataset items whose records were created, updated or already in sync, and of
+      the items that failed.
+    - I(retired) is the number of records that I(sync=authoritative) retired or deleted.
+  returned: success and when some items failed
+  type: dict
+  version_added: 2.11.0
+  sample:
+    created: 12
+    updated: 3
+    unchanged: 985
+    failed: 0
+    retired: 2
+changed_items:
+  description:
+    - Dataset items whose records were created or updated.
+    - I(index) is the position of the item in I(dataset), I(operation) is C(created) or
+      C(updated) and the other fields are the C(sys_id) and I(id_column_set) values of the record.
+  returned: when I(result_mode=summary)
+  type: list
+  version_added: 2.11.0
+  sample:
+    - index: 4
+      operation: created
+      sys_id: 00a96c0d3790200044e0bfc8bcbe5db4
+      name: web-05
+retired_records:
+  description:
+    - Records that I(sync=authoritative) retired or deleted.
+    - Retired records are returned as they are after the update. Deleted records, and all the
+      records if I(result_mode=summary), only contain the C(sys_id) and I(id_column_set) fields.
+  returned: when I(sync=authoritative)
+  type: list
+  version_added: 2.11.0
+  sample:
+    - sys_id: 00a96c0d3790200044e0bfc8bcbe5db4
+      name: old-server
+      install_status: "7"
+failed_retirements:
+  description:
+    - Records that I(sync=authoritative) could not retire or delete, with the error.
+  returned: failure
+  type: list
+  version_added: 2.11.0
+  sample:
+    - sys_id: 00a96c0d3790200044e0bfc8bcbe5db4
+      msg: "Unexpected response - 403 Insufficient rights to update records"
+failed_items:
+  description:
+    - Dataset items that could not be created or updated.
+    - I(index) is the position of the item in I(dataset) and I(msg) the error. The records of
+      failed items are C(null) in the list of records, the records of the other items are
+      returned as usual.
+  returned: failure
+  type: list
+  version_added: 2.11.0
+  sample:
+    - index: 3
+      msg: "Unexpected response - 403 Insufficient rights to update records"
 """
 
 
+import itertools
+from collections import OrderedDict
+
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_text
+
+from ..module_utils import (
+    arguments,
+    client,
+    errors,
+    ire,
+    journal,
+    snow,
+    stats,
+    table,
+    utils,
+)
+
+# Maximum length of the encoded queries that fetch the current records. Long
+# queries end up in the URL, which instances limit in size.
+MAX_QUERY_LENGTH = 4000
+
+# Fields that tell whether a journaled record changed since it was synced.
+JOURNAL_FIELDS = ("sys_updated_on", "sys_mod_count")
+
+# What happened to the record of a dataset item.
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+# Install status of retired configuration items.
+RETIRED_VALUES = dict(install_status="7")
+
+# What the module returns for the synced items.
+FULL = "full"
+CHANGED_ONLY = "changed_only"
+SUMMARY = "summary"
+
+
+def _value(value):
+    return "" if value is None else to_text(value)
+
+
+def identity(record, id_column_set):
+    # Encoded query equality is case-insensitive on instances, so the index
+    # is as well.
+    return tuple(_value(record.get(c)).lower() for c in id_column_set)
+
+
+def _condition(column, value):
+    if not value:
+        return "{0}ISEMPTY".format(column)
+    # A caret in a value has to be doubled in an encoded query.
+    return "{0}={1}".format(column, value.replace("^", "^^"))
+
+
+def _join(terms, separator, max_length):
+    chunk = []
+    length = 0
+    for term in terms:
+        if chunk and length + len(separator) + len(term) > max_length:
+            yield separator.join(chunk)
+            chunk, length = [], 0
+        length += len(term) + (len(separator) if chunk else 0)
+        chunk.append(term)
+    if chunk:
+        yield separator.join(chunk)
 
-from ..module_utils import arguments, client, errors, table, utils
 
+def identity_queries(id_column_set, rows, max_length=MAX_QUERY_LENGTH):
+    """
+    Return encoded queries that together match all records with the same
+    id_column_set values as the rows.
 
-def update(module, table_client):
+    A single identifying column is matched with IN conditions. Otherwise,
+    every row gets its own condition and conditions are combined with ^NQ.
+    Queries are kept below max_length characters where possible.
+    """
+    values = []
+    seen = set()
+    for row in rows:
+        key = identity(row, id_column_set)
+        if key not in seen:
+            seen.add(key)
+            values.append(tuple(_value(row.get(c)) for c in id_column_set))
+
+    terms = []
+    if len(id_column_set) == 1:
+        column = id_column_set[0]
+        # IN lists are separated by commas, so values with commas (and empty
+        # values) need conditions of their own.
+        listed = [v for v in values if v[0] and not set(",^") & set(v[0])]
+        terms.extend(
+            "{0}IN{1}".format(column, chunk)
+            for chunk in _join(
+                [v[0] for v in listed], ",", max_length - len(column) - 2
+            )
+        )
+        listed = set(listed)
+        values = [v for v in values if v not in listed]
+
+    terms.extend(
+        "^".join(_condition(c, v) for c, v in zip(id_column_set, value))
+        for value in values
+    )
+    return list(_join(terms, "^NQ", max_length))
+
+
+def fetch_current(table_client, cmdb_table, id_column_set, rows):
+    """
+    Return the current records of the rows, indexed by their identity.
+    """
+    index = dict()
+    for query in identity_queries(id_column_set, rows):
+        for record in table_client.list_records(cmdb_table, dict(sysparm_query=query)):
+            index.setdefault(identity(record, id_column_set), []).append(record)
+    return index
+
+
+class ItemErrors(errors.ServiceNowError):
+    """
+    Some dataset items could not be synced.
+
+    Carries the results of the items as returned by collect, None for the
+    failed ones, a dict with the index and the error message of every failed
+    item and the summary of the sync.
+    """
+
+    def __init__(self, results, changed, failures, summary):
+        super(ItemErrors, self).__init__(
+            "{0} of {1} dataset items failed, the first one ({2}) with: {3}".format(
+                len(failures),
+                sum(summary.values()),
+                failures[0]["index"],
+                failures[0]["msg"],
+            )
+        )
+        self.results = results
+        self.changed = changed
+        self.failures = failures
+        self.summary = summary
+
+
+def changed_item(index, record, operation, id_column_set):
+    """
+    Describe the changed record of a dataset item by its sys_id and identity.
+    """
+    item = dict(
+        (c, record.get(c)) for c in itertools.chain(id_column_set or [], ["sys_id"])
+    )
+    item.update(index=index, operation=operation)
+    return item
+
+
+def collect(
+    count, position_groups, outcomes, result_mode=FULL, id_column_set=None, synced=None
+):
+    """
+    Put the outcomes of groups of dataset items back in dataset order.
+
+    Every outcome is a (result, operation, error) tuple, where operation is
+    what happened to the record, or None if nothing did. Returns the
+    results, the changed flag and the number of items per operation, or
+    raises ItemErrors if any of the items failed.
+
+    The results are the records of all the items in the full result mode
+    and only the records of the created and updated items in the
+    changed_only mode. In the summary mode, the results describe the created
+    and updated items with changed_item. If synced is set, the sys_ids of the
+    records of all the items are added to it, whatever the result mode.
+    """
+    results = [None] * count
+    operations = [None] * count
+    summary = dict(((op, 0) for op in (CREATED, UPDATED, UNCHANGED)), failed=0)
     changed = False
+    failures = []
+    for positions, group_outcomes in zip(position_groups, outcomes):
+        for i, (result, operation, error) in zip(positions, group_outcomes):
+            results[i] = result
+            changed = changed or operation in (CREATED, UPDATED)
+            if error:
+                failures.append(dict(index=i, msg=error))
+                summary["failed"] += 1
+            else:
+                operations[i] = operation
+                summary[operation] += 1
+
+    if synced is not None:
+        synced.update(r["sys_id"] for r in results if r and r.get("sys_id"))
+
+    if result_mode != FULL:
+        changed_positions = [
+            i for i, op in enumerate(operations) if op in (CREATED, UPDATED)
+        ]
+        if result_mode == CHANGED_ONLY:
+            results = [results[i] for i in changed_positions]
+        else:
+            results = [
+                changed_item(i, results[i], operations[i], id_column_set)
+                for i in changed_positions
+            ]
+
+    if failures:
+        raise ItemErrors(
+            results, changed, sorted(failures, key=lambda f: f["index"]), summary
+        )
+    return results, changed, summary
+
+
+def journal_key(module, item):
+    return journal.entry_key(
+        module.params["sys_class_name"],
+        module.params["id_column_set"],
+        identity(item, module.params["id_column_set"]),
+    )
+
+
+def sync_items(module, table_client, matches, items, sync_journal=None):
+    """
+    Create or update the record of dataset items that share an identity.
+
+    Items are synced in order, so every item sees the record as the items
+    before it left it. Returns a (result, operation, error) tuple per item.
+    Items that end up in sync with their record are added to the journal.
+    """
     cmdb_table = module.params["sys_class_name"]
     id_column_set = module.params["id_column_set"]
 
-    results = []
-    for desired in module.params["dataset"]:
-        query = dict((c, desired[c]) for c in id_column_set)
-        current = table_client.get_record(cmdb_table, query)
+    current = matches[0] if len(matches) == 1 else None
+    outcomes = []
+    for desired in items:
+        if len(matches) > 1:
+            outcomes.append(
+                (
+                    None,
+                    None,
+                    "{0} {1} records match the {2} query.".format(
+                        len(matches),
+                        cmdb_table,
+                        dict((c, desired[c]) for c in id_column_set),
+                    ),
+                )
+            )
+            continue
 
-        if not current:
-            result = table_client.create_record(cmdb_table, desired, module.check_mode)
-            results.append(result)
-            changed = True
+        try:
+            if not current:
+                operation = CREATED
+                result = table_client.create_record(
+                    cmdb_table, desired, module.check_mode
+                )
+            elif utils.is_superset(current, desired):
+                operation = UNCHANGED
+                result = current
+            else:
+                operation = UPDATED
+                result = table_client.update_record(
+                    cmdb_table, current, desired, module.check_mode
+                )
+        except errors.ServiceNowError as e:
+            outcomes.append((None, None, str(e)))
             continue
 
-        if utils.is_superset(current, desired):
-            results.append(current)
+        if operation != UNCHANGED and not module.check_mode:
+            # Later items with the same identity see the new record.
+            current = result
+        if sync_journal and not module.check_mode:
+            sync_journal.record(
+                journal_key(module, desired), journal.payload_hash(desired), result
+            )
+        outcomes.append((result, operation, None))
+    return outcomes
+
+
+def skip_journaled(module, table_client, sync_journal, groups):
+    """
+    Return the outcomes of the groups of items that are still in sync.
+
+    A group is in sync if the journal has an entry with the hash of its
+    items and the record did not change since the entry was written. Only
+    the sys_updated_on and sys_mod_count of the journaled records are
+    fetched, in bulk. The results of skipped items are their values with
+    the sys_id, sys_updated_on and sys_mod_count of the record.
+    """
+    dataset = module.params["dataset"]
+    candidates = []
+    for key, positions in groups.items():
+        items = [dataset[i] for i in positions]
+        entry = sync_journal.get(journal_key(module, items[0]))
+        if entry and all(journal.payload_hash(i) == entry["hash"] for i in items):
+            candidates.append((key, items, entry))
+    if not candidates:
+        return {}
+
+    records = fetch_records(
+        table_client,
+        module.params["sys_class_name"],
+        [entry["sys_id"] for _key, _items, entry in candidates],
+        fields=JOURNAL_FIELDS,
+    )
+    skipped = {}
+    for key, items, entry in candidates:
+        record = records.get(entry["sys_id"])
+        if record and all(record.get(f) == entry[f] for f in JOURNAL_FIELDS):
+            skipped[key] = [(dict(item, **record), UNCHANGED, None) for item in items]
+    return skipped
+
+
+def update(module, table_client, sync_journal=None, synced=None):
+    cmdb_table = module.params["sys_class_name"]
+    id_column_set = module.params["id_column_set"]
+    dataset = module.params["dataset"]
+    concurrency = module.params.get("concurrency") or 1
+
+    # Items with the same identity are synced by the same task, one after
+    # the other. Tasks for different identities are independent.
+    groups = OrderedDict()
+    for i, desired in enumerate(dataset):
+        groups.setdefault(identity(desired, id_column_set), []).append(i)
+
+    skipped = {}
+    if sync_journal:
+        skipped = skip_journaled(module, table_client, sync_journal, groups)
+    tasks = [(k, positions) for k, positions in groups.items() if k not in skipped]
+
+    index = fetch_current(
+        table_client,
+        cmdb_table,
+        id_column_set,
+        [dataset[i] for _key, positions in tasks for i in positions],
+    )
+
+    def run(task):
+        key, positions = task
+        items = [dataset[i] for i in positions]
+        return sync_items(module, table_client, index.get(key, []), items, sync_journal)
+
+    if concurrency > 1:
+        outcomes = snow.ordered_map(run, tasks, concurrency)
+    else:
+        outcomes = (run(task) for task in tasks)
+
+    return collect(
+        len(dataset),
+        [groups[key] for key in skipped] + [positions for _key, positions in tasks],
+        itertools.chain(skipped.values(), outcomes),
+        module.params.get("result_mode") or FULL,
+        id_column_set,
+        synced,
+    )
+
+
+def fetch_records(table_client, cmdb_table, sys_ids, fields=None):
+    """
+    Return the records with the sys_ids, indexed by their sys_id.
+
+    If fields are set, the records only contain the sys_id and the fields.
+    """
+    index = dict()
+    prefix = "sys_idIN"
+    for chunk in _join(sys_ids, ",", MAX_QUERY_LENGTH - len(prefix)):
+        query = dict(sysparm_query=prefix + chunk)
+        if fields:
+            query["sysparm_fields"] = ",".join(("sys_id",) + tuple(fields))
+        for record in table_client.list_records(cmdb_table, query):
+            index[record["sys_id"]] = record
+    return index
+
+
+def reconcile_items(module, ire_client, table_client, items, relations):
+    """
+    Identify and reconcile a chunk of dataset items with one IRE request.
+
+    Returns a (result, operation, error) tuple per item. In check mode, items
+    are only identified and their results are the records they would end up
+    with.
+    """
+    cmdb_table = module.params["sys_class_name"]
+    try:
+        outputs = ire_client.identify_reconcile(
+            cmdb_table, items, relations, dry_run=module.check_mode
+        )
+        records = fetch_records(
+            table_client,
+            cmdb_table,
+            [o.sys_id for o in outputs if o.sys_id and not o.errors],
+        )
+    except errors.ServiceNowError as e:
+        return [(None, None, str(e))] * len(items)
+
+    outcomes = []
+    for desired, output in zip(items, outputs):
+        current = records.get(output.sys_id)
+        if output.errors:
+            outcomes.append((None, None, output.error))
+        elif module.check_mode:
+            outcomes.append(_planned_outcome(desired, current))
+        else:
+            outcomes.append(_reconciled_outcome(cmdb_table, output, current))
+    return outcomes
+
+
+def _planned_outcome(desired, current):
+    # What reconciling the item would do to the current record.
+    if current is None:
+        return desired, CREATED, None
+    if utils.is_superset(current, desired):
+        return current, UNCHANGED, None
+    return dict(current, **desired), UPDATED, None
+
+
+def _reconciled_outcome(cmdb_table, output, current):
+    if output.operation == "INSERT":
+        operation = CREATED
+    elif output.changed:
+        operation = UPDATED
+    else:
+        operation = UNCHANGED
+    error = None
+    if current is None:
+        error = "Reconciled {0} record {1} could not be fetched.".format(
+            cmdb_table, output.sys_id
+        )
+    return current, operation, error
+
+
+def reconcile(module, ire_client, table_client, synced=None):
+    dataset = module.params["dataset"]
+    relations = module.params.get("relations") or []
+    concurrency = module.params.get("concurrency") or 1
+
+    chunks = ire.chunk_items(len(dataset), relations, module.params["chunk_size"])
+
+    def run(chunk):
+        # Relations refer to items by their position in the request.
+        positions = dict((i, n) for n, i in enumerate(chunk))
+        chunk_relations = [
+            dict(r, parent=positions[r["parent"]], child=positions[r["child"]])
+            for r in relations
+            if r["parent"] in positions
+        ]
+        items = [dataset[i] for i in chunk]
+        return reconcile_items(module, ire_client, table_client, items, chunk_relations)
+
+    if concurrency > 1:
+        outcomes = snow.ordered_map(run, chunks, concurrency)
+    else:
+        outcomes = (run(chunk) for chunk in chunks)
+
+    return collect(
+        len(dataset),
+        chunks,
+        outcomes,
+        module.params.get("result_mode") or FULL,
+        module.params.get("id_column_set"),
+        synced,
+    )
+
+
+def find_missing(module, table_client, synced=()):
+    """
+    Return the records in scope whose identity is not in the dataset.
+
+    The records in scope are streamed once, with only the fields that
+    identify them. Records of child classes, records that are already
+    retired and the records with the synced sys_ids are left out.
+    """
+    cmdb_table = module.params["sys_class_name"]
+    id_column_set = module.params["id_column_set"]
+    retired_values = module.params["retired_values"]
+    delete = module.params["retire_action"] == "delete"
+
+    keep = set(identity(item, id_column_set) for item in module.params["dataset"])
+    fields = ["sys_id"] + list(id_column_set)
+    if not delete:
+        fields.extend(sorted(retired_values))
+    # Tables of parent classes also return the records of their child classes.
+    scope = snow.and_query(
+        module.params["scope"], "sys_class_name={0}".format(cmdb_table)
+    )
+    query = dict(sysparm_query=scope, sysparm_fields=",".join(fields))
+
+    missing = []
+    for record in table_client.iter_records(cmdb_table, query):
+        if record["sys_id"] in synced or identity(record, id_column_set) in keep:
+            continue
+        if not delete and utils.is_superset(record, retired_values):
             continue
+        missing.append(record)
+    return missing
 
-        result = table_client.update_record(
-            cmdb_table, current, desired, module.check_mode
+
+def retire_record(module, table_client, record):
+    """
+    Retire or delete a single record and return a (result, error) tuple.
+    """
+    cmdb_table = module.params["sys_class_name"]
+    try:
+        if module.params["retire_action"] == "delete":
+            table_client.delete_record(cmdb_table, record, False)
+            return record, None
+        return (
+            table_client.update_record(
+                cmdb_table, record, module.params["retired_values"], False
+            ),
+            None,
         )
+    except errors.ServiceNowError as e:
+        return None, str(e)
+
+
+def _queue_retire(batch, path, retired_values, delete):
+    if delete:
+        return batch.delete(path)
+    return batch.patch(
+        path, retired_values, query=dict(sysparm_exclude_reference_link="true")
+    )
 
-        results.append(result)
-        changed = True
 
-    return results, changed
+def _batch_retire_outcome(record, response, delete):
+    if response.status not in (200, 204):
+        return None, str(errors.UnexpectedAPIResponse(response.status, response.data))
+    if delete:
+        return record, None
+    return response.json["result"], None
+
+
+def retire_batched(module, table_client, records):
+    """
+    Retire or delete the records in as few Batch API requests as possible.
+    """
+    cmdb_table = module.params["sys_class_name"]
+    retired_values = module.params["retired_values"]
+    delete = module.params["retire_action"] == "delete"
+
+    with table_client.client.batch() as batch:
+        pending = [
+            _queue_retire(
+                batch,
+                table_client.path(cmdb_table, r["sys_id"]),
+                retired_values,
+                delete,
+            )
+            for r in records
+        ]
+    return [
+        _batch_retire_outcome(record, request.response, delete)
+        for record, request in zip(records, pending)
+    ]
+
+
+def retire_records(module, table_client, records):
+    """
+    Retire or delete the records.
+
+    Returns a (result, error) tuple per record. Requests are sent through
+    the Batch API if the client has batching enabled. Otherwise, every
+    record takes a request of its own, concurrency at a time.
+    """
+    if module.check_mode:
+        if module.params["retire_action"] == "delete":
+            return [(record, None) for record in records]
+        retired_values = module.params["retired_values"]
+        return [(dict(record, **retired_values), None) for record in records]
+
+    snow_client = getattr(table_client, "client", None)
+    if getattr(snow_client, "batch_requests", False):
+        return retire_batched(module, table_client, records)
+
+    def run(record):
+        return retire_record(module, table_client, record)
+
+    concurrency = module.params.get("concurrency") or 1
+    if concurrency > 1:
+        return list(snow.ordered_map(run, records, concurrency))
+    return [run(record) for record in records]
+
+
+def retire_missing(module, table_client, synced=()):
+    """
+    Retire or delete the records in scope that are not in the dataset and
+    whose sys_ids are not in synced.
+
+    Returns the retired records and a dict with the sys_id and the error
+    message of every record that could not be retired.
+    """
+    missing = find_missing(module, table_client, synced)
+    retired = []
+    failures = []
+    for record, (result, error) in zip(
+        missing, retire_records(module, table_client, missing)
+    ):
+        if error:
+            failures.append(dict(sys_id=record["sys_id"], msg=error))
+        else:
+            retired.append(result)
+    return retired, failures
+
+
+def result_records(module, results):
+    """
+    Return the module results for the results of collect.
+    """
+    if module.params["result_mode"] == SUMMARY:
+        return dict(records_raw=[], changed_items=results)
+    return dict(records_raw=results)
+
+
+def _validate_dataset(params):
+    if params["dataset"] is None:
+        # The action plugin reads dataset_file and passes the rows as dataset.
+        return "dataset_file can only be read on the controller"
+    if params["chunk_size"] < 1:
+        return "chunk_size should be at least 1"
+    for relation in params["relations"] or []:
+        for key in ("parent", "child"):
+            if not 0 <= relation[key] < len(params["dataset"]):
+                return "relation {0} {1} is not a dataset position".format(
+                    key, relation[key]
+                )
+    return None
+
+
+def _validate_engine(params):
+    if params["engine"] != "table":
+        return None
+    if not params["id_column_set"]:
+        return "id_column_set should not be empty"
+    if params["relations"]:
+        return "relations can only be used with the ire engine"
+    return None
+
+
+def _validate_journal(params):
+    if params["journal"] and params["engine"] != "table":
+        return "journal can only be used with the table engine"
+    return None
+
+
+def _validate_authoritative(params):
+    if params["sync"] != "authoritative":
+        return None
+    if not params["id_column_set"]:
+        return "id_column_set is required for authoritative sync"
+    if not params["scope"]:
+        return "scope is required for authoritative sync"
+    if not params["dataset"] and not params.get("allow_empty_dataset"):
+        return (
+            "dataset is empty, which would retire all the records in scope, "
+            "set allow_empty_dataset to do that"
+        )
+    return None
+
+
+def validate_params(params):
+    for validate in (
+        _validate_dataset,
+        _validate_engine,
+        _validate_journal,
+        _validate_authoritative,
+    ):
+        error = validate(params)
+        if error:
+            return error
+    if params["concurrency"] < 1:
+        return "concurrency should be at least 1"
+    return None
 
 
 def main():
     module_args = dict(
-        arguments.get_spec("instance"),
+        arguments.get_spec("instance", "api_stats"),
         sys_class_name=dict(
             type="str",
             required=True,
@@ -218,32 +1175,148 @@ def main():
         id_column_set=dict(
             type="list",
             elements="str",
-            required=True,
         ),
         dataset=dict(
             type="list",
             elements="dict",
-            required=True,
+        ),
+        dataset_file=dict(
+            type="path",
+        ),
+        dataset_file_format=dict(
+            type="str",
+            choices=["jsonl", "csv"],
+        ),
+        dataset_chunk_size=dict(
+            type="int",
+            default=1000,
         ),
         map=dict(
             type="dict",
             required=True,
         ),
+        concurrency=dict(
+            type="int",
+            default=1,
+        ),
+        journal=dict(
+            type="path",
+        ),
+        sync=dict(
+            type="str",
+            choices=["merge", "authoritative"],
+            default="merge",
+        ),
+        scope=dict(
+            type="str",
+        ),
+        allow_empty_dataset=dict(
+            type="bool",
+            default=False,
+        ),
+        result_mode=dict(
+            type="str",
+            choices=[FULL, CHANGED_ONLY, SUMMARY],
+            default=FULL,
+        ),
+        retire_action=dict(
+            type="str",
+            choices=["retire", "delete"],
+            default="retire",
+        ),
+        retired_values=dict(
+            type="dict",
+            default=RETIRED_VALUES,
+        ),
+        engine=dict(
+            type="str",
+            choices=["table", "ire"],
+            default="table",
+        ),
+        chunk_size=dict(
+            type="int",
+            default=100,
+        ),
+        data_source=dict(
+            type="str",
+            default=ire.DEFAULT_DATA_SOURCE,
+        ),
+        relations=dict(
+            type="list",
+            elements="dict",
+            options=dict(
+                parent=dict(type="int", required=True),
+                child=dict(type="int", required=True),
+                type=dict(type="str", required=True),
+            ),
+        ),
     )
 
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
+        mutually_exclusive=[("dataset", "dataset_file")],
+        required_one_of=[("dataset", "dataset_file")],
     )
 
-    if not module.params["id_column_set"]:
-        module.fail_json(msg="id_column_set should not be empty")
+    error = validate_params(module.params)
+    if error:
+        module.fail_json(msg=error)
 
     try:
         snow_client = client.Client(**module.params["instance"])
         table_client = table.TableClient(snow_client)
-        results, changed = update(module, table_client)
-        module.exit_json(changed=changed, records_raw=results)
+        # The records of the dataset items, which are never retired.
+        synced = set()
+        if module.params["engine"] == "ire":
+            ire_client = ire.IREClient(snow_client, module.params["data_source"])
+            results, changed, summary = reconcile(
+                module, ire_client, table_client, synced
+            )
+        elif module.params["journal"]:
+            with journal.Journal(module.params["journal"]) as sync_journal:
+                results, changed, summary = update(
+                    module, table_client, sync_journal, synced
+                )
+        else:
+            results, changed, summary = update(module, table_client, synced=synced)
+
+        result = dict(summary=summary, **result_records(module, results))
+        if module.params["sync"] == "authoritative":
+            retired, failures = retire_missing(module, table_client, synced)
+            changed = changed or bool(retired)
+            summary["retired"] = len(retired)
+            if module.params["result_mode"] == SUMMARY:
+                id_columns = ["sys_id"] + module.params["id_column_set"]
+                retired = [dict((c, r.get(c)) for c in id_columns) for r in retired]
+            result["retired_records"] = retired
+            if failures:
+                module.fail_json(
+                    msg="{0} of {1} records could not be retired, the first one "
+                    "({2}) with: {3}".format(
+                        len(failures),
+                        len(failures) + len(retired),
+                        failures[0]["sys_id"],
+                        failures[0]["msg"],
+                    ),
+                    changed=changed,
+                    failed_retirements=failures,
+                    **result
+                )
+
+        module.exit_json(
+            changed=changed,
+            **dict(result, **stats.api_stats_result(module, snow_client))
+        )
+    except ItemErrors as e:
+        # Records are only retired after all the items were synced.
+        module.fail_json(
+            msg=str(e),
+            changed=e.changed,
+            failed_items=e.failures,
+            summary=e.summary,
+            **result_records(module, e.results)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
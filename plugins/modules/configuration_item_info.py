@@ -29,6 +29,7 @@ description:
 version_added: 1.0.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id.info
   - servicenow.itsm.query
   - servicenow.itsm.configuration_item_mapping
@@ -230,7 +231,16 @@ record:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, attachment, client, errors, query, table, utils
+from ..module_utils import (
+    arguments,
+    attachment,
+    client,
+    errors,
+    query,
+    stats,
+    table,
+    utils,
+)
 from ..module_utils.configuration_item import PAYLOAD_FIELDS_MAPPING
 from ..module_utils.utils import get_mapper
 
@@ -297,13 +307,13 @@ def run(module, table_client, attachment_client):
                     dict(table_name=cmdb_table, table_sys_id=record["sys_id"]),
                 ),
             )
-            for record in table_client.list_records(cmdb_table, query)
+            for record in table_client.iter_records(cmdb_table, query)
         ]
     return [
         dict(
             mapper.to_ansible(record),
         )
-        for record in table_client.list_records(cmdb_table, query)
+        for record in table_client.iter_records(cmdb_table, query)
     ]
 
 
@@ -313,6 +323,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "instance",
+                "api_stats",
                 "sys_id",
                 "query",
                 "configuration_item_mapping",
@@ -338,7 +349,11 @@ def main():
         table_client = table.TableClient(snow_client)
         attachment_client = attachment.AttachmentClient(snow_client)
         records = run(module, table_client, attachment_client)
-        module.exit_json(changed=False, records=records)
+        module.exit_json(
+            changed=False,
+            records=records,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -24,6 +24,7 @@ version_added: 2.5.0
 
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sysparm_display_value
 
 seealso:
@@ -132,7 +133,7 @@ record:
 from ..module_utils.utils import get_mapper
 from ..module_utils.configuration_item import PAYLOAD_FIELDS_MAPPING
 from ..module_utils import cmdb_relation as cmdb
-from ..module_utils import arguments, client, errors, generic
+from ..module_utils import arguments, client, errors, generic, stats
 from ansible.module_utils.basic import AnsibleModule
 
 CMDB_INSTANCE_BASE_API_PATH = "api/now/cmdb/instance"
@@ -277,6 +278,7 @@ def main():
     module_args = dict(
         arguments.get_spec(
             "instance",
+            "api_stats",
             "sysparm_display_value",
         ),
         state=dict(
@@ -333,7 +335,12 @@ def main():
         snow_client = client.Client(**module.params["instance"])
         generic_client = generic.GenericClient(snow_client)
         changed, record, diff = run(module, generic_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        module.exit_json(
+            changed=changed,
+            record=record,
+            diff=diff,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -24,6 +24,7 @@ version_added: 2.5.0
 
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id.info
   - servicenow.itsm.sysparm_display_value
 
@@ -64,7 +65,7 @@ record:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ..module_utils import arguments, client, errors, generic
+from ..module_utils import arguments, client, errors, generic, stats
 from ..module_utils import cmdb_relation as cmdb
 from ..module_utils.configuration_item import PAYLOAD_FIELDS_MAPPING
 from ..module_utils.utils import get_mapper
@@ -95,6 +96,7 @@ def main():
     module_args = dict(
         arguments.get_spec(
             "instance",
+            "api_stats",
             "sys_id",
             "sysparm_display_value",
         ),
@@ -113,7 +115,9 @@ def main():
         snow_client = client.Client(**module.params["instance"])
         generic_client = generic.GenericClient(snow_client)
         records = run(module, generic_client)
-        module.exit_json(changed=False, record=records)
+        module.exit_json(
+            changed=False, record=records, **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -28,6 +28,7 @@ description:
 version_added: 1.0.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id
   - servicenow.itsm.number
   - servicenow.itsm.attachments
@@ -158,6 +159,7 @@ from ..module_utils import (
     attachment,
     client,
     errors,
+    stats,
     table,
     utils,
     validation,
@@ -288,7 +290,12 @@ def run(module, table_client, attachment_client):
 def main():
     module_args = dict(
         arguments.get_spec(
-            "instance", "sys_id", "number", "attachments", "incident_mapping"
+            "instance",
+            "api_stats",
+            "sys_id",
+            "number",
+            "attachments",
+            "incident_mapping",
         ),
         state=dict(
             type="str",
@@ -337,7 +344,12 @@ def main():
         table_client = table.TableClient(snow_client)
         attachment_client = attachment.AttachmentClient(snow_client)
         changed, record, diff = run(module, table_client, attachment_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        module.exit_json(
+            changed=changed,
+            record=record,
+            diff=diff,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -25,6 +25,7 @@ description:
 version_added: 1.0.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id.info
   - servicenow.itsm.number.info
   - servicenow.itsm.query
@@ -191,7 +192,16 @@ records:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, attachment, client, errors, query, table, utils
+from ..module_utils import (
+    arguments,
+    attachment,
+    client,
+    errors,
+    query,
+    stats,
+    table,
+    utils,
+)
 from ..module_utils.incident import PAYLOAD_FIELDS_MAPPING
 from ..module_utils.utils import get_mapper
 
@@ -242,7 +252,7 @@ def run(module, table_client, attachment_client):
             module.params, "sys_id", "number", "sysparm_display_value"
         )
 
-    records = table_client.list_records("incident", query)
+    records = table_client.iter_records("incident", query)
 
     result = [
         dict(
@@ -262,6 +272,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "instance",
+                "api_stats",
                 "sys_id",
                 "number",
                 "query",
@@ -284,7 +295,11 @@ def main():
         table_client = table.TableClient(snow_client)
         attachment_client = attachment.AttachmentClient(snow_client)
         records = run(module, table_client, attachment_client)
-        module.exit_json(changed=False, records=records)
+        module.exit_json(
+            changed=False,
+            records=records,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -29,6 +29,7 @@ description:
 version_added: 1.0.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id
   - servicenow.itsm.number
   - servicenow.itsm.attachments
@@ -320,6 +321,7 @@ from ..module_utils import (
     attachment,
     client,
     errors,
+    stats,
     table,
     utils,
     validation,
@@ -511,7 +513,12 @@ def run(module, problem_client, table_client, attachment_client):
 def main():
     module_args = dict(
         arguments.get_spec(
-            "instance", "sys_id", "number", "attachments", "problem_mapping"
+            "instance",
+            "api_stats",
+            "sys_id",
+            "number",
+            "attachments",
+            "problem_mapping",
         ),
         state=dict(
             type="str",
@@ -577,7 +584,12 @@ def main():
         changed, record, diff = run(
             module, problem_client, table_client, attachment_client
         )
-        module.exit_json(changed=changed, record=record, diff=diff)
+        module.exit_json(
+            changed=changed,
+            record=record,
+            diff=diff,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -29,6 +29,7 @@ version_added: 1.3.0
 
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id
   - servicenow.itsm.number
   - servicenow.itsm.problem_task_mapping
@@ -247,7 +248,7 @@ from datetime import datetime
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, client, errors, table, utils
+from ..module_utils import arguments, client, errors, stats, table, utils
 from ..module_utils.problem_task import PAYLOAD_FIELDS_MAPPING
 from ..module_utils.utils import get_mapper
 
@@ -282,31 +283,30 @@ def build_payload(module, table_client):
     payload = (module.params["other"] or {}).copy()
     payload.update(utils.filter_dict(module.params, *DIRECT_PAYLOAD_FIELDS))
 
+    # Resolve all references at once, which takes a single request when the
+    # Batch API is enabled.
+    lookups = dict()
     if module.params["configuration_item"]:
-        configuration_item = table.find_configuration_item(
-            table_client, module.params["configuration_item"]
+        lookups["cmdb_ci"] = table.configuration_item_lookup(
+            module.params["configuration_item"]
         )
-        payload["cmdb_ci"] = configuration_item["sys_id"]
 
     if module.params["source_problem"]:
-        problem = table.find_problem(table_client, module.params["source_problem"])
-        payload["problem"] = problem["sys_id"]
+        lookups["problem"] = table.problem_lookup(module.params["source_problem"])
 
     if module.params["assignment_group"]:
-        assignment_group = table.find_assignment_group(
-            table_client, module.params["assignment_group"]
+        lookups["assignment_group"] = table.assignment_group_lookup(
+            module.params["assignment_group"]
         )
-        payload["assignment_group"] = assignment_group["sys_id"]
 
     if module.params["assigned_to"]:
-        user = table.find_user(table_client, module.params["assigned_to"])
-        payload["assigned_to"] = user["sys_id"]
+        lookups["assigned_to"] = table.user_lookup(module.params["assigned_to"])
 
     if module.params["state"] == "work_in_progress":
-        started_by = table.find_user(table_client, module.params["assigned_to"])
-        payload["started_by"] = started_by["sys_id"]
+        lookups["started_by"] = table.user_lookup(module.params["assigned_to"])
         payload["started_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+    payload.update(table.find_references(table_client, lookups))
     return payload
 
 
@@ -351,7 +351,9 @@ def run(module, table_client):
 
 def main():
     module_args = dict(
-        arguments.get_spec("instance", "sys_id", "number", "problem_task_mapping"),
+        arguments.get_spec(
+            "instance", "api_stats", "sys_id", "number", "problem_task_mapping"
+        ),
         state=dict(
             type="str",
         ),
@@ -412,7 +414,12 @@ def main():
         snow_client = client.Client(**module.params["instance"])
         table_client = table.TableClient(snow_client)
         changed, record, diff = run(module, table_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        module.exit_json(
+            changed=changed,
+            record=record,
+            diff=diff,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -24,6 +24,7 @@ description:
 version_added: 1.3.0
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id.info
   - servicenow.itsm.number.info
   - servicenow.itsm.query
@@ -162,7 +163,7 @@ records:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, client, errors, query, table, utils
+from ..module_utils import arguments, client, errors, query, stats, table, utils
 from ..module_utils.problem_task import PAYLOAD_FIELDS_MAPPING
 from ..module_utils.utils import get_mapper
 
@@ -223,7 +224,7 @@ def run(module, table_client):
 
     return [
         mapper.to_ansible(record)
-        for record in table_client.list_records("problem_task", query)
+        for record in table_client.iter_records("problem_task", query)
     ]
 
 
@@ -233,6 +234,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "instance",
+                "api_stats",
                 "sys_id",
                 "number",
                 "query",
@@ -253,7 +255,11 @@ def main():
         snow_client = client.Client(**module.params["instance"])
         table_client = table.TableClient(snow_client)
         records = run(module, table_client)
-        module.exit_json(changed=False, records=records)
+        module.exit_json(
+            changed=False,
+            records=records,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -25,6 +25,7 @@ version_added: 2.6.0
 
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
 
 options:
   action:
@@ -109,7 +110,7 @@ record:
 """
 
 
-from ..module_utils import arguments, client, errors
+from ..module_utils import arguments, client, errors, stats
 from ..module_utils.service_catalog import CartClient, Item
 from ansible.module_utils.basic import AnsibleModule
 
@@ -140,7 +141,7 @@ def run(module, sc_client):
 
 def main():
     module_args = dict(
-        arguments.get_spec("instance"),
+        arguments.get_spec("instance", "api_stats"),
         action=dict(
             type="str",
             choices=["checkout", "submit_order", "order_now"],
@@ -168,7 +169,12 @@ def main():
         rest_client = client.Client(**module.params["instance"])
         cart_client = CartClient(rest_client)
         changed, record, diff = run(module, cart_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        module.exit_json(
+            changed=changed,
+            record=record,
+            diff=diff,
+            **stats.api_stats_result(module, rest_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
@@ -26,6 +26,7 @@ version_added: 2.6.0
 
 extends_documentation_fragment:
   - servicenow.itsm.instance
+  - servicenow.itsm.api_stats
   - servicenow.itsm.sys_id.info
 
 options:
@@ -143,7 +144,7 @@ records:
     ]
 """
 
-from ..module_utils import arguments, client, errors, generic
+from ..module_utils import arguments, client, errors, generic, stats
 from ..module_utils.service_catalog import ItemContent, ServiceCatalogClient
 from ansible.module_utils.basic import AnsibleModule
 
@@ -199,6 +200,7 @@ def main():
     module_args = dict(
         arguments.get_spec(
             "instance",
+            "api_stats",
             "sys_id",
         ),
         categories=dict(
@@ -223,7 +225,11 @@ def main():
         generic_client = generic.GenericClient(snow_client)
         sc_client = ServiceCatalogClient(generic_client)
         records = run(module, sc_client)
-        module.exit_json(changed=False, records=records)
+        module.exit_json(
+            changed=False,
+            records=records,
+            **stats.api_stats_result(module, snow_client)
+        )
     except errors.ServiceNowError as e:
         module.fail_json(msg=str(e))
 
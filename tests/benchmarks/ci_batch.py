@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Measure how long configuration_item_batch takes to sync a dataset.
+
+The script starts the emulator from tests/benchmarks/emulator.py, fills a
+CMDB table with synthetic configuration items and syncs a dataset in which
+a third of the rows match existing items, a third update existing items
+and a third create new ones:
+
+    python tests/benchmarks/ci_batch.py --existing 20000 --rows 3000 \\
+        --latency 0.05 --concurrency 8 --keep-alive
+
+Pass --engine ire to sync through the Identification and Reconciliation API
+instead of the Table API. Pass --resume 0.75 to first sync three quarters
+of the rows with a journal, as a run that failed there would, and measure
+the rerun of the whole dataset.
+
+The collection must be importable as ansible_collections.servicenow.itsm.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    client,
+    ire,
+    journal,
+    table,
+)
+from ansible_collections.servicenow.itsm.plugins.modules import (
+    configuration_item_batch,
+)
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from emulator import Emulator, synthetic_record  # noqa: E402
+
+
+class Module:
+    """
+    The parts of AnsibleModule that configuration_item_batch.update and
+    configuration_item_batch.reconcile use.
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.check_mode = False
+
+
+def dataset(table_name, existing, rows):
+    data = []
+    for i in range(rows):
+        if i % 3 == 0:
+            record = synthetic_record(table_name, i % existing)
+            data.append(dict(name=record["name"], os=record["os"]))
+        elif i % 3 == 1:
+            record = synthetic_record(table_name, i % existing)
+            data.append(dict(name=record["name"], os="Linux Fedora"))
+        else:
+            data.append(dict(name="new-{0:06d}".format(i), os="Linux Fedora"))
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--table", default="cmdb_ci_server")
+    parser.add_argument("--existing", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=900)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--keep-alive", action="store_true")
+    parser.add_argument("--max-concurrency", type=int)
+    parser.add_argument("--engine", choices=["table", "ire"], default="table")
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--resume", type=float)
+    args = parser.parse_args()
+
+    emulator = Emulator(
+        username="admin",
+        password="admin",
+        latency=args.latency,
+        max_concurrency=args.max_concurrency,
+    )
+    emulator.instance.populate(args.table, args.existing)
+
+    params = dict(
+        sys_class_name=args.table,
+        id_column_set=["name"],
+        dataset=dataset(args.table, args.existing, args.rows),
+        concurrency=args.concurrency,
+        chunk_size=args.chunk_size,
+        relations=None,
+    )
+
+    journal_dir = tempfile.mkdtemp()
+    if args.resume is None:
+        sync_journal = contextlib.nullcontext()
+    else:
+        sync_journal = journal.Journal(os.path.join(journal_dir, "journal"))
+
+    try:
+        with emulator, sync_journal:
+            snow_client = client.Client(
+                emulator.url, "admin", "admin", keep_alive=args.keep_alive
+            )
+            table_client = table.TableClient(snow_client)
+            if args.resume is not None:
+                synced = int(len(params["dataset"]) * args.resume)
+                configuration_item_batch.update(
+                    Module(dict(params, dataset=params["dataset"][:synced])),
+                    table_client,
+                    sync_journal,
+                )
+                emulator.requests.clear()
+
+            start = time.time()
+            if args.engine == "ire":
+                results, changed, _summary = configuration_item_batch.reconcile(
+                    Module(params), ire.IREClient(snow_client), table_client
+                )
+            else:
+                results, changed, _summary = configuration_item_batch.update(
+                    Module(params),
+                    table_client,
+                    None if args.resume is None else sync_journal,
+                )
+            elapsed = time.time() - start
+    finally:
+        shutil.rmtree(journal_dir)
+
+    methods = Counter()
+    for (method, _path), count in emulator.requests.items():
+        methods[method] += count
+    print(
+        "{0} rows  {1:8.2f} s  {2}".format(
+            len(results),
+            elapsed,
+            ", ".join(
+                "{0} {1}".format(count, method)
+                for method, count in sorted(methods.items())
+            ),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
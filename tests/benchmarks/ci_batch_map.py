@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Measure how long the configuration_item_batch action takes to map a dataset.
+
+The script maps synthetic rows with the map of the action and compares the
+time with rendering every template with Jinja:
+
+    python tests/benchmarks/ci_batch_map.py --rows 30000
+
+Most keys of the map are attribute paths and simple filters, a few need
+full Jinja. The collection must be importable as
+ansible_collections.servicenow.itsm.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import time
+
+from ansible_collections.servicenow.itsm.plugins.action import configuration_item_batch
+from jinja2 import Environment
+
+MAPPING = dict(
+    [("field_{0}".format(i), "facts.field_{0}".format(i)) for i in range(15)]
+    + [
+        ("name", "name"),
+        ("serial_number", "facts['serial-number']"),
+        ("ip_address", "interfaces[0].address"),
+        ("os", "facts.os | lower"),
+        ("os_version", "facts.os_version | default('')"),
+        ("ram", "facts.memory_mb | int"),
+        ("cpu_count", "facts.cpus | string"),
+        ("short_description", "tags.Name | default(name) | trim"),
+        ("fqdn", "name ~ '.example.com'"),
+        ("comments", "facts.os ~ ' ' ~ facts.os_version"),
+    ]
+)
+
+
+def dataset(rows):
+    return [
+        dict(
+            name="host-{0:06d}".format(i),
+            interfaces=[dict(address="10.0.{0}.{1}".format(i // 256 % 256, i % 256))],
+            tags=dict(Name="Host {0}".format(i)) if i % 2 else dict(),
+            facts=dict(
+                [
+                    ("field_{0}".format(j), "value {0} {1}".format(i, j))
+                    for j in range(15)
+                ],
+                os="Linux Fedora",
+                os_version="40",
+                memory_mb=str(1024 * (1 + i % 16)),
+                cpus=1 + i % 8,
+                **{"serial-number": "SN-{0:08d}".format(i)}
+            ),
+        )
+        for i in range(rows)
+    ]
+
+
+def render_all(mapping, rows):
+    # What build_asset did before it compiled simple expressions.
+    items = [{} for _i in range(len(rows))]
+    env = Environment()
+    for key, template in mapping.items():
+        t = env.from_string("{{" + template + "}}")
+        for row, item in zip(rows, items):
+            item[key] = t.render(**row)
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=30000)
+    args = parser.parse_args()
+
+    rows = dataset(args.rows)
+
+    start = time.time()
+    expected = render_all(MAPPING, rows)
+    jinja = time.time() - start
+
+    start = time.time()
+    items = configuration_item_batch.ActionModule.build_asset(MAPPING, rows)
+    compiled = time.time() - start
+
+    assert expected == items, "mapped items differ"
+    print(
+        "{0} rows x {1} keys  jinja {2:.2f} s  compiled {3:.2f} s  ({4:.1f}x)".format(
+            len(rows), len(MAPPING), jinja, compiled, jinja / compiled
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1332 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Local stand-in for a ServiceNow instance.
+
+The emulator serves the parts of the REST API the collection talks to from
+an in-memory store: the Table API, the Aggregate API, the Attachment API,
+the CMDB Instance API, the CMDB Identification and Reconciliation API,
+the Service Catalog API, the Batch API and oauth_token.do. Lists honor
+the sysparm_query, sysparm_fields, sysparm_limit, sysparm_offset,
+sysparm_display_value, sysparm_exclude_reference_link and sysparm_no_count
+parameters and return the x-total-count and Link headers.
+
+It is meant for benchmarks and load tests, not for functional testing: it
+knows nothing about business rules, ACLs or the table hierarchy, and only
+the common encoded query operators are supported.
+
+Run it as a script to serve synthetic data:
+
+    python tests/benchmarks/emulator.py --port 8080 \\
+        --dataset incident=100000 --dataset cmdb_ci_server=20000 \\
+        --latency 0.05 --bandwidth 10000000 --max-concurrency 4
+
+and point modules or the now inventory plugin at it with
+SN_HOST=http://127.0.0.1:8080, SN_USERNAME=admin and SN_PASSWORD=admin.
+
+Or start it from a benchmark:
+
+    with Emulator(latency=0.02) as emulator:
+        emulator.instance.populate("incident", 100000)
+        client = Client(emulator.url, "admin", "admin")
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import base64
+import gzip
+import io
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter, OrderedDict
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+API = "/api/now"
+TABLE_API = API + "/table/"
+STATS_API = API + "/stats/"
+ATTACHMENT_API = API + "/attachment"
+CMDB_API = API + "/cmdb/instance/"
+BATCH_API = API + "/v1/batch"
+IRE_API = API + "/identifyreconcile"
+CATALOG_API = "/api/sn_sc/servicecatalog/"
+
+DEFAULT_LIMIT = 10000
+
+NUMBER_PREFIXES = dict(
+    incident="INC",
+    problem="PRB",
+    problem_task="PTASK",
+    change_request="CHG",
+    change_task="CTASK",
+    sc_request="REQ",
+    sc_req_item="RITM",
+)
+
+# Fields that hold sys_ids of other records, rendered as reference links.
+REFERENCES = dict(
+    assigned_to="sys_user",
+    caller_id="sys_user",
+    opened_by="sys_user",
+    requested_for="sys_user",
+    requested_by="sys_user",
+    assignment_group="sys_user_group",
+    cmdb_ci="cmdb_ci",
+    company="core_company",
+    parent="cmdb_ci",
+    child="cmdb_ci",
+    type="cmdb_rel_type",
+    change_request="change_request",
+    problem="problem",
+    request="sc_request",
+)
+
+STATES = ["1", "2", "3", "6", "7"]
+WORDS = (
+    "server database network storage outage latency disk memory cpu backup "
+    "login password printer email vpn firewall certificate deploy update patch"
+).split()
+
+
+def now():
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+
+class _Lcg:
+    """
+    Linear congruential generator, a lot cheaper to seed than random.Random.
+    """
+
+    def __init__(self, seed):
+        self.state = (seed * 2654435761 + 12345) & 0x7FFFFFFF
+
+    def randint(self, low, high):
+        self.state = (self.state * 1103515245 + 12345) & 0x7FFFFFFF
+        return low + (self.state >> 8) % (high - low + 1)
+
+    def choice(self, seq):
+        return seq[self.randint(0, len(seq) - 1)]
+
+
+def synthetic_record(table, i):
+    """
+    Return the fields of the i-th synthetic record of the table.
+
+    Records are derived from the index alone, so large datasets do not
+    have to be held in memory.
+    """
+    rnd = _Lcg(i)
+    words = " ".join(rnd.choice(WORDS) for _w in range(6))
+    record = dict(
+        name="{0}-{1:06d}".format(table, i),
+        short_description=words.capitalize(),
+        description=" ".join([words] * 8),
+        state=rnd.choice(STATES),
+        impact=str(rnd.randint(1, 3)),
+        urgency=str(rnd.randint(1, 3)),
+        priority=str(rnd.randint(1, 5)),
+        active="true" if i % 7 else "false",
+        category=rnd.choice(WORDS),
+        sys_class_name=table,
+        sys_created_on="2024-01-01 00:00:00",
+        sys_updated_on="2024-01-01 00:00:00",
+        sys_created_by="admin",
+        sys_updated_by="admin",
+        sys_mod_count="0",
+    )
+    if table in NUMBER_PREFIXES:
+        record["number"] = "{0}{1:07d}".format(NUMBER_PREFIXES[table], i)
+    if table.startswith("cmdb_ci"):
+        record.update(
+            ip_address="10.{0}.{1}.{2}".format(i >> 16 & 255, i >> 8 & 255, i & 255),
+            fqdn="host{0}.example.com".format(i),
+            os=rnd.choice(["Linux Red Hat", "Windows 2019 Standard", "AIX"]),
+            environment=rnd.choice(["production", "test", "development"]),
+        )
+    if table == "sys_user":
+        record.update(
+            user_name="user{0}".format(i), email="user{0}@example.com".format(i)
+        )
+    return record
+
+
+class Table:
+    """
+    Records of a single table.
+
+    Synthetic records are generated on demand from their index and are only
+    stored once they are modified. Records that are created through the API
+    follow the synthetic ones.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._prefix = "{0:08x}".format(zlib.crc32(name.encode("utf-8")) & 0xFFFFFFFF)
+        self._synthetic = 0
+        self._factory = None
+        self._changed = {}
+        self._created = OrderedDict()
+        self._deleted = set()
+        self._numbers = itertools.count(1)
+
+    def populate(self, count, factory=None):
+        self._synthetic = count
+        self._factory = factory or synthetic_record
+        self._numbers = itertools.count(count)
+
+    def _synthetic_id(self, i):
+        return "{0}{1:024x}".format(self._prefix, i)
+
+    def _synthetic_index(self, sys_id):
+        if len(sys_id) != 32 or not sys_id.startswith(self._prefix):
+            return None
+        try:
+            i = int(sys_id[8:], 16)
+        except ValueError:
+            return None
+        return i if i < self._synthetic else None
+
+    def __len__(self):
+        return self._synthetic + len(self._created) - len(self._deleted)
+
+    def ids(self):
+        for i in range(self._synthetic):
+            sys_id = self._synthetic_id(i)
+            if sys_id not in self._deleted:
+                yield sys_id
+        for sys_id in self._created:
+            yield sys_id
+
+    def records(self):
+        for sys_id in self.ids():
+            yield self.get(sys_id)
+
+    def get(self, sys_id):
+        if sys_id in self._created:
+            return self._created[sys_id]
+        if sys_id in self._deleted:
+            return None
+        if sys_id in self._changed:
+            return self._changed[sys_id]
+        i = self._synthetic_index(sys_id)
+        if i is None:
+            return None
+        return dict(self._factory(self.name, i), sys_id=sys_id)
+
+    def insert(self, data):
+        sys_id = data.get("sys_id") or uuid.uuid4().hex
+        timestamp = now()
+        record = dict(
+            sys_class_name=self.name,
+            sys_created_on=timestamp,
+            sys_updated_on=timestamp,
+            sys_created_by="admin",
+            sys_updated_by="admin",
+            sys_mod_count="0",
+        )
+        if self.name in NUMBER_PREFIXES:
+            record["number"] = "{0}{1:07d}".format(
+                NUMBER_PREFIXES[self.name], next(self._numbers)
+            )
+        record.update(stringify(data))
+        record["sys_id"] = sys_id
+        self._created[sys_id] = record
+        return record
+
+    def update(self, sys_id, data):
+        record = self.get(sys_id)
+        if record is None:
+            return None
+        record = dict(record, **stringify(data))
+        record.update(
+            sys_id=sys_id,
+            sys_updated_on=now(),
+            sys_mod_count=str(int(record.get("sys_mod_count") or 0) + 1),
+        )
+        if sys_id in self._created:
+            self._created[sys_id] = record
+        else:
+            self._changed[sys_id] = record
+        return record
+
+    def delete(self, sys_id):
+        if self.get(sys_id) is None:
+            return False
+        if sys_id in self._created:
+            del self._created[sys_id]
+        else:
+            self._changed.pop(sys_id, None)
+            self._deleted.add(sys_id)
+        return True
+
+
+def stringify(data):
+    # Table API stores and returns all field values as strings.
+    result = {}
+    for key, value in data.items():
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif isinstance(value, dict):
+            value = value.get("value", value.get("sys_id", ""))
+        elif value is None:
+            value = ""
+        result[key] = value if isinstance(value, str) else str(value)
+    return result
+
+
+# Encoded query support
+
+_OPERATORS = [
+    "ISNOTEMPTY",
+    "ISEMPTY",
+    "NOT IN",
+    "NOTLIKE",
+    "STARTSWITH",
+    "ENDSWITH",
+    "LIKE",
+    "IN",
+    "!=",
+    ">=",
+    "<=",
+    "=",
+    ">",
+    "<",
+]
+# Field names are lower case, which sets them apart from the operators.
+_FIELD = re.compile(r"[a-z0-9_.]+")
+
+
+_DECIMAL = re.compile(r"-?[0-9]+(\.[0-9]+)?$")
+
+
+def _compare(a, b):
+    # Hex sys_ids like 12e4... must not be compared as numbers.
+    if _DECIMAL.match(a) and _DECIMAL.match(b):
+        a, b = float(a), float(b)
+    return (a > b) - (a < b)
+
+
+def _condition(term):
+    match = _FIELD.match(term)
+    if not match:
+        raise ValueError("Invalid query term {0!r}".format(term))
+    field, rest = match.group(), term[match.end() :]
+    for op in _OPERATORS:
+        if rest.startswith(op):
+            value = rest[len(op) :]
+            break
+    else:
+        raise ValueError("Invalid query term {0!r}".format(term))
+
+    def test(record):
+        actual = record.get(field, "")
+        if op == "=":
+            return actual == value
+        if op == "!=":
+            return actual != value
+        if op == "ISEMPTY":
+            return actual == ""
+        if op == "ISNOTEMPTY":
+            return actual != ""
+        if op == "LIKE":
+            return value.lower() in actual.lower()
+        if op == "NOTLIKE":
+            return value.lower() not in actual.lower()
+        if op == "STARTSWITH":
+            return actual.lower().startswith(value.lower())
+        if op == "ENDSWITH":
+            return actual.lower().endswith(value.lower())
+        if op == "IN":
+            return actual in value.split(",")
+        if op == "NOT IN":
+            return actual not in value.split(",")
+        cmp = _compare(actual, value)
+        return dict(
+            [(">", cmp > 0), ("<", cmp < 0), (">=", cmp >= 0), ("<=", cmp <= 0)]
+        )[op]
+
+    return test
+
+
+def parse_query(query):
+    """
+    Parse an encoded query.
+
+    Returns a predicate that tests a record and a list of (field, descending)
+    sort keys.
+    """
+    order = []
+    alternatives = []
+    for part in query.split("^NQ") if query else []:
+        groups = []
+        for term in part.split("^"):
+            if not term or term == "EQ":
+                continue
+            if term.startswith("ORDERBYDESC"):
+                order.append((term[len("ORDERBYDESC") :], True))
+            elif term.startswith("ORDERBY"):
+                order.append((term[len("ORDERBY") :], False))
+            elif term.startswith("OR") and groups:
+                groups[-1].append(_condition(term[2:]))
+            else:
+                groups.append([_condition(term)])
+        if groups:
+            alternatives.append(groups)
+
+    def predicate(record):
+        if not alternatives:
+            return True
+        return any(
+            all(any(test(record) for test in group) for group in groups)
+            for groups in alternatives
+        )
+
+    return predicate, order
+
+
+class Response:
+    def __init__(self, status, body=None, headers=None, content_type=None):
+        self.status = status
+        self.headers = list(headers or [])
+        if body is None:
+            self.body = b""
+        elif isinstance(body, bytes):
+            self.body = body
+            self.headers.append(("Content-Type", content_type or "text/plain"))
+        else:
+            self.body = json.dumps(body, separators=(",", ":")).encode("utf-8")
+            self.headers.append(("Content-Type", "application/json;charset=UTF-8"))
+
+
+def error(status, message, detail=None):
+    return Response(
+        status,
+        dict(error=dict(message=message, detail=detail), status="failure"),
+    )
+
+
+class Request:
+    def __init__(self, method, path, query=None, headers=None, body=b""):
+        self.method = method.upper()
+        self.path = path.rstrip("/") or "/"
+        self.query = query or {}
+        self.headers = dict((k.lower(), v) for k, v in (headers or {}).items())
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8")) if self.body else {}
+
+    def flag(self, name):
+        return self.query.get(name, "false").lower() == "true"
+
+
+class Instance:
+    """
+    In-memory ServiceNow instance.
+
+    Requests are handled by handle, which maps a Request to a Response and
+    knows nothing about HTTP connections. Authentication is only checked if
+    the instance was created with credentials.
+    """
+
+    def __init__(self, host="http://127.0.0.1", username=None, password=None):
+        self.host = host
+        self.username = username
+        self.password = password
+        self.tables = {}
+        self.attachments = {}
+        self.tokens = {}
+        self.cart = []
+        self._lock = threading.RLock()
+
+        for name in ("Depends on::Used by", "Runs on::Runs", "Contains::Contained by"):
+            self.table("cmdb_rel_type").insert(dict(name=name, sys_name=name))
+
+    def table(self, name):
+        if name not in self.tables:
+            self.tables[name] = Table(name)
+        return self.tables[name]
+
+    def populate(self, name, count, factory=None):
+        self.table(name).populate(count, factory)
+
+    # Rendering
+
+    def display(self, table, sys_id):
+        record = self.table(table).get(sys_id) if sys_id else None
+        if record is None:
+            return sys_id
+        for field in ("number", "name", "user_name"):
+            if record.get(field):
+                return record[field]
+        return sys_id
+
+    def render(self, record, request):
+        fields = request.query.get("sysparm_fields")
+        display_value = request.query.get("sysparm_display_value", "false").lower()
+        exclude_links = request.flag("sysparm_exclude_reference_link")
+
+        if fields:
+            keys = [f.strip() for f in fields.split(",")]
+        else:
+            keys = sorted(record)
+
+        result = {}
+        for key in keys:
+            value = record.get(key, "")
+            reference = REFERENCES.get(key) if value else None
+            if display_value == "false" and not reference:
+                result[key] = value
+                continue
+
+            rendered = {}
+            if display_value in ("true", "all"):
+                rendered["display_value"] = (
+                    self.display(reference, value) if reference else value
+                )
+            if display_value in ("false", "all"):
+                rendered["value"] = value
+            if reference and not exclude_links:
+                rendered["link"] = "{0}{1}{2}/{3}".format(
+                    self.host, TABLE_API, reference, value
+                )
+            if len(rendered) == 1 and display_value != "all":
+                rendered = list(rendered.values())[0]
+            result[key] = rendered
+        return result
+
+    def page(self, request, records, render=None):
+        """
+        Return a list response with the requested page of records.
+
+        records is a Table or an iterable of stored records, which is
+        filtered and sorted according to sysparm_query.
+        """
+        render = render or (lambda r: self.render(r, request))
+        try:
+            limit = int(request.query.get("sysparm_limit", DEFAULT_LIMIT))
+            offset = int(request.query.get("sysparm_offset", 0))
+            predicate, order = parse_query(request.query.get("sysparm_query", ""))
+        except ValueError as e:
+            return error(400, "Invalid query", str(e))
+
+        # Plain name=value parameters filter records as well.
+        filters = dict(
+            (k, v) for k, v in request.query.items() if not k.startswith("sysparm_")
+        )
+
+        if isinstance(records, Table) and not (
+            request.query.get("sysparm_query") or filters
+        ):
+            # Only generate the records on the requested page.
+            total = len(records)
+            ids = itertools.islice(records.ids(), offset, offset + limit)
+            result = [render(records.get(sys_id)) for sys_id in ids]
+        else:
+            if isinstance(records, Table):
+                records = records.records()
+            matching = [
+                r
+                for r in records
+                if predicate(r) and all(r.get(k, "") == v for k, v in filters.items())
+            ]
+            for field, descending in reversed(order):
+                matching.sort(key=lambda r: r.get(field, ""), reverse=descending)
+            total = len(matching)
+            result = [render(r) for r in matching[offset : offset + limit]]
+
+        headers = []
+        if not request.flag("sysparm_no_count"):
+            headers.append(("X-Total-Count", str(total)))
+        if not request.flag("sysparm_suppress_pagination_header"):
+            headers.append(("Link", self._links(request, offset, limit, total)))
+        return Response(200, dict(result=result), headers)
+
+    def _links(self, request, offset, limit, total):
+        def link(rel, at):
+            query = dict(request.query, sysparm_offset=at, sysparm_limit=limit)
+            return '<{0}{1}?{2}>;rel="{3}"'.format(
+                self.host, request.path, urlencode(sorted(query.items())), rel
+            )
+
+        links = [link("first", 0)]
+        if offset > 0:
+            links.append(link("prev", max(offset - limit, 0)))
+        if offset + limit < total:
+            links.append(link("next", offset + limit))
+        links.append(link("last", max((total - 1) // max(limit, 1) * limit, 0)))
+        return ",".join(links)
+
+    # Dispatch
+
+    def handle(self, request):
+        if request.path == "/oauth_token.do" and request.method == "POST":
+            return self.oauth_token(request)
+
+        if not self.authenticated(request):
+            return error(401, "User Not Authenticated", "Required to provide Auth")
+
+        with self._lock:
+            path = request.path
+            if path.startswith(TABLE_API):
+                return self.table_api(request, path[len(TABLE_API) :].split("/"))
+            if path.startswith(STATS_API):
+                return self.stats_api(request, path[len(STATS_API) :])
+            if path == ATTACHMENT_API or path.startswith(ATTACHMENT_API + "/"):
+                parts = path[len(ATTACHMENT_API) + 1 :].split("/")
+                return self.attachment_api(request, [p for p in parts if p])
+            if path.startswith(CMDB_API):
+                return self.cmdb_api(request, path[len(CMDB_API) :].split("/"))
+            if path.startswith(CATALOG_API):
+                return self.catalog_api(request, path[len(CATALOG_API) :].split("/"))
+            if path == BATCH_API and request.method == "POST":
+                return self.batch_api(request)
+            if path in (IRE_API, IRE_API + "/query") and request.method == "POST":
+                return self.ire_api(request, commit=path == IRE_API)
+        return error(400, "Requested URI does not represent any resource", path)
+
+    def authenticated(self, request):
+        if self.username is None:
+            return True
+        auth = request.headers.get("authorization", "")
+        if auth.startswith("Bearer "):
+            return self.tokens.get(auth[7:], 0) > time.time()
+        if auth.startswith("Basic "):
+            user, _sep, password = (
+                base64.b64decode(auth[6:]).decode("utf-8").partition(":")
+            )
+            return (user, password) == (self.username, self.password)
+        return False
+
+    def oauth_token(self, request):
+        data = dict(parse_qsl(request.body.decode("utf-8")))
+        grant_type = data.get("grant_type")
+        if grant_type == "password" and self.username is not None:
+            if (data.get("username"), data.get("password")) != (
+                self.username,
+                self.password,
+            ):
+                return Response(401, dict(error="access_denied"))
+        elif grant_type not in ("password", "client_credentials", "refresh_token"):
+            return Response(400, dict(error="unsupported_grant_type"))
+
+        token = uuid.uuid4().hex
+        self.tokens[token] = time.time() + 1800
+        return Response(
+            200,
+            dict(
+                access_token=token,
+                refresh_token=uuid.uuid4().hex,
+                scope="useraccount",
+                token_type="Bearer",
+                expires_in=1799,
+            ),
+        )
+
+    # Table API
+
+    def table_api(self, request, parts):
+        table = self.table(parts[0])
+        sys_id = parts[1] if len(parts) > 1 else None
+
+        if request.method == "GET" and sys_id is None:
+            return self.page(request, table)
+        if request.method == "POST" and sys_id is None:
+            return Response(
+                201, dict(result=self.render(table.insert(request.json()), request))
+            )
+
+        if request.method == "GET":
+            record = table.get(sys_id)
+        elif request.method in ("PATCH", "PUT"):
+            record = table.update(sys_id, request.json())
+        elif request.method == "DELETE":
+            if table.delete(sys_id):
+                return Response(204)
+            record = None
+        else:
+            return error(405, "Method not supported", request.method)
+
+        if record is None:
+            return error(404, "No Record found", "Record doesn't exist")
+        return Response(200, dict(result=self.render(record, request)))
+
+    # Aggregate API
+
+    def stats_api(self, request, table):
+        if request.method != "GET":
+            return error(405, "Method not supported", request.method)
+        if table not in self.tables:
+            return error(404, "Invalid table", table)
+
+        try:
+            predicate, _order = parse_query(request.query.get("sysparm_query", ""))
+        except ValueError as e:
+            return error(400, "Invalid query", str(e))
+        records = [r for r in self.tables[table].records() if predicate(r)]
+
+        def fields(name):
+            value = request.query.get(name, "")
+            return [f.strip() for f in value.split(",") if f.strip()]
+
+        def numbers(group, field):
+            values = []
+            for record in group:
+                try:
+                    values.append(float(record.get(field, "")))
+                except ValueError:
+                    pass
+            return values
+
+        def stats(group):
+            result = {}
+            if request.flag("sysparm_count"):
+                result["count"] = str(len(group))
+            for function, name in (
+                ("avg", "sysparm_avg_fields"),
+                ("sum", "sysparm_sum_fields"),
+                ("min", "sysparm_min_fields"),
+                ("max", "sysparm_max_fields"),
+            ):
+                for field in fields(name):
+                    values = numbers(group, field)
+                    if function == "avg":
+                        value = sum(values) / len(values) if values else ""
+                    elif function == "sum":
+                        value = sum(values)
+                    elif values:
+                        value = (min if function == "min" else max)(values)
+                    else:
+                        value = ""
+                    result.setdefault(function, {})[field] = str(value)
+            return result
+
+        group_by = fields("sysparm_group_by")
+        if not group_by:
+            return Response(200, dict(result=dict(stats=stats(records))))
+
+        groups = OrderedDict()
+        for record in records:
+            key = tuple(record.get(f, "") for f in group_by)
+            groups.setdefault(key, []).append(record)
+
+        display_value = request.query.get("sysparm_display_value", "false").lower()
+        result = []
+        for key, group in groups.items():
+            groupby_fields = []
+            for field, value in zip(group_by, key):
+                item = dict(field=field, value=value)
+                if display_value in ("true", "all"):
+                    reference = REFERENCES.get(field)
+                    item["display_value"] = (
+                        self.display(reference, value) if reference else value
+                    )
+                groupby_fields.append(item)
+            result.append(dict(stats=stats(group), groupby_fields=groupby_fields))
+
+        for term in reversed(fields("sysparm_orderby")):
+            descending = term.upper().endswith("^DESC")
+            name = term.split("^")[0]
+            if name.upper() == "COUNT":
+                key = lambda g: int(g["stats"].get("count", 0))  # noqa: E731
+            else:
+                position = group_by.index(name) if name in group_by else 0
+                key = lambda g: g["groupby_fields"][position]["value"]  # noqa: E731
+            result.sort(key=key, reverse=descending)
+        return Response(200, dict(result=result))
+
+    # Attachment API
+
+    def attachment_api(self, request, parts):
+        table = self.table("sys_attachment")
+
+        if not parts and request.method == "GET":
+            return self.page(request, table)
+
+        if parts == ["file"] and request.method == "POST":
+            query = request.query
+            record = table.insert(
+                dict(
+                    table_name=query.get("table_name", ""),
+                    table_sys_id=query.get("table_sys_id", ""),
+                    file_name=query.get("file_name", ""),
+                    content_type=request.headers.get(
+                        "content-type", "application/octet-stream"
+                    ),
+                    size_bytes=len(request.body),
+                    hash=query.get("hash", ""),
+                )
+            )
+            record = table.update(
+                record["sys_id"],
+                dict(
+                    download_link="{0}{1}/{2}/file".format(
+                        self.host, ATTACHMENT_API, record["sys_id"]
+                    )
+                ),
+            )
+            self.attachments[record["sys_id"]] = request.body
+            return Response(201, dict(result=self.render(record, request)))
+
+        record = table.get(parts[0])
+        if record is None:
+            return error(404, "Record doesn't exist or ACL restricts the record")
+
+        if parts[1:] == ["file"] and request.method == "GET":
+            return Response(
+                200,
+                self.attachments.get(parts[0], b""),
+                content_type=record["content_type"],
+            )
+        if len(parts) == 1 and request.method == "GET":
+            return Response(200, dict(result=self.render(record, request)))
+        if len(parts) == 1 and request.method == "DELETE":
+            table.delete(parts[0])
+            self.attachments.pop(parts[0], None)
+            return Response(204)
+        return error(405, "Method not supported", request.method)
+
+    # CMDB Instance API
+
+    def relations(self, sys_id):
+        inbound, outbound = [], []
+        types = self.table("cmdb_rel_type")
+        for rel in self.table("cmdb_rel_ci").records():
+            if sys_id not in (rel.get("parent"), rel.get("child")):
+                continue
+            outgoing = rel.get("parent") == sys_id
+            target = rel["child"] if outgoing else rel["parent"]
+            relation = dict(
+                sys_id=rel["sys_id"],
+                type=dict(
+                    value=rel["type"],
+                    display_value=(types.get(rel["type"]) or {}).get("name", ""),
+                ),
+                target=dict(value=target, display_value=self._ci_name(target)),
+            )
+            (outbound if outgoing else inbound).append(relation)
+        return inbound, outbound
+
+    def _ci_name(self, sys_id):
+        for table in self.tables.values():
+            if table.name.startswith("cmdb_ci"):
+                record = table.get(sys_id)
+                if record is not None:
+                    return record.get("name", "")
+        return ""
+
+    def ci(self, record, request):
+        inbound, outbound = self.relations(record["sys_id"])
+        return dict(
+            attributes=self.render(record, request),
+            inbound_relations=inbound,
+            outbound_relations=outbound,
+        )
+
+    def add_relations(self, sys_id, data):
+        rels = self.table("cmdb_rel_ci")
+        for key, outgoing in (
+            ("outbound_relations", True),
+            ("inbound_relations", False),
+        ):
+            for relation in data.get(key) or []:
+                target = relation["target"]
+                rels.insert(
+                    dict(
+                        parent=sys_id if outgoing else target,
+                        child=target if outgoing else sys_id,
+                        type=relation["type"],
+                    )
+                )
+
+    def cmdb_api(self, request, parts):
+        table = self.table(parts[0])
+        sys_id = parts[1] if len(parts) > 1 else None
+
+        if sys_id is None and request.method == "GET":
+            return self.page(
+                request,
+                table,
+                lambda r: dict(sys_id=r["sys_id"], name=r.get("name", "")),
+            )
+        if sys_id is None and request.method == "POST":
+            data = request.json()
+            record = table.insert(data.get("attributes") or {})
+            self.add_relations(record["sys_id"], data)
+            return Response(201, dict(result=self.ci(record, request)))
+
+        record = table.get(sys_id)
+        if record is None:
+            return error(404, "No Record found", "Record doesn't exist")
+
+        if parts[2:] == ["relation"] and request.method == "POST":
+            self.add_relations(sys_id, request.json())
+            return Response(201, dict(result=self.ci(record, request)))
+        if len(parts) == 4 and parts[2] == "relation" and request.method == "DELETE":
+            if self.table("cmdb_rel_ci").delete(parts[3]):
+                return Response(204)
+            return error(404, "No Record found", "Relation doesn't exist")
+        if len(parts) == 2 and request.method == "GET":
+            return Response(200, dict(result=self.ci(record, request)))
+        if len(parts) == 2 and request.method in ("PATCH", "PUT"):
+            record = table.update(sys_id, request.json().get("attributes") or {})
+            return Response(200, dict(result=self.ci(record, request)))
+        return error(405, "Method not supported", request.method)
+
+    # CMDB Identification and Reconciliation API
+
+    def ire_api(self, request, commit):
+        # Items are identified by their name, the identification rule of
+        # the base hardware classes.
+        data = request.json()
+        indexes = {}
+        outputs = []
+        for item in data.get("items", []):
+            values = item.get("values") or {}
+            name = (values.get("name") or "").lower()
+            if not name:
+                outputs.append(
+                    dict(
+                        className=item.get("className"),
+                        operation="NO_CHANGE",
+                        errors=[
+                            dict(
+                                error="MISSING_MATCHING_ATTRIBUTES",
+                                message="In payload no matching attributes found",
+                            )
+                        ],
+                    )
+                )
+                continue
+
+            table = self.table(item.get("className"))
+            if table.name not in indexes:
+                indexes[table.name] = dict(
+                    (r.get("name", "").lower(), r["sys_id"]) for r in table.records()
+                )
+            index = indexes[table.name]
+            sys_id = index.get(name)
+            if sys_id is None:
+                operation = "INSERT"
+                if commit:
+                    sys_id = index[name] = table.insert(values)["sys_id"]
+            else:
+                record = table.get(sys_id)
+                stored = stringify(values)
+                if all(record.get(k) == v for k, v in stored.items()):
+                    operation = "NO_CHANGE"
+                else:
+                    operation = "UPDATE"
+                    if commit:
+                        table.update(sys_id, values)
+            output = dict(className=table.name, operation=operation, errors=[])
+            if sys_id:
+                output["sysId"] = sys_id
+            outputs.append(output)
+
+        relations = []
+        for relation in data.get("relations") or []:
+            parent = outputs[relation["parent"]].get("sysId")
+            child = outputs[relation["child"]].get("sysId")
+            if commit and parent and child:
+                self.table("cmdb_rel_ci").insert(
+                    dict(parent=parent, child=child, type=relation["type"])
+                )
+            relations.append(dict(relation, errors=[]))
+        return Response(200, dict(result=dict(items=outputs, relations=relations)))
+
+    # Service Catalog API
+
+    def order(self, items):
+        request_record = self.table("sc_request").insert(
+            dict(request_state="requested", stage="requested")
+        )
+        for item_id, data in items:
+            self.table("sc_req_item").insert(
+                dict(
+                    request=request_record["sys_id"],
+                    cat_item=item_id,
+                    quantity=data.get("sysparm_quantity", "1"),
+                )
+            )
+        return dict(
+            sys_id=request_record["sys_id"],
+            number=request_record["number"],
+            request_number=request_record["number"],
+            request_id=request_record["sys_id"],
+            table="sc_request",
+        )
+
+    def catalog_api(self, request, parts):
+        catalogs = self.table("sc_catalog")
+        items = self.table("sc_cat_item")
+
+        def render(record):
+            return self.render(record, Request("GET", "/", dict(), {}))
+
+        if parts == ["catalogs"]:
+            return self.page(request, catalogs.records(), render)
+        if parts[0] == "catalogs" and len(parts) == 2:
+            record = catalogs.get(parts[1])
+            if record is None:
+                return error(404, "No Record found")
+            return Response(200, dict(result=render(record)))
+        if parts[0] == "catalogs" and parts[2:] == ["categories"]:
+            records = (
+                r
+                for r in self.table("sc_category").records()
+                if r.get("sc_catalog") == parts[1]
+            )
+            return self.page(request, records, render)
+        if parts == ["items"]:
+            catalog = request.query.get("sysparm_catalog")
+            records = (
+                r
+                for r in items.records()
+                if not catalog or r.get("sc_catalogs") == catalog
+            )
+            query = dict(
+                (k, v) for k, v in request.query.items() if k != "sysparm_catalog"
+            )
+            return self.page(
+                Request(request.method, request.path, query, request.headers),
+                records,
+                render,
+            )
+        if parts[0] == "items" and len(parts) >= 2:
+            record = items.get(parts[1])
+            if record is None:
+                return error(404, "No Record found")
+            if len(parts) == 2:
+                return Response(200, dict(result=dict(render(record), variables=[])))
+            if parts[2] == "order_now" and request.method == "POST":
+                return Response(
+                    200, dict(result=self.order([(parts[1], request.json())]))
+                )
+            if parts[2] == "add_to_cart" and request.method == "POST":
+                self.cart.append((parts[1], request.json()))
+                return Response(200, dict(result=self.cart_json()))
+        if parts == ["cart"]:
+            return Response(200, dict(result=self.cart_json()))
+        if parts[0] == "cart" and parts[1:] in (["checkout"], ["submit_order"]):
+            if not self.cart:
+                return error(400, "Cart is empty")
+            cart, self.cart = self.cart, []
+            return Response(200, dict(result=self.order(cart)))
+        return error(400, "Requested URI does not represent any resource")
+
+    def cart_json(self):
+        return dict(
+            cart_id="cart",
+            items=[
+                dict(item_id=item_id, quantity=data.get("sysparm_quantity", "1"))
+                for item_id, data in self.cart
+            ],
+        )
+
+    # Batch API
+
+    def batch_api(self, request):
+        data = request.json()
+        serviced = []
+        for sub in data.get("rest_requests", []):
+            url = urlsplit(sub["url"])
+            headers = dict((h["name"], h["value"]) for h in sub.get("headers", []))
+            sub_request = Request(
+                sub["method"],
+                unquote(url.path),
+                dict(parse_qsl(url.query)),
+                dict(request.headers, **headers),
+                base64.b64decode(sub["body"]) if sub.get("body") else b"",
+            )
+            response = self.handle(sub_request)
+            serviced.append(
+                dict(
+                    id=sub["id"],
+                    status_code=response.status,
+                    status_text="",
+                    headers=[dict(name=k, value=v) for k, v in response.headers],
+                    body=base64.b64encode(response.body).decode("ascii"),
+                    execution_time=0,
+                )
+            )
+        return Response(
+            200,
+            dict(
+                batch_request_id=data.get("batch_request_id"),
+                serviced_requests=serviced,
+                unserviced_requests=[],
+            ),
+        )
+
+
+class Throttle:
+    """
+    Token bucket that caps the throughput of all connections together.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next = time.time()
+
+    def consume(self, size):
+        if not self.rate:
+            return
+        with self._lock:
+            start = max(self._next, time.time())
+            self._next = start + size / float(self.rate)
+        delay = self._next - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ServiceNow"
+
+    def log_message(self, *args):
+        if self.server.emulator.verbose:
+            BaseHTTPRequestHandler.log_message(self, *args)
+
+    def _handle(self):
+        emulator = self.server.emulator
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = urlsplit(self.path)
+        request = Request(
+            self.command,
+            unquote(url.path),
+            dict(parse_qsl(url.query, keep_blank_values=True)),
+            dict(self.headers.items()),
+            body,
+        )
+        emulator.throttle.consume(len(body))
+
+        with emulator.track(request) as rejected:
+            if rejected:
+                response = error(429, "Too many requests", "Rate limit exceeded")
+                response.headers.append(("Retry-After", str(emulator.retry_after)))
+            else:
+                response = emulator.instance.handle(request)
+                delay = emulator.latency
+                if emulator.latency_per_kb:
+                    delay += emulator.latency_per_kb * len(response.body) / 1024.0
+                if delay:
+                    time.sleep(delay)
+        self._respond(response)
+
+    def _respond(self, response):
+        emulator = self.server.emulator
+        body = response.body
+        accept = self.headers.get("Accept-Encoding", "")
+        compress = emulator.compress and len(body) > 1024 and "gzip" in accept
+
+        if compress:
+            buf = io.BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=1) as f:
+                f.write(body)
+            body = buf.getvalue()
+
+        self.send_response(response.status)
+        for name, value in response.headers:
+            self.send_header(name, value)
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Date", formatdate(usegmt=True))
+        self.end_headers()
+
+        for i in range(0, len(body), 64 * 1024):
+            part = body[i : i + 64 * 1024]
+            emulator.throttle.consume(len(part))
+            self.wfile.write(part)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+
+class _Tracker:
+    def __init__(self, emulator, request):
+        self.emulator = emulator
+        self.request = request
+        self.rejected = False
+
+    def __enter__(self):
+        emulator = self.emulator
+        with emulator._lock:
+            emulator.requests[(self.request.method, self.request.path)] += 1
+            count = sum(emulator.requests.values())
+            self.rejected = bool(
+                (emulator.fail_every and count % emulator.fail_every == 0)
+                or (
+                    emulator.fail_rate
+                    and emulator._random.random() < emulator.fail_rate
+                )
+                or (
+                    emulator.max_concurrency
+                    and emulator.in_flight >= emulator.max_concurrency
+                )
+            )
+            if self.rejected:
+                emulator.rejected += 1
+            else:
+                emulator.in_flight += 1
+        return self.rejected
+
+    def __exit__(self, *exc_info):
+        if not self.rejected:
+            with self.emulator._lock:
+                self.emulator.in_flight -= 1
+
+
+class Emulator:
+    """
+    HTTP server that serves an Instance.
+
+    latency          -- seconds added to every response.
+    latency_per_kb   -- seconds added per KiB of response body, which
+                        models the time the instance spends on large pages.
+    bandwidth        -- maximum number of bytes per second that are sent and
+                        received over all connections together.
+    max_concurrency  -- number of requests served at the same time, further
+                        requests are rejected with 429.
+    fail_every       -- reject every n-th request with 429.
+    fail_rate        -- reject requests with 429 at random, with this
+                        probability.
+    retry_after      -- value of the Retry-After header of 429 responses.
+    compress         -- gzip encode responses if the client accepts it.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        username=None,
+        password=None,
+        latency=0.0,
+        latency_per_kb=0.0,
+        bandwidth=None,
+        max_concurrency=None,
+        fail_every=None,
+        fail_rate=None,
+        retry_after=0,
+        compress=True,
+        seed=0,
+        verbose=False,
+    ):
+        self.latency = latency
+        self.latency_per_kb = latency_per_kb
+        self.throttle = Throttle(bandwidth)
+        self.max_concurrency = max_concurrency
+        self.fail_every = fail_every
+        self.fail_rate = fail_rate
+        self.retry_after = retry_after
+        self.compress = compress
+        self.verbose = verbose
+
+        self.requests = Counter()
+        self.rejected = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.server.emulator = self
+        self.url = "http://{0}:{1}".format(*self.server.server_address[:2])
+        self.instance = Instance(self.url, username, password)
+        self._thread = None
+
+    def track(self, request):
+        return _Tracker(self, request)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,))
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests.clear()
+            self.rejected = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument(
+        "--dataset",
+        action="append",
+        default=[],
+        metavar="TABLE=COUNT",
+        help="populate the table with synthetic records",
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-per-kb", type=float, default=0.0)
+    parser.add_argument("--bandwidth", type=int, help="bytes per second")
+    parser.add_argument("--max-concurrency", type=int)
+    parser.add_argument("--fail-every", type=int)
+    parser.add_argument("--fail-rate", type=float)
+    parser.add_argument("--retry-after", type=int, default=0)
+    parser.add_argument("--no-compress", dest="compress", action="store_false")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    emulator = Emulator(
+        args.host,
+        args.port,
+        username=args.username,
+        password=args.password,
+        latency=args.latency,
+        latency_per_kb=args.latency_per_kb,
+        bandwidth=args.bandwidth,
+        max_concurrency=args.max_concurrency,
+        fail_every=args.fail_every,
+        fail_rate=args.fail_rate,
+        retry_after=args.retry_after,
+        compress=args.compress,
+        verbose=args.verbose,
+    )
+    for dataset in args.dataset:
+        table, _sep, count = dataset.partition("=")
+        emulator.instance.populate(table, int(count or 1000))
+
+    print("Serving a ServiceNow emulator on {0}".format(emulator.url))
+    try:
+        emulator.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compare the JSON codecs of the ServiceNow client on Table API pages.
+
+Record a few pages from an instance (for example with
+``curl -H 'Accept: application/json' -u user:pass -o page.json
+'https://instance.service-now.com/api/now/table/cmdb_ci_server?sysparm_limit=1000&sysparm_display_value=all'``)
+and pass them to the script:
+
+    python tests/benchmarks/json_codec.py page1.json page2.json
+
+Without arguments, the script benchmarks a synthetic page of wide
+cmdb_ci_server records in the sysparm_display_value=all format.
+
+The collection must be importable as ansible_collections.servicenow.itsm.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import json
+import timeit
+
+from ansible_collections.servicenow.itsm.plugins.module_utils import client
+
+
+def synthetic_page(records=1000, columns=80):
+    def field(i, n):
+        value = "{0:032x}".format(i * 1000 + n)
+        return dict(
+            display_value="Value {0} of column {1}".format(i, n),
+            value=value,
+            link="https://example.service-now.com/api/now/table/sys_user/" + value,
+        )
+
+    return json.dumps(
+        dict(
+            result=[
+                dict(("column_{0}".format(n), field(i, n)) for n in range(columns))
+                for i in range(records)
+            ]
+        )
+    ).encode("utf-8")
+
+
+def drop_meta(dct):
+    dct.pop("__meta", None)
+    return dct
+
+
+def benchmark(name, data, repeat):
+    print("{0}: {1:.1f} MiB".format(name, len(data) / 2.0**20))
+    for codec_name in sorted(client.JSON_CODECS):
+        try:
+            codec = client.get_json_codec(codec_name)
+        except Exception as e:
+            print("  {0:8} skipped: {1}".format(codec_name, e))
+            continue
+
+        obj = codec.loads(data)
+        results = [
+            ("loads", lambda: codec.loads(data)),
+            ("loads+hook", lambda: codec.loads(data, object_hook=drop_meta)),
+            ("dumps", lambda: codec.dumps(obj)),
+        ]
+        line = "  {0:8}".format(codec_name)
+        for label, func in results:
+            best = min(timeit.repeat(func, number=1, repeat=repeat))
+            line += "  {0} {1:8.1f} ms".format(label, best * 1000)
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("pages", nargs="*", help="recorded Table API responses")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--records", type=int, default=1000)
+    args = parser.parse_args()
+
+    if not args.pages:
+        benchmark("synthetic", synthetic_page(args.records), args.repeat)
+    for path in args.pages:
+        with open(path, "rb") as f:
+            benchmark(path, f.read(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
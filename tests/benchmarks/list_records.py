@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Measure how long it takes to list a large table through the Table API.
+
+The script starts the emulator from tests/benchmarks/emulator.py, fills a
+table with synthetic records and lists them with TableClient for every
+combination of page size and streaming mode:
+
+    python tests/benchmarks/list_records.py --records 100000 \\
+        --latency 0.05 --latency-per-kb 0.0001 --batch-size 1000 --batch-size 10000
+
+The collection must be importable as ansible_collections.servicenow.itsm.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import os
+import sys
+import time
+
+from ansible_collections.servicenow.itsm.plugins.module_utils import client, table
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from emulator import Emulator  # noqa: E402
+
+
+def run(emulator, args, batch_size, stream):
+    snow_client = client.Client(emulator.url, "admin", "admin")
+    table_client = table.TableClient(snow_client, batch_size=batch_size, stream=stream)
+    query = dict(sysparm_display_value=args.display_value)
+
+    emulator.reset_counters()
+    start = time.time()
+    records = table_client.list_records(args.table, query)
+    elapsed = time.time() - start
+
+    summary = snow_client.stats.summary()
+    print(
+        "  batch_size {0:6}  stream {1:5}  {2:7} records  {3:8.2f} s  "
+        "{4:4} requests  {5:7.1f} MiB received  {6:3} retries".format(
+            batch_size,
+            str(stream),
+            len(records),
+            elapsed,
+            summary["requests"],
+            summary["received_bytes"] / 2.0**20,
+            summary["retries"],
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--table", default="incident")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, action="append")
+    parser.add_argument("--display-value", default="false")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-per-kb", type=float, default=0.0)
+    parser.add_argument("--bandwidth", type=int, help="bytes per second")
+    parser.add_argument("--fail-every", type=int)
+    args = parser.parse_args()
+
+    emulator = Emulator(
+        username="admin",
+        password="admin",
+        latency=args.latency,
+        latency_per_kb=args.latency_per_kb,
+        bandwidth=args.bandwidth,
+        fail_every=args.fail_every,
+    )
+    emulator.instance.populate(args.table, args.records)
+
+    print("{0}: {1} records".format(args.table, args.records))
+    with emulator:
+        for batch_size in args.batch_size or [1000, 10000]:
+            for stream in (False, True):
+                run(emulator, args, batch_size, stream)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,11 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import pytest
+from ansible.errors import AnsibleActionFail, AnsibleError
 from ansible.playbook.task import Task
 from ansible_collections.servicenow.itsm.plugins.action import configuration_item_batch
+from jinja2 import Environment
+from jinja2.exceptions import UndefinedError
 
 
 class TestValidate:
@@ -151,6 +154,359 @@ class TestBuildAssetArgs:
         assert result == [dict(vm_inst_id="12345")]
 
 
+ROW = dict(
+    name="Web-01",
+    count=3,
+    size=1.5,
+    enabled=True,
+    missing_value=None,
+    tags=dict(Name="my_name", items="tag items"),
+    disks=[dict(size=10), dict(size=20)],
+    facts={"serial-number": "ABC"},
+)
+
+
+class TestCompileTemplate:
+    @pytest.mark.parametrize(
+        "template",
+        [
+            "name",
+            "count",
+            "size",
+            "enabled",
+            "missing_value",
+            "tags",
+            "disks",
+            "tags.Name",
+            "tags['Name']",
+            "tags.items",
+            "disks[1].size",
+            "disks.0.size",
+            "facts['serial-number']",
+            "'constant'",
+            "42",
+            "unknown",
+            "unknown | default('n/a')",
+            "missing_value | default('n/a', true)",
+            "name | lower",
+            "name|upper",
+            "count | string",
+            "size | int",
+            "name | replace('-', '_')",
+            "tags.Name | upper | trim",
+            "unknown | default(name)",
+            "size | round(precision=count)",
+        ],
+    )
+    def test_same_as_jinja(self, template):
+        env = Environment()
+        expected = env.from_string("{{" + template + "}}").render(**ROW)
+
+        render = configuration_item_batch.compile_template(env, template)
+
+        assert expected == render(ROW)
+
+    @pytest.mark.parametrize(
+        "template",
+        [
+            "name",
+            "tags.Name",
+            "disks[0].size",
+            "unknown | default('n/a')",
+            "name | lower",
+            "size | int",
+            "tags.Name | upper | trim",
+            "unknown | default(name)",
+            "size | round(precision=count)",
+        ],
+    )
+    def test_fast_path(self, mocker, template):
+        env = Environment()
+        from_string = mocker.patch.object(env, "from_string")
+
+        configuration_item_batch.compile_template(env, template)
+
+        from_string.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "template",
+        [
+            "name ~ '-' ~ count",
+            "count + 1",
+            "tags[name]",
+            "name if enabled else 'off'",
+            "disks | map(attribute='size') | join(',')",
+            "tags.Name | default(name ~ '!')",
+            "name }} and {{ count",
+        ],
+    )
+    def test_full_jinja(self, mocker, template):
+        env = Environment()
+        expected = env.from_string("{{" + template + "}}").render(**ROW)
+        from_string = mocker.spy(env, "from_string")
+
+        render = configuration_item_batch.compile_template(env, template)
+
+        assert expected == render(ROW)
+        from_string.assert_called_once()
+
+    def test_undefined_attribute(self):
+        env = Environment()
+        render = configuration_item_batch.compile_template(env, "unknown.name")
+
+        with pytest.raises(UndefinedError):
+            render(ROW)
+
+
+class TestValidateDatasetFile:
+    def test_valid(self):
+        assert [] == configuration_item_batch.ActionModule.validate_arguments(
+            dict(
+                dataset_file="items.csv",
+                dataset_file_format="csv",
+                dataset_chunk_size="500",
+                map={},
+            )
+        )
+
+    @pytest.mark.parametrize(
+        "args,msg",
+        [
+            (dict(dataset=[]), "dataset and dataset_file are mutually exclusive"),
+            (
+                dict(relations=[dict(parent=0, child=1, type="t")]),
+                "relations cannot be used with dataset_file",
+            ),
+            (
+                dict(sync="authoritative"),
+                "sync=authoritative cannot be used with dataset_file",
+            ),
+            (dict(dataset_file_format="xml"), "dataset_file_format should be one of"),
+            (dict(dataset_chunk_size=0), "dataset_chunk_size should be at least 1"),
+            (
+                dict(dataset_chunk_size="many"),
+                "dataset_chunk_size should be an integer",
+            ),
+        ],
+    )
+    def test_invalid(self, args, msg):
+        result = configuration_item_batch.ActionModule.validate_arguments(
+            dict(dict(dataset_file="items.jsonl", map={}), **args)
+        )
+
+        assert 1 == len(result)
+        assert result[0].startswith(msg)
+
+
+class TestReadDataset:
+    def test_format(self):
+        assert "csv" == configuration_item_batch.dataset_file_format("a/items.CSV")
+        assert "jsonl" == configuration_item_batch.dataset_file_format("items.json")
+        assert "csv" == configuration_item_batch.dataset_file_format("items", "csv")
+
+    def test_jsonl(self, tmp_path):
+        path = tmp_path / "items.jsonl"
+        path.write_text('{"name": "a", "cpus": 2}\n\n{"name": "\u017e"}\n')
+
+        rows = list(configuration_item_batch.read_dataset(str(path), "jsonl"))
+
+        assert [dict(name="a", cpus=2), dict(name="\u017e")] == rows
+
+    @pytest.mark.parametrize(
+        "content,msg",
+        [
+            ('{"name": "a"}\n{"name": \n', ":2: "),
+            ('{"name": "a"}\n["a"]\n', ":2: rows should be JSON objects"),
+        ],
+    )
+    def test_jsonl_invalid(self, tmp_path, content, msg):
+        path = tmp_path / "items.jsonl"
+        path.write_text(content)
+
+        with pytest.raises(AnsibleActionFail, match=msg):
+            list(configuration_item_batch.read_dataset(str(path), "jsonl", "x"))
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / "items.csv"
+        path.write_text('name,ip\na,1.1.1.1\n"b,c",\n')
+
+        rows = list(configuration_item_batch.read_dataset(str(path), "csv"))
+
+        assert [dict(name="a", ip="1.1.1.1"), dict(name="b,c", ip="")] == rows
+
+    def test_csv_extra_values(self, tmp_path):
+        path = tmp_path / "items.csv"
+        path.write_text("name\na\nb,c\n")
+
+        with pytest.raises(AnsibleActionFail, match="x:3: row has more values"):
+            list(configuration_item_batch.read_dataset(str(path), "csv", "x"))
+
+    def test_chunked(self):
+        chunks = list(configuration_item_batch.chunked(iter(range(5)), 2))
+
+        assert [[0, 1], [2, 3], [4]] == chunks
+
+
+class TestMergeChunkResults:
+    def test_merge(self):
+        results = dict(changed=False, records_raw=[])
+
+        assert configuration_item_batch.merge_chunk_results(
+            results,
+            0,
+            dict(
+                changed=False,
+                records_raw=[1, 2],
+                warnings=["w"],
+                summary=dict(created=0, updated=0, unchanged=2, failed=0),
+            ),
+        )
+        assert configuration_item_batch.merge_chunk_results(
+            results,
+            2,
+            dict(
+                changed=True,
+                failed=True,
+                msg="1 of 2 dataset items failed",
+                records_raw=[None, 4],
+                failed_items=[dict(index=0, msg="Bad")],
+                summary=dict(created=1, updated=0, unchanged=0, failed=1),
+            ),
+        )
+
+        assert (
+            dict(
+                changed=True,
+                records_raw=[1, 2, None, 4],
+                warnings=["w"],
+                failed_items=[dict(index=2, msg="Bad")],
+                summary=dict(created=1, updated=0, unchanged=2, failed=1),
+            )
+            == results
+        )
+
+    def test_changed_items(self):
+        results = dict(changed=False, records_raw=[])
+
+        for offset in (0, 2):
+            configuration_item_batch.merge_chunk_results(
+                results,
+                offset,
+                dict(
+                    changed=True,
+                    records_raw=[],
+                    changed_items=[dict(index=1, operation="created", sys_id="1")],
+                ),
+            )
+
+        assert [1, 3] == [item["index"] for item in results["changed_items"]]
+        assert [] == results["records_raw"]
+
+    def test_module_failure(self):
+        results = dict(changed=True, records_raw=[1])
+
+        assert not configuration_item_batch.merge_chunk_results(
+            results, 1, dict(failed=True, msg="Unauthorized")
+        )
+
+        assert (
+            dict(changed=True, records_raw=[1], failed=True, msg="Unauthorized")
+            == results
+        )
+
+
+class TestRunDatasetFile:
+    @staticmethod
+    def action(mocker, path, **args):
+        task = mocker.MagicMock(
+            Task,
+            async_val=0,
+            args=dict(
+                dict(
+                    sys_class_name="cmdb_ci_server",
+                    dataset_file="items.jsonl",
+                    dataset_chunk_size=2,
+                    map=dict(name="host"),
+                ),
+                **args
+            ),
+        )
+        loader = mocker.MagicMock()
+        loader.get_real_file.side_effect = lambda p: p
+        action = configuration_item_batch.ActionModule(
+            task,
+            mocker.MagicMock(),
+            mocker.MagicMock(),
+            loader=loader,
+            templar=None,
+            shared_loader_obj=None,
+        )
+        action._find_needle = mocker.MagicMock(return_value=str(path))
+        return action
+
+    @staticmethod
+    def sync(module_name, module_args, task_vars):
+        return dict(
+            changed=module_args["dataset"][0]["name"] == "c",
+            records_raw=[dict(i, sys_id=i["name"]) for i in module_args["dataset"]],
+        )
+
+    def test_chunks(self, mocker, tmp_path):
+        path = tmp_path / "items.jsonl"
+        path.write_text("".join('{"host": "%s"}\n' % n for n in "abcde"))
+        action = self.action(mocker, path)
+        action._execute_module = mocker.MagicMock(side_effect=self.sync)
+
+        result = action.run(task_vars=dict())
+
+        assert result["changed"] is True
+        assert list("abcde") == [r["sys_id"] for r in result["records_raw"]]
+        assert 3 == action._execute_module.call_count
+        module_args = action._execute_module.call_args_list[0][1]["module_args"]
+        assert [dict(name="a"), dict(name="b")] == module_args["dataset"]
+        assert {} == module_args["map"]
+        assert "dataset_file" not in module_args
+        assert "dataset_chunk_size" not in module_args
+        action._loader.cleanup_tmp_file.assert_called_once_with(str(path))
+
+    def test_failed_items(self, mocker, tmp_path):
+        path = tmp_path / "items.csv"
+        path.write_text("host\na\nb\nc\n")
+        action = self.action(mocker, path, dataset_file="items.csv")
+        action._execute_module = mocker.MagicMock(
+            side_effect=[
+                dict(changed=True, records_raw=[dict(sys_id="a"), dict(sys_id="b")]),
+                dict(
+                    failed=True,
+                    msg="1 of 1 dataset items failed",
+                    changed=False,
+                    records_raw=[None],
+                    failed_items=[dict(index=0, msg="403")],
+                ),
+            ]
+        )
+
+        result = action.run(task_vars=dict())
+
+        assert result["failed"] is True
+        assert "1 of 3 dataset items failed, the first one (2) with: 403" == (
+            result["msg"]
+        )
+        assert [dict(index=2, msg="403")] == result["failed_items"]
+        assert [dict(sys_id="a"), dict(sys_id="b"), None] == result["records_raw"]
+
+    def test_missing_file(self, mocker, tmp_path):
+        action = self.action(mocker, tmp_path / "missing.jsonl")
+        action._find_needle.side_effect = AnsibleError("Could not find")
+        action._execute_module = mocker.MagicMock()
+
+        result = action.run(task_vars=dict())
+
+        assert result["failed"] is True
+        assert "Could not find" in result["msg"]
+        action._execute_module.assert_not_called()
+
+
 class TestRun:
     def test_success(self, mocker):
         task = mocker.MagicMock(
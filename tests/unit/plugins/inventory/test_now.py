@@ -21,7 +21,6 @@ from ansible_collections.servicenow.itsm.plugins.module_utils.relations import (
     REL_QUERY,
 )
 
-
 try:
     # post 2.19 is strict about jinja template safety. This means test inputs
     # for params (like groups) that could contain jinja templates need
@@ -72,21 +71,21 @@ class TestFetchRecords:
     def test_no_query(self, table_client):
         now.fetch_records(table_client, "table_name", None)
 
-        table_client.list_records.assert_called_once_with(
+        table_client.iter_records.assert_called_once_with(
             "table_name", dict(sysparm_display_value=True)
         )
 
     def test_query(self, table_client):
         now.fetch_records(table_client, "table_name", [dict(my="!= value")])
 
-        table_client.list_records.assert_called_once_with(
+        table_client.iter_records.assert_called_once_with(
             "table_name", dict(sysparm_display_value=True, sysparm_query="my!=value")
         )
 
     def test_no_query_with_fields(self, table_client):
         now.fetch_records(table_client, "table_name", None, fields=["a", "b", "c"])
 
-        table_client.list_records.assert_called_once_with(
+        table_client.iter_records.assert_called_once_with(
             "table_name", dict(sysparm_display_value=True, sysparm_fields="a,b,c")
         )
 
@@ -1171,3 +1170,41 @@ class TestInventoryModuleEnhancedQueryFeatures:
         result = inventory_plugin._InventoryModule__get_query_columns(columns)
 
         assert result is None
+
+
+class TestInventoryModulePopulateRecords:
+    def populate(self, inventory_plugin, mocker, fetched, **options):
+        mocker.patch.object(
+            inventory_plugin,
+            "get_option",
+            side_effect=lambda name: dict(dict(table="cmdb_ci"), **options).get(name),
+        )
+        table_client = mocker.Mock(page_sizer=None)
+        mocker.patch.object(
+            inventory_plugin,
+            "_InventoryModule__create_table_client",
+            return_value=(table_client, table_client),
+        )
+        mocker.patch.object(now, "fetch_records", return_value=fetched)
+        inventory_plugin._cache = dict()
+        inventory_plugin.cache_key = "key"
+        inventory_plugin._cache_sub_key = "sub_key"
+        return inventory_plugin._InventoryModule__populate_records_from_remote(
+            False, "path", ["name"]
+        )
+
+    def test_records_are_yielded_as_they_arrive(self, inventory_plugin, mocker):
+        fetched = iter([dict(name="a"), dict(name="b")])
+
+        records = self.populate(inventory_plugin, mocker, fetched, cache=True)
+
+        assert dict(name="a") == next(records)
+        assert dict(name="b") == next(fetched)
+        assert [] == list(records)
+        assert [dict(name="a")] == inventory_plugin._cache["key"]["sub_key"]
+
+    def test_records_are_not_kept_without_cache(self, inventory_plugin, mocker):
+        records = self.populate(inventory_plugin, mocker, iter([dict(name="a")]))
+
+        assert [dict(name="a")] == list(records)
+        assert "sub_key" not in inventory_plugin._cache["key"]
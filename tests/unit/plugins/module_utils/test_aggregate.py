@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import aggregate, errors
+from ansible_collections.servicenow.itsm.plugins.module_utils.client import Response
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestAggregateClientPath:
+    def test_path(self, client):
+        a = aggregate.AggregateClient(client)
+
+        assert "api/now/stats/incident" == a.path("incident")
+
+
+class TestAggregateClientAggregate:
+    def test_count(self, client):
+        client.get.return_value = Response(
+            200, '{"result": {"stats": {"count": "42"}}}'
+        )
+        a = aggregate.AggregateClient(client)
+
+        result = a.aggregate("incident", query="active=true")
+
+        assert dict(count=42) == result
+        client.get.assert_called_once_with(
+            "api/now/stats/incident",
+            query=dict(sysparm_query="active=true", sysparm_count="true"),
+        )
+
+    def test_functions(self, client):
+        client.get.return_value = Response(
+            200,
+            json.dumps(
+                dict(
+                    result=dict(
+                        stats=dict(
+                            avg=dict(priority="2.5"),
+                            sum=dict(reassignment_count="7"),
+                            max=dict(opened_at="2026-01-01 10:00:00"),
+                        )
+                    )
+                )
+            ),
+        )
+        a = aggregate.AggregateClient(client)
+
+        result = a.aggregate(
+            "incident",
+            count=False,
+            avg=["priority"],
+            sum=["reassignment_count"],
+            max=["opened_at"],
+        )
+
+        assert (
+            dict(
+                avg=dict(priority=2.5),
+                sum=dict(reassignment_count=7),
+                max=dict(opened_at="2026-01-01 10:00:00"),
+            )
+            == result
+        )
+        client.get.assert_called_once_with(
+            "api/now/stats/incident",
+            query=dict(
+                sysparm_avg_fields="priority",
+                sysparm_sum_fields="reassignment_count",
+                sysparm_max_fields="opened_at",
+            ),
+        )
+
+    def test_group_by(self, client):
+        client.get.return_value = Response(
+            200,
+            json.dumps(
+                dict(
+                    result=[
+                        dict(
+                            stats=dict(count="3"),
+                            groupby_fields=[
+                                dict(
+                                    field="assignment_group",
+                                    value="123",
+                                    display_value="Network",
+                                )
+                            ],
+                        ),
+                        dict(
+                            stats=dict(count="1"),
+                            groupby_fields=[
+                                dict(
+                                    field="assignment_group",
+                                    value="",
+                                    display_value="",
+                                )
+                            ],
+                        ),
+                    ]
+                )
+            ),
+        )
+        a = aggregate.AggregateClient(client)
+
+        result = a.aggregate(
+            "incident",
+            group_by=["assignment_group"],
+            having="count^assignment_group^>^0",
+            order_by=["COUNT^DESC"],
+            display_value="true",
+        )
+
+        assert [
+            dict(
+                group_by=dict(assignment_group="123"),
+                display_value=dict(assignment_group="Network"),
+                count=3,
+            ),
+            dict(
+                group_by=dict(assignment_group=""),
+                display_value=dict(assignment_group=""),
+                count=1,
+            ),
+        ] == result
+        client.get.assert_called_once_with(
+            "api/now/stats/incident",
+            query=dict(
+                sysparm_count="true",
+                sysparm_group_by="assignment_group",
+                sysparm_having="count^assignment_group^>^0",
+                sysparm_orderby="COUNT^DESC",
+                sysparm_display_value="true",
+            ),
+        )
+
+    def test_single_group(self, client):
+        client.get.return_value = Response(
+            200,
+            json.dumps(
+                dict(
+                    result=dict(
+                        stats=dict(count="2"),
+                        groupby_fields=[dict(field="state", value="1")],
+                    )
+                )
+            ),
+        )
+        a = aggregate.AggregateClient(client)
+
+        result = a.aggregate("incident", group_by=["state"])
+
+        assert [dict(group_by=dict(state="1"), count=2)] == result
+
+    def test_nothing_to_aggregate(self, client):
+        a = aggregate.AggregateClient(client)
+
+        with pytest.raises(errors.ServiceNowError, match="At least one aggregate"):
+            a.aggregate("incident", count=False)
+
+    def test_unknown_table(self, client):
+        client.get.return_value = Response(404, '{"error": {"message": "Invalid"}}')
+        a = aggregate.AggregateClient(client)
+
+        with pytest.raises(errors.UnexpectedAPIResponse, match="404"):
+            a.aggregate("missing")
@@ -289,6 +289,27 @@ class TestAttachmentListRecords:
         )
 
 
+class TestAttachmentIterRecords:
+    def test_pagination(self, client):
+        client.get.side_effect = (
+            Response(
+                200, '{"result": [{"a": 3, "b": "sys_id"}]}', {"X-Total-Count": "2"}
+            ),
+            Response(
+                200, '{"result": [{"a": 2, "b": "sys_ie"}]}', {"X-Total-Count": "2"}
+            ),
+        )
+        a = attachment.AttachmentClient(client, batch_size=1)
+
+        records = a.iter_records(dict(table_name="incident"))
+
+        assert [dict(a=3, b="sys_id"), dict(a=2, b="sys_ie")] == list(records)
+        client.get.assert_any_call(
+            "api/now/attachment",
+            query=dict(table_name="incident", sysparm_limit=1, sysparm_offset=1),
+        )
+
+
 class TestAttachmentCreateRecord:
     def test_normal_mode(self, client):
         client.request.return_value = Response(
@@ -593,6 +614,40 @@ class TestAttachmentDeleteRecords:
         a.delete_attached_records("table", 5555, True)
         client.delete.assert_not_called()
 
+    def test_batched(self, mocker, client):
+        client.batch_requests = True
+        client.get.return_value = Response(
+            200,
+            '{"result": [{"a": 3, "sys_id": "1234"}, {"a": 4, "sys_id": "4321"}]}',
+            {"X-Total-Count": "2"},
+        )
+        batch = client.batch.return_value = mocker.MagicMock()
+        batch.__enter__.return_value = batch
+        batch.delete.return_value = mocker.Mock(response=Response(204, ""))
+        a = attachment.AttachmentClient(client)
+
+        a.delete_attached_records("table", 5555, False)
+
+        client.delete.assert_not_called()
+        assert batch.delete.call_count == 2
+        batch.delete.assert_any_call("api/now/attachment/1234")
+        batch.delete.assert_any_call("api/now/attachment/4321")
+
+    def test_batched_missing(self, mocker, client):
+        client.batch_requests = True
+        client.get.return_value = Response(
+            200, '{"result": [{"a": 3, "sys_id": "1234"}]}', {"X-Total-Count": "1"}
+        )
+        batch = client.batch.return_value = mocker.MagicMock()
+        batch.__enter__.return_value = batch
+        batch.delete.return_value = mocker.Mock(
+            response=Response(404, "Record not found")
+        )
+        a = attachment.AttachmentClient(client)
+
+        with pytest.raises(errors.UnexpectedAPIResponse, match="not found"):
+            a.delete_attached_records("table", 5555, False)
+
 
 class TestAttachmentUpdateRecords:
     def test_unchanged_normal_mode(self, client, tmp_path):
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import base64
+import json
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    batch,
+    client,
+    errors,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def serviced(request_id, status, body=None, headers=None):
+    data = dict(
+        id=request_id,
+        status_code=status,
+        status_text="OK",
+        headers=[dict(name=k, value=v) for k, v in (headers or {}).items()],
+    )
+    if body is not None:
+        data["body"] = base64.b64encode(json.dumps(body).encode("utf-8")).decode()
+    return data
+
+
+def batch_response(*serviced_requests):
+    return client.Response(
+        200,
+        json.dumps(
+            dict(
+                batch_request_id="1",
+                serviced_requests=list(serviced_requests),
+                unserviced_requests=[],
+            )
+        ),
+    )
+
+
+@pytest.fixture
+def snow_client(mocker):
+    c = client.Client(
+        "https://instance.com", "user", "pass", batch_requests=True, json_codec="json"
+    )
+    mocker.patch.object(c, "post")
+    return c
+
+
+class TestBatchRequest:
+    def test_to_json(self):
+        request = batch.BatchRequest(
+            "1", "POST", "/api/now/table/incident", {"Accept": "application/json"}, "{}"
+        )
+
+        assert request.to_json() == dict(
+            id="1",
+            method="POST",
+            url="/api/now/table/incident",
+            headers=[dict(name="Accept", value="application/json")],
+            body="e30=",
+        )
+
+    def test_response_before_flush(self):
+        request = batch.BatchRequest("1", "GET", "/api/now/table/incident", {})
+
+        with pytest.raises(errors.ServiceNowError, match="not been sent"):
+            request.response
+
+
+class TestBatch:
+    def test_flush(self, snow_client):
+        snow_client.post.return_value = batch_response(
+            serviced("1", 200, dict(result=[]), {"X-Total-Count": "0"}),
+            serviced("2", 201, dict(result=dict(sys_id="new"))),
+        )
+
+        with snow_client.batch() as b:
+            get = b.get("api/now/table/incident", dict(number="INC001"))
+            post = b.post("api/now/table/incident", dict(short_description="x"))
+
+        snow_client.post.assert_called_once_with(
+            "api/now/v1/batch",
+            dict(
+                batch_request_id="1",
+                rest_requests=[
+                    dict(
+                        id="1",
+                        method="GET",
+                        url="/api/now/table/incident?number=INC001",
+                        headers=[dict(name="Accept", value="application/json")],
+                    ),
+                    dict(
+                        id="2",
+                        method="POST",
+                        url="/api/now/table/incident",
+                        headers=[
+                            dict(name="Accept", value="application/json"),
+                            dict(name="Content-Type", value="application/json"),
+                        ],
+                        body=base64.b64encode(b'{"short_description":"x"}').decode(),
+                    ),
+                ],
+            ),
+        )
+        assert get.response.status == 200
+        assert get.response.json == dict(result=[])
+        assert get.response.headers == {"x-total-count": "0"}
+        assert post.response.status == 201
+        assert post.response.json == dict(result=dict(sys_id="new"))
+
+    def test_no_flush_on_error(self, snow_client):
+        with pytest.raises(ValueError):
+            with snow_client.batch() as b:
+                b.get("api/now/table/incident")
+                raise ValueError("Oops")
+
+        snow_client.post.assert_not_called()
+
+    def test_empty_body(self, snow_client):
+        snow_client.post.return_value = batch_response(serviced("1", 204))
+
+        with snow_client.batch() as b:
+            delete = b.delete("api/now/table/incident/1234")
+
+        assert delete.response.status == 204
+        assert delete.response.data == b""
+
+    def test_split_by_number_of_requests(self, snow_client):
+        snow_client.post.side_effect = [
+            batch_response(serviced("1", 200, {}), serviced("2", 200, {})),
+            batch_response(serviced("3", 200, {})),
+        ]
+        b = batch.Batch(snow_client, max_requests=2)
+        for _i in range(3):
+            b.get("api/now/table/incident")
+
+        b.flush()
+
+        sizes = [len(c.args[1]["rest_requests"]) for c in snow_client.post.mock_calls]
+        assert sizes == [2, 1]
+        assert len(b) == 0
+
+    def test_split_by_payload_size(self, snow_client):
+        snow_client.post.side_effect = [
+            batch_response(serviced("1", 201, {})),
+            batch_response(serviced("2", 201, {})),
+        ]
+        b = batch.Batch(snow_client, max_payload_size=500)
+        b.post("api/now/table/incident", dict(description="x" * 300))
+        b.post("api/now/table/incident", dict(description="x" * 300))
+
+        b.flush()
+
+        assert snow_client.post.call_count == 2
+
+    def test_unserviced_requests_are_resent(self, snow_client):
+        snow_client.post.side_effect = [
+            batch_response(serviced("1", 200, {})),
+            batch_response(serviced("2", 200, {})),
+        ]
+
+        with snow_client.batch() as b:
+            first = b.get("api/now/table/incident/1")
+            second = b.get("api/now/table/incident/2")
+
+        resent = snow_client.post.mock_calls[1].args[1]["rest_requests"]
+        assert [r["id"] for r in resent] == ["2"]
+        assert first.response.status == 200
+        assert second.response.status == 200
+
+    def test_nothing_serviced(self, snow_client):
+        snow_client.post.return_value = batch_response()
+
+        with pytest.raises(errors.ServiceNowError, match="did not service"):
+            with snow_client.batch() as b:
+                b.get("api/now/table/incident")
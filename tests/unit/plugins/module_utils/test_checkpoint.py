@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import stat
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import checkpoint
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestFingerprint:
+    def test_paging_parameters_are_ignored(self):
+        assert checkpoint.fingerprint(
+            "https://a.com/", "user", "api/now/table/x", dict(a="b"), "offset"
+        ) == checkpoint.fingerprint(
+            "https://a.com",
+            "user",
+            "api/now/table/x",
+            dict(a="b", sysparm_limit=10, sysparm_offset=20),
+            "offset",
+        )
+
+    def test_key_depends_on_all_parts(self):
+        keys = set(
+            [
+                checkpoint.fingerprint(
+                    "https://a.com", "u", "p", dict(a="b"), "offset"
+                ),
+                checkpoint.fingerprint(
+                    "https://b.com", "u", "p", dict(a="b"), "offset"
+                ),
+                checkpoint.fingerprint(
+                    "https://a.com", "v", "p", dict(a="b"), "offset"
+                ),
+                checkpoint.fingerprint(
+                    "https://a.com", "u", "q", dict(a="b"), "offset"
+                ),
+                checkpoint.fingerprint(
+                    "https://a.com", "u", "p", dict(a="c"), "offset"
+                ),
+                checkpoint.fingerprint(
+                    "https://a.com", "u", "p", dict(a="b"), "keyset"
+                ),
+            ]
+        )
+
+        assert len(keys) == 6
+
+
+class TestCheckpoint:
+    def test_missing(self, tmp_path):
+        with checkpoint.Checkpoint(str(tmp_path / "sub"), "key") as c:
+            assert [] == list(c.load())
+
+    def test_save_load(self, tmp_path):
+        with checkpoint.Checkpoint(str(tmp_path), "key") as c:
+            c.save(dict(offset=1), [dict(a=1)])
+            c.save(dict(offset=2), [dict(a=2)])
+
+        with checkpoint.Checkpoint(str(tmp_path), "key") as c:
+            assert [
+                (dict(offset=1), [dict(a=1)]),
+                (dict(offset=2), [dict(a=2)]),
+            ] == list(c.load())
+
+        mode = os.stat(str(tmp_path / "key.jsonl")).st_mode
+        assert stat.S_IMODE(mode) == 0o600
+
+    def test_append_after_load(self, tmp_path):
+        with checkpoint.Checkpoint(str(tmp_path), "key") as c:
+            c.save(dict(offset=1), [dict(a=1)])
+        with open(str(tmp_path / "key.jsonl"), "ab") as f:
+            f.write(b'{"state": {"offs')
+
+        with checkpoint.Checkpoint(str(tmp_path), "key") as c:
+            assert 1 == len(list(c.load()))
+            c.save(dict(offset=2), [dict(a=2)])
+
+        with checkpoint.Checkpoint(str(tmp_path), "key") as c:
+            assert [dict(offset=1), dict(offset=2)] == [s for s, _r in c.load()]
+
+    def test_stale(self, tmp_path):
+        with checkpoint.Checkpoint(str(tmp_path), "key") as c:
+            c.save(dict(offset=1), [dict(a=1)])
+
+        with checkpoint.Checkpoint(str(tmp_path), "key", max_age=-1) as c:
+            assert [] == list(c.load())
+            c.save(dict(offset=5), [dict(a=5)])
+
+        with checkpoint.Checkpoint(str(tmp_path), "key") as c:
+            assert [(dict(offset=5), [dict(a=5)])] == list(c.load())
+
+    def test_directory_permissions(self, tmp_path):
+        directory = tmp_path / "checkpoints"
+
+        with checkpoint.Checkpoint(str(directory), "key") as c:
+            c.save(dict(offset=1), [dict(a=1)])
+
+        assert 0o700 == stat.S_IMODE(os.stat(str(directory)).st_mode)
+
+    def test_remove(self, tmp_path):
+        with checkpoint.Checkpoint(str(tmp_path), "key") as c:
+            c.save(dict(offset=1), [dict(a=1)])
+            c.remove()
+
+        assert not os.path.exists(str(tmp_path / "key.jsonl"))
+        assert not os.path.exists(str(tmp_path / "key.jsonl.lock"))
+
+    def test_locked_checkpoint_is_inactive(self, tmp_path):
+        with checkpoint.Checkpoint(str(tmp_path), "key") as c:
+            c.save(dict(offset=1), [dict(a=1)])
+
+            with checkpoint.Checkpoint(str(tmp_path), "key") as other:
+                assert other.active is False
+                assert [] == list(other.load())
+                other.save(dict(offset=9), [dict(a=9)])
+                other.remove()
+
+        with checkpoint.Checkpoint(str(tmp_path), "key") as c:
+            assert [dict(offset=1)] == [s for s, _r in c.load()]
+        assert os.path.exists(str(tmp_path / "key.jsonl.lock"))
@@ -7,8 +7,12 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import gzip
 import io
 import sys
+import socket
+import ssl
+import zlib
 
 import pytest
 from ansible.module_utils.common.text.converters import to_text
@@ -98,6 +102,69 @@ class TestResponseInit:
         assert resp.json == {"result": [{"some_obj": "value"}]}
 
 
+class TestJSONCodecs:
+    @pytest.fixture(params=["json", "orjson", "ujson"])
+    def codec(self, request):
+        if request.param != "json":
+            pytest.importorskip(request.param)
+        return client.get_json_codec(request.param)
+
+    def test_loads(self, codec):
+        data = '{"result": [{"a": "\\u010d", "b": 1.5, "c": null, "d": true}]}'
+
+        assert codec.loads(data) == {
+            "result": [{"a": "\u010d", "b": 1.5, "c": None, "d": True}]
+        }
+        assert codec.loads(data.encode("utf-8")) == codec.loads(data)
+
+    def test_loads_with_hook(self, codec):
+        data = '{"result": [{"some_obj": "value"}, {"__meta": {"encodedQuery": "q"}}]}'
+
+        result = codec.loads(data, object_hook=custom_decoder_hook)
+
+        assert result == {"result": [{"some_obj": "value"}]}
+
+    def test_loads_invalid(self, codec):
+        with pytest.raises(ValueError):
+            codec.loads("Not Found")
+
+    def test_dumps(self, codec):
+        data = {"a": "b/c", "d": [1, None]}
+
+        assert codec.dumps(data) == '{"a":"b/c","d":[1,null]}'
+
+    def test_response_uses_codec(self, mocker, codec):
+        loads_mock = mocker.spy(codec, "loads")
+        resp = client.Response(200, '{"a": 1}', codec=codec)
+
+        assert resp.json == {"a": 1}
+        loads_mock.assert_called_once()
+
+
+class TestGetJSONCodec:
+    def test_auto(self, mocker):
+        mocker.patch.object(client, "HAS_ORJSON", False)
+        mocker.patch.object(client, "HAS_UJSON", False)
+
+        assert client.get_json_codec().name == "json"
+
+    def test_auto_prefers_fast_codec(self, mocker):
+        mocker.patch.object(client, "HAS_ORJSON", False)
+        mocker.patch.object(client, "HAS_UJSON", True)
+
+        assert client.get_json_codec().name == "ujson"
+
+    def test_unknown(self):
+        with pytest.raises(errors.ServiceNowError, match="Unknown JSON codec"):
+            client.get_json_codec("yaml")
+
+    def test_missing_library(self, mocker):
+        mocker.patch.object(client, "HAS_ORJSON", False)
+
+        with pytest.raises(errors.ServiceNowError, match="requires the orjson"):
+            client.get_json_codec("orjson")
+
+
 class TestClientInit:
     @pytest.mark.parametrize("host", [None, "", "invalid", "missing.schema"])
     def test_invalid_host(self, host):
@@ -275,6 +342,88 @@ class TestClientAuthHeader:
         assert c.auth_header == {"Authorization": "Bearer oauth-token-456"}
 
 
+class TestClientTokenCache:
+    @staticmethod
+    def oauth_client(tmp_path):
+        return client.Client(
+            "https://instance.com",
+            "user",
+            "pass",
+            client_id="id",
+            client_secret="secret",
+            token_cache_path=str(tmp_path / "tokens.json"),
+        )
+
+    def test_token_is_shared(self, mocker, tmp_path):
+        resp_mock = mocker.MagicMock()
+        resp_mock.status = 200
+        resp_mock.read.return_value = '{"access_token": "token", "expires_in": 1799}'
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.return_value = resp_mock
+
+        first = self.oauth_client(tmp_path)
+        second = self.oauth_client(tmp_path)
+
+        assert first.auth_header == {"Authorization": "Bearer token"}
+        assert second.auth_header == {"Authorization": "Bearer token"}
+        assert request_mock.open.call_count == 1
+
+    def test_token_is_not_shared_after_credential_change(self, mocker, tmp_path):
+        resp_mock = mocker.MagicMock()
+        resp_mock.status = 200
+        resp_mock.read.return_value = '{"access_token": "token", "expires_in": 1799}'
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.return_value = resp_mock
+
+        self.oauth_client(tmp_path).auth_header
+        changed = self.oauth_client(tmp_path)
+        changed.password = "new-pass"
+        changed.auth_header
+
+        assert request_mock.open.call_count == 2
+
+    def test_token_without_expiration_is_not_cached(self, mocker, tmp_path):
+        resp_mock = mocker.MagicMock()
+        resp_mock.status = 200
+        resp_mock.read.return_value = '{"access_token": "token"}'
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.return_value = resp_mock
+
+        self.oauth_client(tmp_path).auth_header
+        self.oauth_client(tmp_path).auth_header
+
+        assert request_mock.open.call_count == 2
+
+    def test_rejected_cached_token_is_refreshed(self, mocker, tmp_path):
+        c = self.oauth_client(tmp_path)
+        c.token_cache.set(c._token_cache_key(), "stale", 1799)
+        fetch_mock = mocker.patch.object(c, "_fetch_oauth_token")
+        fetch_mock.return_value = ("fresh", 1799)
+        request_mock = mocker.patch.object(c, "_request")
+        request_mock.side_effect = [
+            errors.AuthError("expired"),
+            client.Response(200, "{}"),
+        ]
+
+        c.request("GET", "api/now/some/path")
+
+        assert request_mock.call_count == 2
+        assert request_mock.call_args.kwargs["headers"]["Authorization"] == (
+            "Bearer fresh"
+        )
+        assert c.token_cache.get(c._token_cache_key()) == "fresh"
+
+    def test_rejected_fresh_token(self, mocker, tmp_path):
+        c = self.oauth_client(tmp_path)
+        mocker.patch.object(c, "_fetch_oauth_token").return_value = ("token", 1799)
+        request_mock = mocker.patch.object(c, "_request")
+        request_mock.side_effect = errors.AuthError("invalid")
+
+        with pytest.raises(errors.AuthError):
+            c.request("GET", "api/now/some/path")
+        assert request_mock.call_count == 1
+
+
 class TestClientRequest:
     def test_request_without_data_success(self, mocker):
         c = client.Client("https://instance.com", "user", "pass")
@@ -346,6 +495,48 @@ class TestClientRequest:
         with pytest.raises(errors.ServiceNowError, match="some error"):
             c.request("GET", "api/now/some/path")
 
+    def test_url_error_timeout(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = URLError(socket.timeout("timed out"))
+
+        c = client.Client("https://instance.com", "user", "pass")
+
+        with pytest.raises(errors.RequestTimeout, match="timed out"):
+            c.request("GET", "api/now/some/path")
+
+    def test_ssl_error_with_client_certificate(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = ssl.SSLError("bad key")
+
+        c = client.Client(
+            "https://instance.com",
+            client_certificate_file="cert.pem",
+            client_key_file="key.pem",
+        )
+
+        with pytest.raises(errors.ServiceNowError, match="client certificate"):
+            c.request("GET", "api/now/some/path")
+
+    def test_ssl_error(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = ssl.SSLError("bad handshake")
+
+        c = client.Client("https://instance.com", "user", "pass")
+
+        with pytest.raises(ssl.SSLError, match="bad handshake"):
+            c.request("GET", "api/now/some/path")
+
+    def test_read_timeout(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        raw_resp = mocker.MagicMock(status=200)
+        raw_resp.read.side_effect = socket.timeout("timed out")
+        request_mock.open.return_value = raw_resp
+
+        c = client.Client("https://instance.com", "user", "pass")
+
+        with pytest.raises(errors.RequestTimeout, match="timed out"):
+            c.request("GET", "api/now/some/path")
+
     def test_path_escaping(self, mocker):
         request_mock = mocker.patch.object(client, "Request").return_value
         raw_request = mocker.MagicMock(status=200)
@@ -444,6 +635,329 @@ class TestClientRequest:
         assert resp == mock_response
 
 
+class TestClientRetry:
+    def test_retry_after(self, mocker):
+        sleep_mock = mocker.patch.object(client.time, "sleep")
+        c = client.Client("https://instance.com", "user", "pass")
+        request_mock = mocker.patch.object(c, "_request")
+        request_mock.side_effect = [
+            client.Response(429, "Too many", [("Retry-After", "2")]),
+            client.Response(503, "Unavailable", [("Retry-After", "1")]),
+            client.Response(200, '{"result": []}'),
+        ]
+
+        resp = c.get("api/now/table/incident")
+
+        assert resp.status == 200
+        assert request_mock.call_count == 3
+        assert sleep_mock.call_args_list == [mocker.call(2.0), mocker.call(1.0)]
+
+    def test_retries_exhausted(self, mocker):
+        mocker.patch.object(client.time, "sleep")
+        c = client.Client("https://instance.com", "user", "pass", retries=2)
+        request_mock = mocker.patch.object(c, "_request")
+        request_mock.return_value = client.Response(429, "Too many")
+
+        with pytest.raises(errors.UnexpectedAPIResponse, match="429"):
+            c.get("api/now/table/incident")
+        assert request_mock.call_count == 3
+
+    def test_max_wait(self, mocker):
+        sleep_mock = mocker.patch.object(client.time, "sleep")
+        c = client.Client("https://instance.com", "user", "pass", retry_max_wait=10)
+        request_mock = mocker.patch.object(c, "_request")
+        request_mock.return_value = client.Response(
+            429, "Too many", [("Retry-After", "6")]
+        )
+
+        with pytest.raises(errors.UnexpectedAPIResponse, match="429"):
+            c.get("api/now/table/incident")
+        assert request_mock.call_count == 2
+        sleep_mock.assert_called_once_with(6.0)
+
+    def test_post_is_not_retried_by_default(self, mocker):
+        sleep_mock = mocker.patch.object(client.time, "sleep")
+        c = client.Client("https://instance.com", "user", "pass")
+        request_mock = mocker.patch.object(c, "_request")
+        request_mock.return_value = client.Response(503, "Unavailable")
+
+        with pytest.raises(errors.UnexpectedAPIResponse, match="503"):
+            c.post("api/now/table/incident", {"some": "data"})
+        assert request_mock.call_count == 1
+        sleep_mock.assert_not_called()
+
+    def test_post_retries(self, mocker):
+        mocker.patch.object(client.time, "sleep")
+        c = client.Client(
+            "https://instance.com", "user", "pass", retry_methods=["POST"]
+        )
+        request_mock = mocker.patch.object(c, "_request")
+        request_mock.side_effect = [
+            client.Response(503, "Unavailable"),
+            client.Response(201, '{"result": {}}'),
+        ]
+
+        resp = c.post("api/now/table/incident", {"some": "data"})
+
+        assert resp.status == 201
+
+
+class TestClientStats:
+    def test_requests_are_counted(self, mocker):
+        mocker.patch.object(client.time, "sleep")
+        raw_resp = mocker.MagicMock(status=200, headers={})
+        raw_resp.read.return_value = b'{"result": {}}'
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = [
+            HTTPError("", 429, "Too many", {}, io.BytesIO(b"Wait")),
+            raw_resp,
+            raw_resp,
+        ]
+
+        c = client.Client("https://instance.com", "user", "pass")
+        c.get("api/now/table/incident", query=dict(a="b"))
+        c.post("api/now/table/incident", dict(short_description="x"))
+
+        summary = c.stats.summary()
+        assert summary["requests"] == 3
+        assert summary["retries"] == 1
+        assert summary["sent_bytes"] == len('{"short_description":"x"}')
+        assert summary["received_bytes"] == 4 + 2 * len(b'{"result": {}}')
+        assert summary["auth_requests"] == 0
+        assert [
+            (e["method"], e["endpoint"], e["requests"]) for e in summary["endpoints"]
+        ] == [
+            ("GET", "/api/now/table/incident", 2),
+            ("POST", "/api/now/table/incident", 1),
+        ]
+
+    def test_auth_requests_are_counted(self, mocker):
+        c = client.Client(
+            "https://instance.com",
+            "user",
+            "pass",
+            client_id="id",
+            client_secret="secret",
+        )
+        mocker.patch.object(c, "_request").return_value = client.Response(
+            200, '{"access_token": "token"}'
+        )
+
+        c.auth_header
+
+        assert c.stats.auth_requests == 1
+
+
+class TestDecompress:
+    def test_gzip(self):
+        data = b'{"result": []}'
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode="wb") as f:
+            f.write(data)
+
+        assert client.decompress(buf.getvalue(), "gzip") == data
+
+    def test_deflate(self):
+        data = b'{"result": []}'
+
+        assert client.decompress(zlib.compress(data), "deflate") == data
+
+    def test_raw_deflate(self):
+        data = b'{"result": []}'
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+        raw = compressor.compress(data) + compressor.flush()
+
+        assert client.decompress(raw, "deflate") == data
+
+    @pytest.mark.parametrize("encoding", [None, "", "identity", "br"])
+    def test_passthrough(self, encoding):
+        assert client.decompress(b"data", encoding) == b"data"
+
+    def test_invalid_data(self):
+        with pytest.raises(errors.ServiceNowError, match="decompress gzip"):
+            client.decompress(b"not gzip", "gzip")
+
+
+class TestClientCompression:
+    def test_accept_encoding(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.return_value = mocker.MagicMock(status=200)
+
+        c = client.Client("https://instance.com", "user", "pass")
+        c.request("GET", "api/now/some/path")
+
+        headers = request_mock.open.call_args.kwargs["headers"]
+        assert headers["Accept-Encoding"] == "gzip, deflate"
+        assert request_mock.open.call_args.kwargs["decompress"] is False
+
+    def test_custom_accept_encoding(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.return_value = mocker.MagicMock(status=200)
+
+        c = client.Client(
+            "https://instance.com",
+            "user",
+            "pass",
+            custom_headers={"accept-encoding": "identity"},
+        )
+        c.request("GET", "api/now/some/path")
+
+        headers = request_mock.open.call_args.kwargs["headers"]
+        assert "Accept-Encoding" not in headers
+        assert headers["accept-encoding"] == "identity"
+
+    def test_compressed_response(self, mocker):
+        data = b'{"result": [{"a": "b"}]}' * 10
+        raw_resp = mocker.MagicMock(status=200)
+        raw_resp.read.return_value = zlib.compress(data)
+        raw_resp.headers = {"Content-Encoding": "deflate"}
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.return_value = raw_resp
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.request("GET", "api/now/some/path")
+
+        assert resp.data == data
+        summary = c.stats.summary()
+        assert summary["requests"] == 1
+        assert summary["received_bytes"] == len(zlib.compress(data))
+        assert summary["decoded_bytes"] == len(data)
+
+    def test_compressed_error_response(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = HTTPError(
+            "",
+            404,
+            "Not Found",
+            {"Content-Encoding": "deflate"},
+            io.BytesIO(zlib.compress(b"My Error")),
+        )
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.request("GET", "api/now/some/path")
+
+        assert resp.status == 404
+        assert resp.data == b"My Error"
+
+
+class TestDecompressor:
+    @pytest.mark.parametrize(
+        "encoding,compress",
+        [
+            ("gzip", gzip.compress if sys.version_info >= (3,) else None),
+            ("deflate", zlib.compress),
+            ("deflate", lambda d: zlib.compress(d)[2:-4]),
+            ("identity", lambda d: d),
+        ],
+    )
+    def test_chunked(self, encoding, compress):
+        if compress is None:
+            pytest.skip("gzip.compress requires python 3")
+        data = b'{"result": [{"a": "b"}]}' * 100
+        compressed = compress(data)
+        decompressor = client.Decompressor(encoding)
+
+        chunks = [
+            decompressor.decompress(compressed[i : i + 10])
+            for i in range(0, len(compressed), 10)
+        ]
+
+        assert b"".join(chunks) + decompressor.flush() == data
+
+    def test_invalid(self):
+        decompressor = client.Decompressor("gzip")
+
+        with pytest.raises(errors.ServiceNowError, match="decompress"):
+            decompressor.decompress(b"not gzip data")
+
+
+class TestStreamingResponse:
+    def test_iter_records(self, mocker):
+        data = b'{"result": [{"a": 1}, {"a": 2}]}'
+        raw_resp = io.BytesIO(zlib.compress(data))
+        record = mocker.Mock()
+        resp = client.StreamingResponse(
+            200,
+            raw_resp,
+            [("Content-Encoding", "deflate")],
+            record=record,
+        )
+        resp.chunk_size = 4
+
+        assert list(resp.iter_records()) == [dict(a=1), dict(a=2)]
+        assert raw_resp.closed
+        record.assert_called_once()
+        received, decoded, _elapsed = record.call_args[0]
+        assert received == len(zlib.compress(data))
+        assert decoded == len(data)
+
+    def test_iter_records_hook(self):
+        resp = client.StreamingResponse(
+            200, io.BytesIO(b'{"result": [{"a": 1}]}'), json_decoder_hook=len
+        )
+
+        assert list(resp.iter_records()) == [1]
+
+    def test_iter_records_invalid_json(self):
+        resp = client.StreamingResponse(200, io.BytesIO(b'{"result": [{"a"'))
+
+        with pytest.raises(errors.ServiceNowError, match="invalid JSON"):
+            list(resp.iter_records())
+
+    def test_json(self):
+        resp = client.StreamingResponse(200, io.BytesIO(b'{"result": {"a": 1}}'))
+
+        assert resp.json == dict(result=dict(a=1))
+        assert resp.data == b'{"result": {"a": 1}}'
+
+    def test_body_can_be_consumed_once(self):
+        resp = client.StreamingResponse(200, io.BytesIO(b'{"result": []}'))
+        list(resp.iter_records())
+
+        with pytest.raises(errors.ServiceNowError, match="consumed"):
+            list(resp.iter_records())
+
+
+class TestClientGetStream:
+    def test_ok(self, mocker):
+        raw_resp = mocker.MagicMock(status=200, headers={})
+        raw_resp.read.side_effect = [b'{"result": [', b'{"a": 1}]}', b""]
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.return_value = raw_resp
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.get_stream("api/now/table/incident", query=dict(a="b"))
+
+        assert isinstance(resp, client.StreamingResponse)
+        raw_resp.read.assert_not_called()
+        assert list(resp.iter_records()) == [dict(a=1)]
+        assert request_mock.open.call_args.args[1] == (
+            "https://instance.com/api/now/table/incident?a=b"
+        )
+
+    def test_not_found(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = HTTPError(
+            "", 404, "Not Found", {}, io.BytesIO(b'{"error": {}}')
+        )
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.get_stream("api/now/table/incident")
+
+        assert isinstance(resp, client.Response)
+        assert resp.json == dict(error=dict())
+
+    def test_error(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = HTTPError(
+            "", 500, "Error", {}, io.BytesIO(b"Boom")
+        )
+
+        c = client.Client("https://instance.com", "user", "pass")
+        with pytest.raises(errors.UnexpectedAPIResponse, match="Boom"):
+            c.get_stream("api/now/table/incident")
+
+
 class TestClientGet:
     def test_ok(self, mocker):
         c = client.Client("https://instance.com", "user", "pass")
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+from ansible.module_utils.six.moves import http_client
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    client,
+    connection_pool,
+    errors,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def raw_response(mocker, status=200, body=b"{}", will_close=False):
+    raw = mocker.Mock()
+    raw.status = status
+    raw.reason = "OK"
+    raw.msg = {"Content-type": "application/json"}
+    raw.will_close = will_close
+    raw.read.return_value = body
+    raw.isclosed.return_value = True
+    return raw
+
+
+@pytest.fixture
+def connection_class(mocker):
+    mocker.patch.object(connection_pool, "getproxies", return_value={})
+    return mocker.patch.object(connection_pool.http_client, "HTTPConnection")
+
+
+class TestConnectionPoolOpen:
+    def test_request_target(self, mocker, connection_class):
+        conn = connection_class.return_value
+        conn.getresponse.return_value = raw_response(mocker)
+        pool = connection_pool.ConnectionPool()
+
+        pool.open("GET", "http://instance.com/api/now/table/incident?a=b")
+
+        connection_class.assert_called_once_with("instance.com", None, timeout=None)
+        conn.request.assert_called_once_with(
+            "GET",
+            "/api/now/table/incident?a=b",
+            body=None,
+            headers={"User-agent": "ansible-httpget"},
+        )
+
+    def test_connection_is_reused(self, mocker, connection_class):
+        conn = connection_class.return_value
+        conn.getresponse.side_effect = [raw_response(mocker), raw_response(mocker)]
+        pool = connection_pool.ConnectionPool()
+
+        pool.open("GET", "http://instance.com/a").read()
+        pool.open("GET", "http://instance.com/b").read()
+
+        assert connection_class.call_count == 1
+        assert conn.request.call_count == 2
+
+    def test_connection_not_reused_before_body_is_read(self, mocker, connection_class):
+        connection_class.return_value.getresponse.return_value = raw_response(mocker)
+        pool = connection_pool.ConnectionPool()
+
+        pool.open("GET", "http://instance.com/a")
+        pool.open("GET", "http://instance.com/b")
+
+        assert connection_class.call_count == 2
+
+    def test_connection_closed_by_server(self, mocker, connection_class):
+        conn = connection_class.return_value
+        conn.getresponse.return_value = raw_response(mocker, will_close=True)
+        pool = connection_pool.ConnectionPool()
+
+        pool.open("GET", "http://instance.com/a").read()
+
+        conn.close.assert_called_once()
+        assert pool.get(("http", "instance.com", None))[1] is False
+
+    def test_stale_connection_is_replaced(self, mocker, connection_class):
+        stale, fresh = mocker.Mock(), mocker.Mock()
+        connection_class.side_effect = [stale, fresh]
+        stale.getresponse.side_effect = [
+            raw_response(mocker),
+            http_client.BadStatusLine("closed"),
+        ]
+        fresh.getresponse.return_value = raw_response(mocker, body=b"fresh")
+        pool = connection_pool.ConnectionPool()
+
+        pool.open("GET", "http://instance.com/a").read()
+        resp = pool.open("GET", "http://instance.com/b")
+
+        stale.close.assert_called_once()
+        assert resp.read() == b"fresh"
+
+    def test_fresh_connection_failure(self, mocker, connection_class):
+        connection_class.return_value.getresponse.side_effect = (
+            http_client.BadStatusLine("closed")
+        )
+        pool = connection_pool.ConnectionPool()
+
+        with pytest.raises(URLError):
+            pool.open("GET", "http://instance.com/a")
+
+    def test_http_error(self, mocker, connection_class):
+        connection_class.return_value.getresponse.return_value = raw_response(
+            mocker, status=404, body=b"Not found"
+        )
+        pool = connection_pool.ConnectionPool()
+
+        with pytest.raises(HTTPError) as exc:
+            pool.open("GET", "http://instance.com/a")
+
+        assert exc.value.code == 404
+        assert exc.value.read() == b"Not found"
+
+
+class TestConnectionPoolIdle:
+    def test_pool_size_is_capped(self, mocker):
+        pool = connection_pool.ConnectionPool(maxsize=1)
+        first, second = mocker.Mock(), mocker.Mock()
+
+        pool.put("key", first)
+        pool.put("key", second)
+
+        first.close.assert_not_called()
+        second.close.assert_called_once()
+
+    def test_idle_connections_expire(self, mocker, connection_class):
+        pool = connection_pool.ConnectionPool(idle_timeout=10)
+        idle = mocker.Mock()
+        time_mock = mocker.patch.object(connection_pool.time, "time")
+
+        time_mock.return_value = 100
+        pool.put(("http", "instance.com", None), idle)
+        time_mock.return_value = 111
+        conn, reused = pool.get(("http", "instance.com", None))
+
+        idle.close.assert_called_once()
+        assert conn == connection_class.return_value
+        assert reused is False
+
+    def test_expired_connections_are_pruned(self, mocker):
+        # Connections of other hosts and older connections behind the newest
+        # one are closed too, not only the ones a checkout reaches.
+        pool = connection_pool.ConnectionPool(idle_timeout=10)
+        old, other, fresh = mocker.Mock(), mocker.Mock(), mocker.Mock()
+        time_mock = mocker.patch.object(connection_pool.time, "time")
+
+        time_mock.return_value = 100
+        pool.put("key", old)
+        pool.put("other", other)
+        time_mock.return_value = 105
+        pool.put("key", fresh)
+        time_mock.return_value = 112
+        conn, reused = pool.get("key")
+
+        assert conn is fresh
+        assert reused is True
+        old.close.assert_called_once()
+        other.close.assert_called_once()
+        fresh.close.assert_not_called()
+
+    def test_close(self, mocker):
+        pool = connection_pool.ConnectionPool()
+        idle = mocker.Mock()
+        pool.put("key", idle)
+
+        pool.close()
+
+        idle.close.assert_called_once()
+
+
+class TestClientKeepAlive:
+    def test_auth_error_releases_connection(self, mocker, connection_class):
+        conn = connection_class.return_value
+        raw = raw_response(mocker, status=401, body=b"Unauthorized")
+        raw.isclosed.return_value = False
+        conn.getresponse.return_value = raw
+        c = client.Client("http://instance.com", "user", "pass", keep_alive=True)
+
+        with pytest.raises(errors.AuthError):
+            c.get("api/now/table/incident")
+
+        conn.close.assert_called_once()
+
+    def test_default_transport(self):
+        c = client.Client("https://instance.com", "user", "pass")
+
+        assert not isinstance(c._client, connection_pool.ConnectionPool)
+
+    def test_keep_alive_transport(self, mocker, connection_class):
+        connection_class.return_value.getresponse.return_value = raw_response(
+            mocker, body=b'{"result": []}'
+        )
+        c = client.Client(
+            "http://instance.com",
+            "user",
+            "pass",
+            keep_alive=True,
+            pool_size=3,
+        )
+
+        resp = c.get("api/now/table/incident")
+
+        assert c._client.maxsize == 3
+        assert resp.json == {"result": []}
+        assert connection_class.call_count == 1
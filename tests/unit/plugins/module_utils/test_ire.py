@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import errors, ire
+from ansible_collections.servicenow.itsm.plugins.module_utils.client import Response
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestChunkItems:
+    def test_no_relations(self):
+        assert [[0, 1], [2, 3], [4]] == ire.chunk_items(5, None, 2)
+
+    def test_related_items_stay_together(self):
+        relations = [dict(parent=0, child=3), dict(parent=3, child=4)]
+
+        chunks = ire.chunk_items(6, relations, 3)
+
+        assert [[0, 3, 4], [1, 2, 5]] == chunks
+
+    def test_large_group(self):
+        relations = [dict(parent=i, child=i + 1) for i in range(3)]
+
+        chunks = ire.chunk_items(5, relations, 2)
+
+        assert [[0, 1, 2, 3], [4]] == chunks
+
+
+class TestIREItem:
+    def test_changed(self):
+        assert ire.IREItem(dict(operation="INSERT", sysId="1")).changed is True
+        assert ire.IREItem(dict(operation="UPDATE", sysId="1")).changed is True
+        assert ire.IREItem(dict(operation="NO_CHANGE", sysId="1")).changed is False
+
+    def test_error(self):
+        item = ire.IREItem(
+            dict(
+                operation="NO_CHANGE",
+                errors=[dict(error="MISSING_MATCHING_ATTRIBUTES", message="No name")],
+            )
+        )
+
+        assert item.changed is False
+        assert item.sys_id is None
+        assert "MISSING_MATCHING_ATTRIBUTES: No name" == item.error
+
+
+class TestIREClientIdentifyReconcile:
+    def test_path(self, client):
+        i = ire.IREClient(client)
+
+        assert "api/now/identifyreconcile" == i.path()
+        assert "api/now/identifyreconcile/query" == i.path(dry_run=True)
+
+    def test_identify_reconcile(self, client):
+        client.post.return_value = Response(
+            200,
+            json.dumps(
+                dict(
+                    result=dict(
+                        items=[
+                            dict(
+                                className="cmdb_ci_server",
+                                operation="INSERT",
+                                sysId="1",
+                            ),
+                            dict(
+                                className="cmdb_ci_server",
+                                operation="NO_CHANGE",
+                                sysId="2",
+                            ),
+                        ],
+                        relations=[],
+                    )
+                )
+            ),
+        )
+        i = ire.IREClient(client, "SG-AWS")
+
+        outputs = i.identify_reconcile(
+            "cmdb_ci_server",
+            [dict(name="a"), dict(name="b")],
+            [dict(parent=0, child=1, type="Depends on::Used by")],
+        )
+
+        assert ["1", "2"] == [o.sys_id for o in outputs]
+        assert [True, False] == [o.changed for o in outputs]
+        client.post.assert_called_once_with(
+            "api/now/identifyreconcile",
+            dict(
+                items=[
+                    dict(className="cmdb_ci_server", values=dict(name="a")),
+                    dict(className="cmdb_ci_server", values=dict(name="b")),
+                ],
+                relations=[dict(parent=0, child=1, type="Depends on::Used by")],
+            ),
+            query=dict(sysparm_data_source="SG-AWS"),
+        )
+
+    def test_dry_run(self, client):
+        client.post.return_value = Response(
+            200,
+            json.dumps(
+                dict(
+                    result=json.dumps(
+                        dict(
+                            items=[dict(className="cmdb_ci_server", operation="INSERT")]
+                        )
+                    )
+                )
+            ),
+        )
+        i = ire.IREClient(client)
+
+        outputs = i.identify_reconcile("cmdb_ci_server", [dict(name="a")], dry_run=True)
+
+        assert "INSERT" == outputs[0].operation
+        client.post.assert_called_once_with(
+            "api/now/identifyreconcile/query",
+            dict(
+                items=[dict(className="cmdb_ci_server", values=dict(name="a"))],
+                relations=[],
+            ),
+            query=dict(sysparm_data_source="ServiceNow"),
+        )
+
+    def test_missing_outputs(self, client):
+        client.post.return_value = Response(200, '{"result": {"items": []}}')
+        i = ire.IREClient(client)
+
+        with pytest.raises(errors.ServiceNowError, match="0 items for 1 inputs"):
+            i.identify_reconcile("cmdb_ci_server", [dict(name="a")])
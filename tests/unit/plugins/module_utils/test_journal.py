@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import errors, journal
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+RECORD = dict(sys_id="1", sys_updated_on="2026-10-17 10:00:00", sys_mod_count="3")
+
+
+class TestPayloadHash:
+    def test_key_order(self):
+        assert journal.payload_hash(dict(a="1", b="2")) == journal.payload_hash(
+            dict(b="2", a="1")
+        )
+
+    def test_values(self):
+        assert journal.payload_hash(dict(a="1")) != journal.payload_hash(dict(a="2"))
+
+
+class TestJournal:
+    def test_record_and_load(self, tmp_path):
+        path = str(tmp_path / "sub" / "journal")
+        key = journal.entry_key("cmdb_ci_server", ["name"], ["a"])
+
+        with journal.Journal(path) as j:
+            assert j.active
+            assert j.get(key) is None
+            j.record(key, "hash", dict(RECORD, name="a"))
+
+        with journal.Journal(path) as j:
+            assert dict(
+                hash="hash",
+                sys_id="1",
+                sys_updated_on="2026-10-17 10:00:00",
+                sys_mod_count="3",
+            ) == j.get(key)
+
+    def test_later_entries_win(self, tmp_path):
+        path = str(tmp_path / "journal")
+
+        with journal.Journal(path) as j:
+            j.record("k", "old", RECORD)
+            j.record("k", "new", RECORD)
+
+        with journal.Journal(path) as j:
+            assert "new" == j.get("k")["hash"]
+
+    def test_partial_line(self, tmp_path):
+        path = tmp_path / "journal"
+        with journal.Journal(str(path)) as j:
+            j.record("a", "hash", RECORD)
+        with open(str(path), "ab") as f:
+            f.write(b'{"key": "b", "ha')
+
+        with journal.Journal(str(path)) as j:
+            assert ["a"] == list(j.entries)
+            j.record("c", "hash", RECORD)
+
+        with journal.Journal(str(path)) as j:
+            assert ["a", "c"] == sorted(j.entries)
+
+    def test_compaction(self, tmp_path):
+        path = tmp_path / "journal"
+        with journal.Journal(str(path)) as j:
+            for i in range(10):
+                j.record("k", str(i), RECORD)
+
+        with journal.Journal(str(path)) as j:
+            assert "9" == j.get("k")["hash"]
+
+        assert 2 == len(path.read_bytes().splitlines())
+
+    def test_foreign_file(self, tmp_path):
+        path = tmp_path / "journal"
+        path.write_text("127.0.0.1 localhost\n")
+
+        with pytest.raises(errors.ServiceNowError, match="is not a version 1 journal"):
+            with journal.Journal(str(path)):
+                pass
+
+    def test_locked(self, tmp_path):
+        path = str(tmp_path / "journal")
+        with journal.Journal(path) as j:
+            j.record("a", "hash", RECORD)
+
+            with journal.Journal(path) as other:
+                assert not other.active
+                assert other.get("a") is None
+                other.record("b", "hash", RECORD)
+
+        with journal.Journal(path) as j:
+            assert ["a"] == list(j.entries)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import json_stream
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def split(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestIterArray:
+    BODY = json.dumps(
+        {
+            "result": [
+                {"sys_id": "1", "name": "café", "cpu": 12345},
+                {"sys_id": "2", "tags": [1, 2.5, True, None], "nested": {"a": "]}"}},
+            ],
+            "x": -1e3,
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+    def test_chunk_boundaries(self, size):
+        records = list(json_stream.iter_array(split(self.BODY, size)))
+
+        assert records == json.loads(self.BODY.decode("utf-8"))["result"]
+
+    def test_members_around_result(self):
+        body = b'{"a": 12, "result": [1, 2], "b": {"c": [3]}}'
+
+        assert list(json_stream.iter_array(split(body, 5))) == [1, 2]
+
+    def test_empty_array(self):
+        assert list(json_stream.iter_array([b' { "result" : [ ] } '])) == []
+
+    def test_object_hook(self):
+        body = b'{"result": [{"a": "b"}]}'
+
+        records = list(json_stream.iter_array([body], object_hook=lambda o: len(o)))
+
+        assert records == [1]
+
+    def test_custom_key(self):
+        body = b'{"records": [1]}'
+
+        assert list(json_stream.iter_array([body], key="records")) == [1]
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b"",
+            b"[]",
+            b'{"result": [1, 2',
+            b'{"result": [1 2]}',
+            b'{"result": {}}',
+            b'{"result": []} x',
+            b'{"error": {"message": "Oops"}}',
+            b'{"result": ["\xc3"]}',
+        ],
+    )
+    def test_invalid(self, body):
+        with pytest.raises(ValueError):
+            list(json_stream.iter_array(split(body, 3)))
+
+    def test_yields_before_stream_ends(self):
+        def chunks():
+            yield b'{"result": [{"a": 1},'
+            raise AssertionError("Read more than necessary")
+
+        assert next(json_stream.iter_array(chunks())) == {"a": 1}
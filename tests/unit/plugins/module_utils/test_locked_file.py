@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import locked_file
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestParseLine:
+    def test_complete(self):
+        assert dict(a=1) == locked_file.parse_line(b'{"a": 1}\n')
+
+    @pytest.mark.parametrize("line", [b'{"a": 1}', b'{"a": \n', b""])
+    def test_incomplete(self, line):
+        assert locked_file.parse_line(line) is None
+
+
+class TestLockedFile:
+    def read(self, f):
+        with open(f.path, "rb") as fd:
+            fd.readline()
+            return list(f._entries(fd))
+
+    def test_append_drops_partial_line(self, tmp_path):
+        path = tmp_path / "file.jsonl"
+        path.write_bytes(b'{"v": 1}\n{"a": 1}\n{"a": 2')
+
+        with locked_file.LockedFile(str(path)) as f:
+            assert [dict(a=1)] == self.read(f)
+            f._append(dict(v=1))
+            f._file.write(locked_file.dump_line(dict(a=3)))
+
+        assert b'{"v": 1}\n{"a": 1}\n{"a": 3}\n' == path.read_bytes()
+
+    def test_append_starts_over(self, tmp_path):
+        path = tmp_path / "sub" / "file.jsonl"
+
+        with locked_file.LockedFile(str(path)) as f:
+            f._append(dict(v=1))
+
+        assert b'{"v": 1}\n' == path.read_bytes()
+
+    def test_locked(self, tmp_path):
+        path = str(tmp_path / "file.jsonl")
+
+        with locked_file.LockedFile(path) as f:
+            assert f.active
+            with locked_file.LockedFile(path) as other:
+                assert not other.active
+
+        with locked_file.LockedFile(path) as f:
+            assert f.active
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import retry
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestRetryPolicyShouldRetry:
+    @pytest.mark.parametrize(
+        "method,status,attempt,expected",
+        [
+            ("GET", 429, 0, True),
+            ("get", 503, 2, True),
+            ("DELETE", 504, 0, True),
+            ("GET", 429, 3, False),
+            ("GET", 500, 0, False),
+            ("GET", 404, 0, False),
+            ("POST", 429, 0, False),
+            ("PATCH", 503, 0, False),
+        ],
+    )
+    def test_default_policy(self, method, status, attempt, expected):
+        assert retry.RetryPolicy().should_retry(method, status, attempt) is expected
+
+    def test_post_retries(self):
+        policy = retry.RetryPolicy(methods=["GET", "POST"])
+
+        assert policy.should_retry("POST", 429, 0) is True
+
+    def test_disabled(self):
+        assert retry.RetryPolicy(retries=0).should_retry("GET", 429, 0) is False
+
+
+class TestRetryPolicyDelay:
+    def test_retry_after_seconds(self):
+        assert retry.RetryPolicy().delay(0, {"retry-after": "7"}) == 7
+
+    def test_retry_after_date(self, mocker):
+        mocker.patch.object(retry.time, "time", return_value=784198167)
+
+        delay = retry.RetryPolicy().delay(
+            0, {"retry-after": "Fri, 07 Nov 1994 08:49:37 GMT"}
+        )
+
+        assert delay == 10
+
+    def test_rate_limit_reset_timestamp(self, mocker):
+        mocker.patch.object(retry.time, "time", return_value=1700000000)
+
+        delay = retry.RetryPolicy().delay(0, {"x-ratelimit-reset": "1700000012"})
+
+        assert delay == 12
+
+    def test_rate_limit_reset_in_the_past(self, mocker):
+        mocker.patch.object(retry.time, "time", return_value=1700000000)
+
+        delay = retry.RetryPolicy().delay(0, {"x-ratelimit-reset": "1600000000"})
+
+        assert delay == 0
+
+    def test_retry_after_takes_precedence(self):
+        delay = retry.RetryPolicy().delay(
+            0, {"retry-after": "3", "x-ratelimit-reset": "9"}
+        )
+
+        assert delay == 3
+
+    @pytest.mark.parametrize("attempt,limit", [(0, 0.5), (1, 1), (3, 4), (10, 30)])
+    def test_backoff(self, attempt, limit):
+        policy = retry.RetryPolicy()
+
+        for _i in range(20):
+            assert 0 <= policy.delay(attempt, {}) <= limit
+
+    def test_invalid_headers(self):
+        policy = retry.RetryPolicy(backoff_factor=0)
+
+        assert policy.delay(0, {"retry-after": "soon"}) == 0
+        assert policy.delay(0, {"x-ratelimit-reset": "soon"}) == 0
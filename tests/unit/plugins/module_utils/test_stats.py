@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import stats
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestEndpoint:
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("https://instance.com", "/"),
+            (
+                "https://instance.com/api/now/table/incident?a=b",
+                "/api/now/table/incident",
+            ),
+            (
+                "https://instance.com/api/now/table/incident/46cebb88a9fe198101aee93734f9768b",
+                "/api/now/table/incident/{sys_id}",
+            ),
+            (
+                "https://instance.com/api/now/attachment/46cebb88a9fe198101aee93734f9768b/file",
+                "/api/now/attachment/{sys_id}/file",
+            ),
+            (
+                "https://instance.com/api/now/table/x46cebb88a9fe198101aee93734f9768b",
+                "/api/now/table/x46cebb88a9fe198101aee93734f9768b",
+            ),
+        ],
+    )
+    def test_endpoint(self, url, expected):
+        assert stats.endpoint(url) == expected
+
+
+class TestAPIStats:
+    def test_summary(self):
+        s = stats.APIStats()
+        s.add(
+            "get", "https://instance.com/api/now/table/incident?a=1", 0, 100, 0.5, 400
+        )
+        s.add("GET", "https://instance.com/api/now/table/incident?a=2", 0, 50, 0.25)
+        s.add_retry("GET", "https://instance.com/api/now/table/incident")
+        s.add("POST", "https://instance.com/oauth_token.do", 20, 30, 0.125)
+        s.add_auth()
+
+        assert s.summary() == dict(
+            requests=3,
+            sent_bytes=20,
+            received_bytes=180,
+            decoded_bytes=480,
+            elapsed=0.875,
+            retries=1,
+            auth_requests=1,
+            endpoints=[
+                dict(
+                    method="GET",
+                    endpoint="/api/now/table/incident",
+                    requests=2,
+                    sent_bytes=0,
+                    received_bytes=150,
+                    decoded_bytes=450,
+                    elapsed=0.75,
+                    retries=1,
+                ),
+                dict(
+                    method="POST",
+                    endpoint="/oauth_token.do",
+                    requests=1,
+                    sent_bytes=20,
+                    received_bytes=30,
+                    decoded_bytes=30,
+                    elapsed=0.125,
+                    retries=0,
+                ),
+            ],
+        )
+
+    def test_empty(self):
+        assert stats.APIStats().summary() == dict(
+            requests=0,
+            sent_bytes=0,
+            received_bytes=0,
+            decoded_bytes=0,
+            elapsed=0,
+            retries=0,
+            auth_requests=0,
+            endpoints=[],
+        )
+
+
+class TestMergeSummaries:
+    def test_merge(self):
+        a = stats.APIStats()
+        a.add("GET", "https://h/api/now/table/incident", 10, 100, 0.5, 300)
+        a.auth_requests = 1
+        b = stats.APIStats()
+        b.add("GET", "https://h/api/now/table/incident", 20, 200, 0.25)
+        b.add("POST", "https://h/api/now/table/incident", 30, 300, 1.0)
+
+        merged = stats.merge_summaries([a.summary(), b.summary()])
+
+        c = stats.APIStats()
+        c.add("GET", "https://h/api/now/table/incident", 10, 100, 0.5, 300)
+        c.add("GET", "https://h/api/now/table/incident", 20, 200, 0.25)
+        c.add("POST", "https://h/api/now/table/incident", 30, 300, 1.0)
+        c.auth_requests = 1
+        assert c.summary() == merged
+
+    def test_empty(self):
+        assert stats.merge_summaries([]) == stats.APIStats().summary()
+
+
+class TestAPIStatsResult:
+    def test_disabled(self, mocker):
+        module = mocker.Mock(params=dict(api_stats=False))
+
+        assert stats.api_stats_result(module, mocker.Mock()) == {}
+
+    def test_enabled(self, mocker):
+        module = mocker.Mock(params=dict(api_stats=True))
+        client = mocker.Mock()
+        client.stats.summary.return_value = dict(requests=1)
+
+        assert stats.api_stats_result(module, client) == dict(
+            api_stats=dict(requests=1)
+        )
@@ -7,11 +7,23 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import io
+import json
+import os
 import sys
+import threading
+import time
 
 import pytest
-from ansible_collections.servicenow.itsm.plugins.module_utils import errors, table
-from ansible_collections.servicenow.itsm.plugins.module_utils.client import Response
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    errors,
+    snow,
+    table,
+)
+from ansible_collections.servicenow.itsm.plugins.module_utils.client import (
+    Response,
+    StreamingResponse,
+)
 
 pytestmark = pytest.mark.skipif(
     sys.version_info < (2, 7), reason="requires python2.7 or higher"
@@ -94,6 +106,585 @@ class TestTableListRecords:
         )
 
 
+class TestTableListRecordsStream:
+    @staticmethod
+    def page(body, total):
+        return StreamingResponse(
+            200, io.BytesIO(body.encode("utf-8")), {"X-Total-Count": total}
+        )
+
+    def test_pagination(self, client):
+        client.get_stream.side_effect = (
+            self.page('{"result": [{"a": 3, "b": "sys_id"}]}', "2"),
+            self.page('{"result": [{"a": 2, "b": "sys_ie"}]}', "2"),
+        )
+        t = table.TableClient(client, batch_size=1, stream=True)
+
+        records = t.list_records("my_table")
+
+        assert [dict(a=3, b="sys_id"), dict(a=2, b="sys_ie")] == records
+        client.get.assert_not_called()
+        assert 2 == len(client.get_stream.mock_calls)
+        client.get_stream.assert_called_with(
+            "api/now/table/my_table",
+            query=dict(
+                sysparm_exclude_reference_link="true",
+                sysparm_limit=1,
+                sysparm_offset=1,
+            ),
+        )
+
+    def test_not_found(self, client):
+        client.get_stream.return_value = Response(404, '{"result": []}')
+        t = table.TableClient(client, stream=True)
+
+        assert [] == t.list_records("my_table")
+
+
+class TestTableListRecordsParallel:
+    @staticmethod
+    def pages(total):
+        def get(path, query):
+            offset = query["sysparm_offset"]
+            result = [dict(n=n) for n in range(offset, min(offset + 2, total))]
+            return Response(
+                200, json.dumps(dict(result=result)), {"X-Total-Count": str(total)}
+            )
+
+        return get
+
+    def test_ordered(self, client):
+        client.get.side_effect = self.pages(9)
+        t = table.TableClient(client, batch_size=2, page_workers=3)
+
+        records = t.list_records("my_table")
+
+        assert [dict(n=n) for n in range(9)] == records
+        assert 5 == len(client.get.mock_calls)
+        client.get.assert_any_call(
+            "api/now/table/my_table",
+            query=dict(
+                sysparm_exclude_reference_link="true",
+                sysparm_limit=2,
+                sysparm_offset=8,
+            ),
+        )
+
+    def test_error(self, client):
+        get = self.pages(9)
+
+        def failing_get(path, query):
+            if query["sysparm_offset"] == 4:
+                raise errors.UnexpectedAPIResponse(500, "Oops")
+            return get(path, query)
+
+        client.get.side_effect = failing_get
+        t = table.TableClient(client, batch_size=2, page_workers=3)
+
+        with pytest.raises(errors.UnexpectedAPIResponse, match="Oops"):
+            t.list_records("my_table")
+
+
+class TestOrderedMap:
+    def test_order(self):
+        def slow_for_low(i):
+            time.sleep(0.01 * (5 - i))
+            return i * 2
+
+        assert [0, 2, 4, 6, 8] == list(snow.ordered_map(slow_for_low, range(5), 3))
+
+    def test_fixed_pool(self):
+        threads = set()
+
+        def record_thread(i):
+            threads.add(threading.current_thread())
+            return i
+
+        assert list(range(100)) == list(snow.ordered_map(record_thread, range(100), 4))
+        assert len(threads) <= 4
+        assert not any(t.is_alive() for t in threads)
+
+    def test_error(self):
+        def fail_on_two(i):
+            if i == 2:
+                raise errors.ServiceNowError("two")
+            return i
+
+        results = snow.ordered_map(fail_on_two, range(5), 2)
+
+        assert [0, 1] == [next(results), next(results)]
+        with pytest.raises(errors.ServiceNowError, match="two"):
+            next(results)
+
+
+class TestAndQuery:
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            (None, "a=1"),
+            ("b=2", "b=2^a=1"),
+            ("b=2^ORc=3^NQd=4", "b=2^ORc=3^a=1^NQd=4^a=1"),
+        ],
+    )
+    def test_query(self, query, expected):
+        assert expected == snow.and_query(query, "a=1")
+
+
+class TestKeysetQuery:
+    @pytest.mark.parametrize(
+        "query,last,expected",
+        [
+            (None, None, "ORDERBYsys_id"),
+            (None, "abc", "sys_id>abc^ORDERBYsys_id"),
+            ("active=true", None, "active=true^ORDERBYsys_id"),
+            ("active=true", "abc", "active=true^sys_id>abc^ORDERBYsys_id"),
+            (
+                "a=1^ORb=2^NQc=3",
+                "abc",
+                "a=1^ORb=2^sys_id>abc^NQc=3^sys_id>abc^ORDERBYsys_id",
+            ),
+        ],
+    )
+    def test_query(self, query, last, expected):
+        assert expected == snow.keyset_query(query, last)
+
+    def test_order_by(self):
+        with pytest.raises(errors.ServiceNowError, match="ORDERBY"):
+            snow.keyset_query("active=true^ORDERBYname")
+
+
+class TestTableListRecordsKeyset:
+    def test_pagination(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"sys_id": "a"}, {"sys_id": "b"}]}'),
+            Response(200, '{"result": [{"sys_id": "c"}]}'),
+            Response(200, '{"result": []}'),
+        )
+        t = table.TableClient(client, batch_size=2, pagination="keyset")
+
+        records = t.list_records("my_table", dict(sysparm_query="active=true"))
+
+        assert [dict(sys_id="a"), dict(sys_id="b"), dict(sys_id="c")] == records
+        assert [
+            "active=true^ORDERBYsys_id",
+            "active=true^sys_id>b^ORDERBYsys_id",
+            "active=true^sys_id>c^ORDERBYsys_id",
+        ] == [c.kwargs["query"]["sysparm_query"] for c in client.get.mock_calls]
+        client.get.assert_any_call(
+            "api/now/table/my_table",
+            query=dict(
+                sysparm_exclude_reference_link="true",
+                sysparm_limit=2,
+                sysparm_no_count="true",
+                sysparm_query="active=true^sys_id>b^ORDERBYsys_id",
+            ),
+        )
+
+    def test_fields_without_sys_id(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"sys_id": "a", "name": "x"}]}'),
+            Response(200, '{"result": []}'),
+        )
+        t = table.TableClient(client, batch_size=1, pagination="keyset")
+
+        records = t.list_records("my_table", dict(sysparm_fields="name"))
+
+        assert [dict(name="x")] == records
+        assert "name,sys_id" == client.get.call_args.kwargs["query"]["sysparm_fields"]
+        assert (
+            "sys_id>a^ORDERBYsys_id"
+            == client.get.call_args.kwargs["query"]["sysparm_query"]
+        )
+
+    def test_display_value_all(self, client):
+        client.get.side_effect = (
+            Response(
+                200, '{"result": [{"sys_id": {"value": "a", "display_value": "a"}}]}'
+            ),
+            Response(200, '{"result": []}'),
+        )
+        t = table.TableClient(client, batch_size=1, pagination="keyset")
+
+        t.list_records("my_table", dict(sysparm_display_value="all"))
+
+        assert (
+            "sys_id>a^ORDERBYsys_id"
+            == client.get.call_args.kwargs["query"]["sysparm_query"]
+        )
+
+    def test_order_by(self, client):
+        t = table.TableClient(client, pagination="keyset")
+
+        with pytest.raises(errors.ServiceNowError, match="ORDERBY"):
+            t.iter_records("my_table", dict(sysparm_query="ORDERBYname"))
+        client.get.assert_not_called()
+
+
+class TestTableListRecordsCount:
+    def test_count_first_page_only(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 1}]}', {"X-Total-Count": "2"}),
+            Response(200, '{"result": [{"a": 2}]}'),
+        )
+        t = table.TableClient(client, batch_size=1, count_strategy="first")
+
+        records = t.list_records("my_table")
+
+        assert [dict(a=1), dict(a=2)] == records
+        first, second = client.get.mock_calls
+        assert "sysparm_no_count" not in first.kwargs["query"]
+        assert "true" == second.kwargs["query"]["sysparm_no_count"]
+
+    def test_never_count_stops_at_empty_page(self, client):
+        # ACLs can make a page short, so only an empty page ends the pull.
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 1}]}'),
+            Response(200, '{"result": [{"a": 3}]}'),
+            Response(200, '{"result": []}'),
+        )
+        t = table.TableClient(client, batch_size=2, count_strategy="never")
+
+        records = t.list_records("my_table")
+
+        assert [dict(a=1), dict(a=3)] == records
+        assert 3 == len(client.get.mock_calls)
+        client.get.assert_called_with(
+            "api/now/table/my_table",
+            query=dict(
+                sysparm_exclude_reference_link="true",
+                sysparm_limit=2,
+                sysparm_offset=4,
+                sysparm_no_count="true",
+            ),
+        )
+
+    def test_no_count_in_query(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 1}]}'),
+            Response(200, '{"result": []}'),
+        )
+        t = table.TableClient(client, batch_size=2)
+
+        records = t.list_records("my_table", dict(sysparm_no_count="true"))
+
+        assert [dict(a=1)] == records
+        assert 2 == len(client.get.mock_calls)
+
+    def test_follow_link(self, client):
+        client.get.side_effect = (
+            Response(
+                200,
+                '{"result": [{"a": 1}]}',
+                {
+                    "Link": '<https://my.host/api/now/table/my_table?sysparm_offset=0>;rel="first",'
+                    '<https://my.host/api/now/table/my_table?sysparm_limit=1&sysparm_offset=1>;rel="next"'
+                },
+            ),
+            Response(
+                200,
+                '{"result": [{"a": 2}]}',
+                {
+                    "Link": '<https://my.host/api/now/table/my_table?sysparm_offset=0>;rel="first"'
+                },
+            ),
+        )
+        t = table.TableClient(client, batch_size=1, count_strategy="never")
+
+        records = t.list_records("my_table")
+
+        assert [dict(a=1), dict(a=2)] == records
+        assert 1 == client.get.mock_calls[1].kwargs["query"]["sysparm_offset"]
+
+
+class TestPageSizer:
+    def test_grows_towards_target_time(self):
+        sizer = snow.PageSizer(100, target_time=5.0)
+
+        sizer.update(100, 1.0, 1000)
+
+        # 500 records would take 5 s, but the size at most doubles per page.
+        assert 200 == sizer.size
+
+    def test_shrinks_towards_target_bytes(self):
+        sizer = snow.PageSizer(1000, target_time=5.0, target_bytes=300000)
+
+        sizer.update(1000, 1.0, 1000000)
+
+        assert 500 == sizer.size
+
+    def test_stays_within_bounds(self):
+        sizer = snow.PageSizer(1000, minimum=800, maximum=1500)
+
+        sizer.update(1000, 0.1, 1000)
+        assert 1500 == sizer.size
+        sizer.update(1500, 100.0, 1000)
+        assert 800 == sizer.size
+
+    def test_empty_page_keeps_size(self):
+        sizer = snow.PageSizer(1000)
+
+        sizer.update(0, 1.0, 20)
+
+        assert 1000 == sizer.size
+        assert 1 == sizer.pages
+
+    def test_shrink(self):
+        sizer = snow.PageSizer(400, minimum=100)
+
+        assert sizer.shrink() is True
+        assert sizer.shrink() is True
+        assert sizer.shrink() is False
+        assert (
+            dict(initial=400, final=100, smallest=100, largest=400, pages=0, timeouts=3)
+            == sizer.summary()
+        )
+
+
+class TestTableListRecordsAdaptive:
+    def test_page_size_follows_sizer(self, client, mocker):
+        mocker.patch.object(
+            snow.time, "time", side_effect=[0, 1, 10, 11, 20, 21, 30, 31]
+        )
+        client.get.side_effect = (
+            Response(200, json.dumps(dict(result=[{"a": 1}] * 100))),
+            Response(200, json.dumps(dict(result=[{"a": 1}] * 200))),
+            Response(200, json.dumps(dict(result=[{"a": 1}] * 10))),
+            Response(200, '{"result": []}'),
+        )
+        t = table.TableClient(
+            client,
+            batch_size=100,
+            count_strategy="never",
+            page_sizer=snow.PageSizer(100, minimum=10),
+        )
+
+        records = t.list_records("my_table")
+
+        assert 310 == len(records)
+        queries = [c.kwargs["query"] for c in client.get.mock_calls]
+        assert [100, 200, 400, 200] == [q["sysparm_limit"] for q in queries]
+        assert [0, 100, 300, 700] == [q["sysparm_offset"] for q in queries]
+
+    def test_timeout_retries_with_smaller_page(self, client):
+        client.get.side_effect = (
+            errors.RequestTimeout("timed out"),
+            Response(200, '{"result": [{"a": 1}]}', {"X-Total-Count": "1"}),
+        )
+        sizer = snow.PageSizer(1000, minimum=100)
+        t = table.TableClient(client, page_sizer=sizer)
+
+        assert [dict(a=1)] == t.list_records("my_table")
+        first, second = client.get.mock_calls
+        assert 1000 == first.kwargs["query"]["sysparm_limit"]
+        assert 500 == second.kwargs["query"]["sysparm_limit"]
+        assert 0 == second.kwargs["query"]["sysparm_offset"]
+        assert 1 == sizer.timeouts
+
+    def test_timeout_at_minimum(self, client):
+        client.get.side_effect = errors.RequestTimeout("timed out")
+        t = table.TableClient(client, page_sizer=snow.PageSizer(200, minimum=100))
+
+        with pytest.raises(errors.RequestTimeout):
+            t.list_records("my_table")
+        assert 2 == len(client.get.mock_calls)
+
+    def test_keyset(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"sys_id": "1"}, {"sys_id": "2"}]}'),
+            Response(200, '{"result": [{"sys_id": "3"}]}'),
+            Response(200, '{"result": []}'),
+        )
+        t = table.TableClient(
+            client,
+            pagination="keyset",
+            page_sizer=snow.PageSizer(2, minimum=2, maximum=2),
+        )
+
+        records = t.list_records("my_table")
+
+        assert ["1", "2", "3"] == [r["sys_id"] for r in records]
+        assert 3 == len(client.get.mock_calls)
+
+    def test_no_page_workers(self, client):
+        client.get.return_value = Response(
+            200, '{"result": [{"a": 1}]}', {"X-Total-Count": "3"}
+        )
+        t = table.TableClient(
+            client,
+            page_workers=4,
+            page_sizer=snow.PageSizer(1, minimum=1, maximum=1),
+        )
+
+        assert 3 == len(t.list_records("my_table"))
+        offsets = [c.kwargs["query"]["sysparm_offset"] for c in client.get.mock_calls]
+        assert [0, 1, 2] == offsets
+
+
+class TestTableListRecordsCheckpoint:
+    @pytest.fixture
+    def client(self, client):
+        client.host = "https://my.host"
+        client.username = "user"
+        return client
+
+    def test_resume_offset(self, client, tmp_path):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 1}]}', {"X-Total-Count": "3"}),
+            errors.RequestTimeout("timed out"),
+        )
+        t = table.TableClient(client, batch_size=1, checkpoint_dir=str(tmp_path))
+
+        with pytest.raises(errors.RequestTimeout):
+            t.list_records("my_table")
+
+        client.get.reset_mock()
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 2}]}', {"X-Total-Count": "3"}),
+            Response(200, '{"result": [{"a": 3}]}', {"X-Total-Count": "3"}),
+        )
+
+        records = t.list_records("my_table")
+
+        assert [dict(a=1), dict(a=2), dict(a=3)] == records
+        offsets = [c.kwargs["query"]["sysparm_offset"] for c in client.get.mock_calls]
+        assert [1, 2] == offsets
+        # The checkpoint of the completed listing is gone.
+        assert not [f for f in os.listdir(str(tmp_path)) if f.endswith(".jsonl")]
+
+    def test_resume_keyset(self, client, tmp_path):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"sys_id": "1"}, {"sys_id": "2"}]}'),
+            errors.UnexpectedAPIResponse(500, "Oops"),
+        )
+        t = table.TableClient(
+            client, batch_size=2, pagination="keyset", checkpoint_dir=str(tmp_path)
+        )
+
+        with pytest.raises(errors.UnexpectedAPIResponse):
+            t.list_records("my_table")
+
+        client.get.reset_mock()
+        client.get.side_effect = (
+            Response(200, '{"result": [{"sys_id": "3"}]}'),
+            Response(200, '{"result": []}'),
+        )
+
+        records = t.list_records("my_table")
+
+        assert ["1", "2", "3"] == [r["sys_id"] for r in records]
+        first, second = client.get.mock_calls
+        assert "sys_id>2^ORDERBYsys_id" == first.kwargs["query"]["sysparm_query"]
+
+    def test_different_query_starts_over(self, client, tmp_path):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 1}]}', {"X-Total-Count": "2"}),
+            errors.RequestTimeout("timed out"),
+        )
+        t = table.TableClient(client, batch_size=1, checkpoint_dir=str(tmp_path))
+        with pytest.raises(errors.RequestTimeout):
+            t.list_records("my_table", dict(sysparm_query="active=true"))
+
+        client.get.reset_mock()
+        client.get.side_effect = None
+        client.get.return_value = Response(
+            200, '{"result": [{"a": 5}]}', {"X-Total-Count": "1"}
+        )
+
+        assert [dict(a=5)] == t.list_records("my_table")
+        assert 0 == client.get.call_args.kwargs["query"]["sysparm_offset"]
+
+    def test_completed_listing_is_not_resumed(self, client, tmp_path):
+        client.get.return_value = Response(
+            200, '{"result": [{"a": 1}]}', {"X-Total-Count": "1"}
+        )
+        t = table.TableClient(client, checkpoint_dir=str(tmp_path))
+
+        t.list_records("my_table")
+        t.list_records("my_table")
+
+        assert 2 == len(client.get.mock_calls)
+
+
+class TestTableIterRecords:
+    def test_pagination(self, client):
+        client.get.side_effect = (
+            Response(
+                200, '{"result": [{"a": 3, "b": "sys_id"}]}', {"X-Total-Count": "2"}
+            ),
+            Response(
+                200, '{"result": [{"a": 2, "b": "sys_ie"}]}', {"X-Total-Count": "2"}
+            ),
+        )
+        t = table.TableClient(client, batch_size=1)
+
+        records = t.iter_records("my_table", dict(a="b"))
+
+        client.get.assert_not_called()
+        assert [dict(a=3, b="sys_id"), dict(a=2, b="sys_ie")] == list(records)
+        assert 2 == len(client.get.mock_calls)
+        client.get.assert_any_call(
+            "api/now/table/my_table",
+            query=dict(
+                sysparm_exclude_reference_link="true",
+                a="b",
+                sysparm_limit=1,
+                sysparm_offset=1,
+            ),
+        )
+
+    def test_error_is_raised_in_caller(self, client):
+        client.get.side_effect = (
+            Response(
+                200, '{"result": [{"a": 3, "b": "sys_id"}]}', {"X-Total-Count": "2"}
+            ),
+            errors.UnexpectedAPIResponse(500, "Oops"),
+        )
+        t = table.TableClient(client, batch_size=1)
+        records = t.iter_records("my_table")
+
+        assert dict(a=3, b="sys_id") == next(records)
+        with pytest.raises(errors.UnexpectedAPIResponse, match="Oops"):
+            next(records)
+
+    def test_close_stops_prefetching(self, client):
+        client.get.return_value = Response(
+            200, '{"result": [{"a": 3, "b": "sys_id"}]}', {"X-Total-Count": "100"}
+        )
+        t = table.TableClient(client, batch_size=1)
+        records = t.iter_records("my_table")
+
+        next(records)
+        records.close()
+        calls = len(client.get.mock_calls)
+
+        # Current page, one queued page and the one that was being fetched.
+        assert calls <= 3
+        assert calls == len(client.get.mock_calls)
+
+    def test_stream(self, client):
+        client.get_stream.return_value = StreamingResponse(
+            200, io.BytesIO(b'{"result": [{"a": 1}, {"a": 2}]}'), {"X-Total-Count": "2"}
+        )
+        t = table.TableClient(client, stream=True)
+
+        assert [dict(a=1), dict(a=2)] == list(t.iter_records("my_table"))
+        client.get.assert_not_called()
+
+    def test_stream_is_not_read_whole(self, client):
+        body = json.dumps(dict(result=[dict(a=i) for i in range(100)])).encode()
+        raw = io.BytesIO(body)
+        response = StreamingResponse(200, raw, {"X-Total-Count": "100"})
+        response.chunk_size = 16
+        client.get_stream.return_value = response
+        t = table.TableClient(client, batch_size=100, stream=True)
+
+        records = snow._records(t._iter_pages("api/now/table/my_table"))
+
+        assert dict(a=0) == next(records)
+        assert raw.tell() < len(body)
+        assert 99 == len(list(records))
+
+
 class TestTableGetRecord:
     def test_single_match(self, client):
         client.get.return_value = Response(
@@ -141,6 +732,87 @@ class TestTableGetRecord:
             t.get_record("my_table", dict(our="query"), must_exist=True)
 
 
+class TestTableGetRecords:
+    def test_without_batching(self, client):
+        client.get.side_effect = [
+            Response(200, '{"result": [{"sys_id": "1"}]}', {"X-Total-Count": "1"}),
+            Response(200, '{"result": [{"sys_id": "2"}]}', {"X-Total-Count": "1"}),
+        ]
+        t = table.TableClient(client)
+
+        records = t.get_records(
+            [("sys_user", dict(user_name="a")), ("sys_user_group", dict(name="b"))]
+        )
+
+        assert [dict(sys_id="1"), dict(sys_id="2")] == records
+        assert client.get.call_count == 2
+
+    def test_with_batching(self, mocker, client):
+        client.batch_requests = True
+        batch = client.batch.return_value = mocker.MagicMock()
+        batch.__enter__.return_value = batch
+        batch.get.side_effect = [
+            mocker.Mock(
+                response=Response(
+                    200, '{"result": [{"sys_id": "1"}]}', {"X-Total-Count": "1"}
+                )
+            ),
+            mocker.Mock(response=Response(200, '{"result": []}')),
+        ]
+        t = table.TableClient(client)
+
+        records = t.get_records(
+            [("sys_user", dict(user_name="a")), ("sys_user_group", dict(name="b"))]
+        )
+
+        assert [dict(sys_id="1"), None] == records
+        client.get.assert_not_called()
+        batch.get.assert_any_call(
+            "api/now/table/sys_user",
+            dict(
+                user_name="a",
+                sysparm_exclude_reference_link="true",
+                sysparm_limit=2,
+            ),
+        )
+
+    def test_with_batching_multiple_matches(self, mocker, client):
+        client.batch_requests = True
+        batch = client.batch.return_value = mocker.MagicMock()
+        batch.__enter__.return_value = batch
+        batch.get.return_value = mocker.Mock(
+            response=Response(
+                200,
+                '{"result": [{"sys_id": "1"}, {"sys_id": "2"}]}',
+                {"X-Total-Count": "7"},
+            )
+        )
+        t = table.TableClient(client)
+
+        with pytest.raises(errors.ServiceNowError, match="7 api/now/table/sys_user"):
+            t.get_records([("sys_user", dict(user_name="a"))])
+
+    def test_with_batching_must_exist(self, mocker, client):
+        client.batch_requests = True
+        batch = client.batch.return_value = mocker.MagicMock()
+        batch.__enter__.return_value = batch
+        batch.get.return_value = mocker.Mock(response=Response(200, '{"result": []}'))
+        t = table.TableClient(client)
+
+        with pytest.raises(errors.ServiceNowError, match="No api/now/table/sys_user"):
+            t.get_records([("sys_user", dict(user_name="a"))], must_exist=True)
+
+    def test_with_batching_error(self, mocker, client):
+        client.batch_requests = True
+        batch = client.batch.return_value = mocker.MagicMock()
+        batch.__enter__.return_value = batch
+        batch.get.return_value = mocker.Mock(response=Response(403, "Forbidden"))
+        t = table.TableClient(client)
+
+        with pytest.raises(errors.UnexpectedAPIResponse, match="403"):
+            t.get_records([("sys_user", dict(user_name="a"))])
+
+
 class TestTableGetRecordBySysId:
     def test_get_record_by_sys_id(self, client):
         client.get.return_value = Response(
@@ -260,6 +932,32 @@ class TestFindUser:
         assert dict(sys_id="1234", user_name="test") == user
 
 
+class TestFindReferences:
+    def test_find_references(self, table_client):
+        table_client.get_records.return_value = [dict(sys_id="1"), dict(sys_id="2")]
+
+        references = table.find_references(
+            table_client,
+            dict(
+                assigned_to=table.user_lookup("admin"),
+                assignment_group=table.assignment_group_lookup("IT"),
+            ),
+        )
+
+        assert references == dict(assigned_to="1", assignment_group="2")
+        table_client.get_records.assert_called_once_with(
+            [
+                ("sys_user", dict(user_name="admin")),
+                ("sys_user_group", dict(name="IT")),
+            ],
+            must_exist=True,
+        )
+
+    def test_no_references(self, table_client):
+        assert table.find_references(table_client, {}) == {}
+        table_client.get_records.assert_not_called()
+
+
 class TestFindChangeRequest:
     def test_change_request_lookup(self, table_client):
         table_client.get_record.return_value = dict(sys_id="1234", number="TST123")
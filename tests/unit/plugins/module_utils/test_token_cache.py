@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import stat
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import token_cache
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestCacheKey:
+    def test_key_depends_on_all_parts(self):
+        keys = set(
+            [
+                token_cache.cache_key("https://a.com", "id", "password", "user"),
+                token_cache.cache_key("https://b.com", "id", "password", "user"),
+                token_cache.cache_key("https://a.com", "id2", "password", "user"),
+                token_cache.cache_key(
+                    "https://a.com", "id", "client_credentials", None
+                ),
+                token_cache.cache_key("https://a.com", "id", "password", "user2"),
+            ]
+        )
+
+        assert len(keys) == 5
+
+    def test_key_depends_on_secrets(self):
+        keys = set(
+            [
+                token_cache.cache_key("https://a.com", "id", "password", "user"),
+                token_cache.cache_key(
+                    "https://a.com", "id", "password", "user", ("secret", "pass")
+                ),
+                token_cache.cache_key(
+                    "https://a.com", "id", "password", "user", ("secret", "pass2")
+                ),
+                token_cache.cache_key(
+                    "https://a.com", "id", "password", "user", ("secret2", "pass")
+                ),
+            ]
+        )
+
+        assert len(keys) == 4
+
+    def test_trailing_slash_is_ignored(self):
+        assert token_cache.cache_key(
+            "https://a.com/", "id", "password", "user"
+        ) == token_cache.cache_key("https://a.com", "id", "password", "user")
+
+
+class TestTokenCache:
+    def test_missing_file(self, tmp_path):
+        cache = token_cache.TokenCache(str(tmp_path / "tokens.json"))
+
+        assert cache.get("key") is None
+
+    def test_set_get(self, tmp_path):
+        path = tmp_path / "sub" / "tokens.json"
+        cache = token_cache.TokenCache(str(path))
+
+        with cache.locked():
+            cache.set("key", "token", 1800)
+
+        assert cache.get("key") == "token"
+        assert stat.S_IMODE(os.stat(str(path)).st_mode) == 0o600
+
+    def test_token_about_to_expire(self, tmp_path, mocker):
+        cache = token_cache.TokenCache(str(tmp_path / "tokens.json"), 60)
+        time_mock = mocker.patch.object(token_cache.time, "time")
+
+        time_mock.return_value = 1000
+        cache.set("key", "token", 1800)
+        time_mock.return_value = 2739
+        assert cache.get("key") == "token"
+        time_mock.return_value = 2740
+        assert cache.get("key") is None
+
+    def test_expired_tokens_are_pruned(self, tmp_path, mocker):
+        path = tmp_path / "tokens.json"
+        cache = token_cache.TokenCache(str(path))
+        time_mock = mocker.patch.object(token_cache.time, "time")
+
+        time_mock.return_value = 1000
+        cache.set("old", "token", 10)
+        time_mock.return_value = 2000
+        cache.set("new", "token", 10)
+
+        assert list(json.loads(path.read_text())) == ["new"]
+
+    def test_invalidate(self, tmp_path):
+        cache = token_cache.TokenCache(str(tmp_path / "tokens.json"))
+        cache.set("key", "token", 1800)
+
+        cache.invalidate("key")
+
+        assert cache.get("key") is None
+
+    def test_corrupted_file(self, tmp_path):
+        path = tmp_path / "tokens.json"
+        path.write_text("not json")
+        cache = token_cache.TokenCache(str(path))
+
+        assert cache.get("key") is None
+        cache.set("key", "token", 1800)
+        assert cache.get("key") == "token"
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import aggregate, errors
+from ansible_collections.servicenow.itsm.plugins.modules import aggregate_info
+from ansible_collections.servicenow.itsm.tests.unit.plugins.common.utils import (
+    set_module_args,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+@pytest.fixture
+def aggregate_client(mocker):
+    return mocker.Mock(spec=aggregate.AggregateClient)
+
+
+class TestBuildQuery:
+    def test_query(self, create_module):
+        module = create_module(
+            params=dict(
+                query=[dict(active="= true", priority="= 1")], sysparm_query=None
+            )
+        )
+
+        assert "active=true^priority=1" == aggregate_info.build_query(module)
+
+    def test_sysparm_query(self, create_module):
+        module = create_module(params=dict(query=None, sysparm_query="active=true"))
+
+        assert "active=true" == aggregate_info.build_query(module)
+
+    def test_invalid_query(self, create_module):
+        module = create_module(params=dict(query=[dict(active="~ true")]))
+
+        with pytest.raises(errors.ServiceNowError):
+            aggregate_info.build_query(module)
+
+
+class TestRun:
+    def test_run(self, create_module, aggregate_client):
+        module = create_module(
+            params=dict(
+                instance=dict(host="my.host.name", username="user", password="pass"),
+                table="incident",
+                query=None,
+                sysparm_query="active=true",
+                sysparm_display_value="true",
+                count=True,
+                avg=["priority"],
+                sum=None,
+                min=None,
+                max=None,
+                group_by=["assignment_group"],
+                having=None,
+                order_by=["COUNT^DESC"],
+            )
+        )
+        aggregate_client.aggregate.return_value = [
+            dict(group_by=dict(assignment_group="123"), count=3)
+        ]
+
+        result = aggregate_info.run(module, aggregate_client)
+
+        assert [dict(group_by=dict(assignment_group="123"), count=3)] == result
+        aggregate_client.aggregate.assert_called_once_with(
+            "incident",
+            query="active=true",
+            count=True,
+            avg=["priority"],
+            sum=None,
+            min=None,
+            max=None,
+            group_by=["assignment_group"],
+            having=None,
+            order_by=["COUNT^DESC"],
+            display_value="true",
+        )
+
+
+class TestMain:
+    def test_minimal_set_of_params(self, run_main):
+        params = dict(
+            instance=dict(
+                host="https://my.host.name", username="user", password="pass"
+            ),
+            table="incident",
+        )
+
+        with set_module_args(args=params):
+            success, result = run_main(aggregate_info, params)
+
+        assert success is True
+
+    def test_all_params(self, run_main):
+        params = dict(
+            instance=dict(
+                host="https://my.host.name", username="user", password="pass"
+            ),
+            table="incident",
+            sysparm_query="active=true",
+            sysparm_display_value="all",
+            count=False,
+            avg=["priority"],
+            sum=["reassignment_count"],
+            min=["opened_at"],
+            max=["opened_at"],
+            group_by=["assignment_group", "state"],
+            having="count^state^>^1",
+            order_by=["state"],
+        )
+
+        with set_module_args(args=params):
+            success, result = run_main(aggregate_info, params)
+
+        assert success is True
+
+    def test_fail(self, run_main):
+        with set_module_args(args={}):
+            success, result = run_main(aggregate_info)
+
+        assert success is False
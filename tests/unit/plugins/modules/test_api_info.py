@@ -54,6 +54,52 @@ class TestMain:
 
         assert success is True
 
+    def test_api_stats(self, run_main):
+        params = dict(
+            instance=dict(
+                host="https://my.host.name", username="user", password="pass"
+            ),
+            resource="sys_user",
+            api_stats=True,
+        )
+
+        with set_module_args(args=params):
+            success, result = run_main(api_info, params)
+
+        assert success is True
+        assert result["api_stats"]["requests"] == 0
+        assert result["api_stats"]["endpoints"] == []
+
+    def test_no_api_stats(self, run_main):
+        params = dict(
+            instance=dict(
+                host="https://my.host.name", username="user", password="pass"
+            ),
+            resource="sys_user",
+        )
+
+        with set_module_args(args=params):
+            success, result = run_main(api_info, params)
+
+        assert "api_stats" not in result
+
+    def test_adaptive_sysparm_limit(self, run_main):
+        params = dict(
+            instance=dict(
+                host="https://my.host.name", username="user", password="pass"
+            ),
+            resource="sys_user",
+            sysparm_limit=500,
+            adaptive_sysparm_limit=True,
+        )
+
+        with set_module_args(args=params):
+            success, result = run_main(api_info, params)
+
+        assert success is True
+        assert result["page_size"]["initial"] == 500
+        assert result["page_size"]["final"] == 500
+
     def test_fail(self, run_main):
         with set_module_args(args={}):
             success, result = run_main(api_info)
@@ -71,7 +71,7 @@ class TestBuildPayload:
             short_description="Test request",
         )
         # Mock user and group lookups
-        table_client.get_record.side_effect = [
+        table_client.get_records.return_value = [
             {"sys_id": "user1_sys_id"},  # requested_for
             {"sys_id": "user2_sys_id"},  # requested_by
             {"sys_id": "user3_sys_id"},  # assigned_to
@@ -80,6 +80,16 @@ class TestBuildPayload:
 
         result = catalog_request.build_payload(module, table_client)
 
+        table_client.get_records.assert_called_once_with(
+            [
+                ("sys_user", dict(user_name="john.doe")),
+                ("sys_user", dict(user_name="jane.smith")),
+                ("sys_user", dict(user_name="admin")),
+                ("sys_user_group", dict(name="IT Support")),
+            ],
+            must_exist=True,
+        )
+
         expected_fields = {
             "request_state": "submitted",
             "short_description": "Test request",
@@ -222,7 +232,7 @@ class TestErrorHandling:
             short_description="Test request",
             **{user_field: "nonexistent.user"}
         )
-        table_client.get_record.side_effect = errors.ServiceNowError(error_message)
+        table_client.get_records.side_effect = errors.ServiceNowError(error_message)
 
         with pytest.raises(errors.ServiceNowError, match=error_message):
             catalog_request.build_payload(module, table_client)
@@ -233,7 +243,7 @@ class TestErrorHandling:
             short_description="Test request",
             assignment_group="nonexistent group",
         )
-        table_client.get_record.side_effect = errors.ServiceNowError("Group not found")
+        table_client.get_records.side_effect = errors.ServiceNowError("Group not found")
 
         with pytest.raises(errors.ServiceNowError, match="Group not found"):
             catalog_request.build_payload(module, table_client)
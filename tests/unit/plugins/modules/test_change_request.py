@@ -337,7 +337,7 @@ class TestBuildPayload:
                 other=None,
             ),
         )
-        table_client.get_record.side_effect = [
+        table_client.get_records.return_value = [
             {"sys_id": "681ccaf9c0a8016400b98a06818d57c7"},
             {"sys_id": "d625dccec0a8016700a222a0f7900d06"},
             {"sys_id": "deb8544047810200e90d87e8dee490af"},
@@ -345,6 +345,15 @@ class TestBuildPayload:
 
         result = change_request.build_payload(module, table_client)
 
+        table_client.get_records.assert_called_once_with(
+            [
+                ("sys_user", dict(user_name="admin")),
+                ("sys_user_group", dict(name="Network")),
+                ("std_change_producer_version", dict(name="Some template")),
+            ],
+            must_exist=True,
+        )
+
         assert result["state"] == "new"
         assert result["type"] == "normal"
         assert (
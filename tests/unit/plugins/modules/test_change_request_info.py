@@ -100,7 +100,7 @@ class TestRun:
                 sysparm_display_value="true",
             )
         )
-        table_client.list_records.return_value = [
+        table_client.iter_records.return_value = [
             dict(p=1, sys_id=1234),
             dict(q=2, sys_id=4321),
             dict(r=3, sys_id=1212),
@@ -123,7 +123,7 @@ class TestRun:
             module, table_client, attachment_client
         )
 
-        table_client.list_records.assert_called_once_with(
+        table_client.iter_records.assert_called_once_with(
             "change_request", dict(number="n", sysparm_display_value="true")
         )
 
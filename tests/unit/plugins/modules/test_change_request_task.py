@@ -332,7 +332,7 @@ class TestBuildPayload:
                 number=None,
             ),
         )
-        table_client.get_record.side_effect = [
+        table_client.get_records.return_value = [
             {"sys_id": "c248952584a34ae1a851a38d7fc08fcf"},
             {"sys_id": "e361760abb09450da835b5e4f2271dcf"},
             {"sys_id": "4488052c5f5248f8b787ec9df5459c09"},
@@ -341,6 +341,16 @@ class TestBuildPayload:
 
         result = change_request_task.build_payload(module, table_client)
 
+        table_client.get_records.assert_called_once_with(
+            [
+                ("cmdb_ci", dict(name="config item")),
+                ("change_request", dict(number="CR1234")),
+                ("sys_user", dict(user_name="some.user")),
+                ("sys_user_group", dict(name="some.group")),
+            ],
+            must_exist=True,
+        )
+
         assert result["change_task_type"] == "planning"
         assert result["on_hold_reason"] == "Some reason"
         assert result["cmdb_ci"] == "c248952584a34ae1a851a38d7fc08fcf"
@@ -383,7 +393,7 @@ class TestBuildPayload:
                 number=None,
             ),
         )
-        table_client.get_record.side_effect = [
+        table_client.get_records.return_value = [
             {"sys_id": "c248952584a34ae1a851a38d7fc08fcf"},
             {"sys_id": "e361760abb09450da835b5e4f2271dcf"},
         ]
@@ -127,11 +127,11 @@ class TestRun:
                 sysparm_display_value="true",
             )
         )
-        table_client.list_records.return_value = [dict(p=1), dict(q=2), dict(r=3)]
+        table_client.iter_records.return_value = [dict(p=1), dict(q=2), dict(r=3)]
 
         change_requests = change_request_task_info.run(module, table_client)
 
-        table_client.list_records.assert_called_once_with(
+        table_client.iter_records.assert_called_once_with(
             "change_task", dict(number="n", sysparm_display_value="true")
         )
         assert change_requests == [dict(p=1), dict(q=2), dict(r=3)]
@@ -5,6 +5,12 @@ __metaclass__ = type
 import sys
 
 import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    errors,
+    ire,
+    journal,
+)
+from ansible_collections.servicenow.itsm.plugins.module_utils.client import Response
 from ansible_collections.servicenow.itsm.plugins.modules import configuration_item_batch
 
 pytestmark = pytest.mark.skipif(
@@ -12,6 +18,47 @@ pytestmark = pytest.mark.skipif(
 )
 
 
+class TestIdentityQueries:
+    def test_single_column(self):
+        rows = [dict(name="a"), dict(name="b"), dict(name="A"), dict(name="c")]
+
+        queries = configuration_item_batch.identity_queries(["name"], rows)
+
+        assert ["nameINa,b,c"] == queries
+
+    def test_single_column_special_values(self):
+        rows = [dict(name="a"), dict(name="b,c"), dict(name=""), dict(name="d^e")]
+
+        queries = configuration_item_batch.identity_queries(["name"], rows)
+
+        assert ["nameINa^NQname=b,c^NQnameISEMPTY^NQname=d^^e"] == queries
+
+    def test_multiple_columns(self):
+        rows = [
+            dict(name="a", ip_address="1.1.1.1"),
+            dict(name="b", ip_address=None),
+        ]
+
+        queries = configuration_item_batch.identity_queries(
+            ["name", "ip_address"], rows
+        )
+
+        assert [
+            "name=a^ip_address=1.1.1.1^NQname=b^ip_addressISEMPTY",
+        ] == queries
+
+    def test_chunks(self):
+        rows = [dict(name="host{0:03d}".format(i)) for i in range(100)]
+
+        queries = configuration_item_batch.identity_queries(
+            ["name"], rows, max_length=100
+        )
+
+        assert all(len(q) <= 100 for q in queries)
+        names = [n for q in queries for n in q[len("nameIN") :].split(",")]
+        assert [r["name"] for r in rows] == names
+
+
 class TestUpdate:
     def test_update_create_record(self, create_module, table_client):
         module = create_module(
@@ -26,9 +73,9 @@ class TestUpdate:
                 ],
             )
         )
-        table_client.get_record.return_value = None
+        table_client.list_records.return_value = []
 
-        result, changed = configuration_item_batch.update(module, table_client)
+        result, changed, summary = configuration_item_batch.update(module, table_client)
 
         table_client.create_record.assert_called_once()
         table_client.update_record.assert_not_called()
@@ -48,11 +95,11 @@ class TestUpdate:
             )
         )
 
-        table_client.get_record.return_value = dict(
-            ip_address="1.2.3.4", name="my_name", vm_inst_id="12345"
-        )
+        table_client.list_records.return_value = [
+            dict(ip_address="1.2.3.4", name="my_name", vm_inst_id="12345")
+        ]
 
-        result, changed = configuration_item_batch.update(module, table_client)
+        result, changed, summary = configuration_item_batch.update(module, table_client)
 
         table_client.create_record.assert_not_called()
         table_client.update_record.assert_not_called()
@@ -72,12 +119,760 @@ class TestUpdate:
             )
         )
 
-        table_client.get_record.return_value = dict(
-            ip_address="1.1.1.1", name="my_name", vm_inst_id="12345"
-        )
+        table_client.list_records.return_value = [
+            dict(ip_address="1.1.1.1", name="my_name", vm_inst_id="12345")
+        ]
 
-        result, changed = configuration_item_batch.update(module, table_client)
+        result, changed, summary = configuration_item_batch.update(module, table_client)
 
         table_client.create_record.assert_not_called()
         table_client.update_record.assert_called_once()
         assert changed is True
+
+    def test_fetch_in_bulk(self, create_module, table_client):
+        module = create_module(
+            params=dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                dataset=[
+                    dict(name="a", ip_address="1.1.1.1"),
+                    dict(name="B", ip_address="2.2.2.2"),
+                    dict(name="c", ip_address="3.3.3.3"),
+                ],
+            )
+        )
+        table_client.list_records.return_value = [
+            dict(name="a", ip_address="1.1.1.1", sys_id="1"),
+            dict(name="b", ip_address="0.0.0.0", sys_id="2"),
+        ]
+        table_client.update_record.return_value = dict(name="B", sys_id="2")
+        table_client.create_record.return_value = dict(name="c", sys_id="3")
+
+        result, changed, summary = configuration_item_batch.update(module, table_client)
+
+        table_client.list_records.assert_called_once_with(
+            "cmdb_ci_server", dict(sysparm_query="nameINa,B,c")
+        )
+        assert [
+            dict(name="a", ip_address="1.1.1.1", sys_id="1"),
+            dict(name="B", sys_id="2"),
+            dict(name="c", sys_id="3"),
+        ] == result
+        assert changed is True
+        assert dict(created=1, updated=1, unchanged=1, failed=0) == summary
+
+    @pytest.mark.parametrize(
+        "result_mode,expected",
+        [
+            (
+                "changed_only",
+                [dict(name="B", sys_id="2"), dict(name="c", sys_id="3")],
+            ),
+            (
+                "summary",
+                [
+                    dict(index=1, operation="updated", name="B", sys_id="2"),
+                    dict(index=2, operation="created", name="c", sys_id="3"),
+                ],
+            ),
+        ],
+    )
+    def test_result_mode(self, create_module, table_client, result_mode, expected):
+        module = create_module(
+            params=dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                dataset=[
+                    dict(name="a", ip_address="1.1.1.1"),
+                    dict(name="B", ip_address="2.2.2.2"),
+                    dict(name="c", ip_address="3.3.3.3"),
+                ],
+                result_mode=result_mode,
+            )
+        )
+        table_client.list_records.return_value = [
+            dict(name="a", ip_address="1.1.1.1", sys_id="1"),
+            dict(name="b", ip_address="0.0.0.0", sys_id="2"),
+        ]
+        table_client.update_record.return_value = dict(name="B", sys_id="2")
+        table_client.create_record.return_value = dict(name="c", sys_id="3")
+
+        result, changed, summary = configuration_item_batch.update(module, table_client)
+
+        assert expected == result
+        assert dict(created=1, updated=1, unchanged=1, failed=0) == summary
+
+    def test_duplicated_rows(self, create_module, table_client):
+        module = create_module(
+            params=dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                dataset=[
+                    dict(name="a", ip_address="1.1.1.1"),
+                    dict(name="a", ip_address="1.1.1.1"),
+                ],
+            )
+        )
+        table_client.list_records.return_value = []
+        table_client.create_record.return_value = dict(
+            name="a", ip_address="1.1.1.1", sys_id="1"
+        )
+
+        result, changed, summary = configuration_item_batch.update(module, table_client)
+
+        table_client.create_record.assert_called_once()
+        assert result[0] == result[1]
+        assert dict(created=1, updated=0, unchanged=1, failed=0) == summary
+
+    def test_ambiguous_identity(self, create_module, table_client):
+        module = create_module(
+            params=dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                dataset=[dict(name="a")],
+            )
+        )
+        table_client.list_records.return_value = [
+            dict(name="a", sys_id="1"),
+            dict(name="a", sys_id="2"),
+        ]
+
+        with pytest.raises(errors.ServiceNowError, match="2 cmdb_ci_server records"):
+            configuration_item_batch.update(module, table_client)
+
+
+class TestCollect:
+    def test_full(self):
+        results, changed, summary = configuration_item_batch.collect(
+            3,
+            [[2, 0], [1]],
+            [
+                [
+                    (dict(sys_id="3"), "unchanged", None),
+                    (dict(sys_id="1"), "created", None),
+                ],
+                [(dict(sys_id="2"), "updated", None)],
+            ],
+        )
+
+        assert ["1", "2", "3"] == [r["sys_id"] for r in results]
+        assert changed is True
+        assert dict(created=1, updated=1, unchanged=1, failed=0) == summary
+
+    def test_synced_before_reduction(self):
+        synced = set()
+
+        results, changed, summary = configuration_item_batch.collect(
+            2,
+            [[0, 1]],
+            [
+                [
+                    (dict(sys_id="1", name="a"), "unchanged", None),
+                    (dict(sys_id="2", name="b"), "updated", None),
+                ]
+            ],
+            result_mode="summary",
+            id_column_set=["name"],
+            synced=synced,
+        )
+
+        assert ["2"] == [r["sys_id"] for r in results]
+        assert set(["1", "2"]) == synced
+
+    def test_summary_with_failures(self):
+        with pytest.raises(
+            configuration_item_batch.ItemErrors, match="1 of 3 dataset items failed"
+        ) as exc:
+            configuration_item_batch.collect(
+                3,
+                [[0, 1, 2]],
+                [
+                    [
+                        (dict(sys_id="1", name="a", os="Linux"), "created", None),
+                        (None, None, "Bad"),
+                        (dict(sys_id="3", name="c"), "unchanged", None),
+                    ]
+                ],
+                result_mode="summary",
+                id_column_set=["name"],
+            )
+
+        assert [
+            dict(index=0, operation="created", sys_id="1", name="a")
+        ] == exc.value.results
+        assert dict(created=1, updated=0, unchanged=1, failed=1) == exc.value.summary
+
+
+class TestUpdateConcurrency:
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_results_in_dataset_order(self, create_module, table_client, concurrency):
+        dataset = [dict(name="host{0}".format(i), os="Linux") for i in range(10)]
+        module = create_module(
+            params=dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                dataset=dataset,
+                concurrency=concurrency,
+            )
+        )
+        table_client.list_records.return_value = [
+            dict(name="host{0}".format(i), os="Linux", sys_id=str(i))
+            for i in range(0, 10, 2)
+        ]
+        table_client.create_record.side_effect = lambda table, desired, check: dict(
+            desired, sys_id="new"
+        )
+
+        result, changed, summary = configuration_item_batch.update(module, table_client)
+
+        assert [r["name"] for r in result] == [d["name"] for d in dataset]
+        assert [r["sys_id"] for r in result[:4]] == ["0", "new", "2", "new"]
+        assert 5 == len(table_client.create_record.mock_calls)
+        assert changed is True
+
+    def test_same_identity_is_synced_in_order(self, create_module, table_client):
+        module = create_module(
+            params=dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                dataset=[dict(name="a", os="Linux"), dict(name="a", os="AIX")],
+                concurrency=4,
+            )
+        )
+        table_client.list_records.return_value = []
+        table_client.create_record.return_value = dict(name="a", os="Linux", sys_id="1")
+        table_client.update_record.return_value = dict(name="a", os="AIX", sys_id="1")
+
+        result, changed, summary = configuration_item_batch.update(module, table_client)
+
+        table_client.update_record.assert_called_once_with(
+            "cmdb_ci_server",
+            dict(name="a", os="Linux", sys_id="1"),
+            dict(name="a", os="AIX"),
+            False,
+        )
+        assert [
+            dict(name="a", os="Linux", sys_id="1"),
+            dict(name="a", os="AIX", sys_id="1"),
+        ] == result
+
+    def test_partial_failure(self, create_module, table_client):
+        module = create_module(
+            params=dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                dataset=[dict(name="a"), dict(name="b"), dict(name="c")],
+                concurrency=2,
+            )
+        )
+        table_client.list_records.return_value = []
+
+        def create_record(table, desired, check_mode):
+            if desired["name"] == "b":
+                raise errors.UnexpectedAPIResponse(403, "Insufficient rights")
+            return dict(desired, sys_id=desired["name"])
+
+        table_client.create_record.side_effect = create_record
+
+        with pytest.raises(configuration_item_batch.ItemErrors) as exc:
+            configuration_item_batch.update(module, table_client)
+
+        assert "1 of 3 dataset items failed" in str(exc.value)
+        assert [dict(name="a", sys_id="a"), None, dict(name="c", sys_id="c")] == (
+            exc.value.results
+        )
+        assert exc.value.changed is True
+        assert 1 == len(exc.value.failures)
+        assert 1 == exc.value.failures[0]["index"]
+        assert "403" in exc.value.failures[0]["msg"]
+
+
+class TestUpdateJournal:
+    @staticmethod
+    def module_params(**params):
+        return dict(
+            dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                dataset=[dict(name="a", os="Linux"), dict(name="b", os="AIX")],
+            ),
+            **params
+        )
+
+    @staticmethod
+    def record(sys_id, name, os, mod_count="1"):
+        return dict(
+            sys_id=sys_id,
+            name=name,
+            os=os,
+            sys_updated_on="2026-10-17 10:00:0" + mod_count,
+            sys_mod_count=mod_count,
+        )
+
+    def sync(self, create_module, table_client, path, params, current):
+        module = create_module(params=self.module_params(**params))
+        table_client.reset_mock()
+
+        def list_records(table, query):
+            if "sysparm_fields" in query:
+                fields = ["sys_id"] + ["sys_updated_on", "sys_mod_count"]
+                return [
+                    dict((f, r[f]) for f in fields)
+                    for r in current
+                    if r["sys_id"] in query["sysparm_query"]
+                ]
+            return [r for r in current if r["name"] in query["sysparm_query"]]
+
+        table_client.list_records.side_effect = list_records
+        table_client.update_record.side_effect = lambda t, c, d, cm: dict(
+            c, sys_mod_count="2", sys_updated_on="2026-10-17 10:00:02", **d
+        )
+        with journal.Journal(str(path)) as sync_journal:
+            return configuration_item_batch.update(module, table_client, sync_journal)
+
+    def test_rerun_skips_synced_items(self, create_module, table_client, tmp_path):
+        path = tmp_path / "journal"
+        current = [self.record("1", "a", "Linux"), self.record("2", "b", "Linux")]
+
+        results, changed, summary = self.sync(
+            create_module, table_client, path, {}, current
+        )
+
+        assert changed is True
+        table_client.update_record.assert_called_once()
+
+        current = [results[0], results[1]]
+        results, changed, summary = self.sync(
+            create_module, table_client, path, {}, current
+        )
+
+        assert changed is False
+        assert [
+            dict(
+                name="a",
+                os="Linux",
+                sys_id="1",
+                sys_updated_on="2026-10-17 10:00:01",
+                sys_mod_count="1",
+            ),
+            dict(
+                name="b",
+                os="AIX",
+                sys_id="2",
+                sys_updated_on="2026-10-17 10:00:02",
+                sys_mod_count="2",
+            ),
+        ] == results
+        table_client.list_records.assert_called_once_with(
+            "cmdb_ci_server",
+            dict(
+                sysparm_query="sys_idIN1,2",
+                sysparm_fields="sys_id,sys_updated_on,sys_mod_count",
+            ),
+        )
+        table_client.update_record.assert_not_called()
+
+    def test_changed_records_are_synced(self, create_module, table_client, tmp_path):
+        path = tmp_path / "journal"
+        current = [self.record("1", "a", "Linux"), self.record("2", "b", "AIX")]
+        self.sync(create_module, table_client, path, {}, current)
+
+        # Someone else changed record b since.
+        current = [self.record("1", "a", "Linux"), self.record("2", "b", "HP-UX", "3")]
+        results, changed, summary = self.sync(
+            create_module, table_client, path, {}, current
+        )
+
+        assert changed is True
+        assert "AIX" == results[1]["os"]
+        table_client.update_record.assert_called_once()
+        assert [
+            dict(sysparm_query="nameINb"),
+        ] == [
+            c[0][1]
+            for c in table_client.list_records.call_args_list
+            if "sysparm_fields" not in c[0][1]
+        ]
+
+    def test_changed_items_are_synced(self, create_module, table_client, tmp_path):
+        path = tmp_path / "journal"
+        current = [self.record("1", "a", "Linux"), self.record("2", "b", "AIX")]
+        self.sync(create_module, table_client, path, {}, current)
+
+        results, changed, summary = self.sync(
+            create_module,
+            table_client,
+            path,
+            dict(dataset=[dict(name="a", os="Linux"), dict(name="b", os="Solaris")]),
+            current,
+        )
+
+        assert changed is True
+        assert "Solaris" == results[1]["os"]
+        table_client.update_record.assert_called_once()
+
+    def test_check_mode_does_not_record(self, create_module, table_client, tmp_path):
+        path = tmp_path / "journal"
+        module = create_module(params=self.module_params(), check_mode=True)
+        table_client.list_records.return_value = []
+        table_client.create_record.side_effect = lambda t, d, cm: d
+
+        with journal.Journal(str(path)) as sync_journal:
+            configuration_item_batch.update(module, table_client, sync_journal)
+
+        with journal.Journal(str(path)) as sync_journal:
+            assert {} == sync_journal.entries
+
+
+class TestReconcile:
+    @staticmethod
+    def module_params(**params):
+        return dict(
+            dict(
+                sys_class_name="cmdb_ci_server",
+                dataset=[dict(name="a"), dict(name="b", os="AIX"), dict(name="c")],
+                relations=None,
+                chunk_size=100,
+                concurrency=1,
+            ),
+            **params
+        )
+
+    def test_reconcile(self, mocker, create_module, table_client):
+        module = create_module(params=self.module_params())
+        ire_client = mocker.Mock(spec=ire.IREClient)
+        ire_client.identify_reconcile.return_value = [
+            ire.IREItem(dict(operation="INSERT", sysId="1")),
+            ire.IREItem(dict(operation="NO_CHANGE", sysId="2")),
+            ire.IREItem(dict(operation="UPDATE", sysId="3")),
+        ]
+        table_client.list_records.return_value = [
+            dict(sys_id="3", name="c"),
+            dict(sys_id="1", name="a"),
+            dict(sys_id="2", name="b", os="AIX"),
+        ]
+
+        results, changed, summary = configuration_item_batch.reconcile(
+            module, ire_client, table_client
+        )
+
+        assert changed is True
+        assert ["1", "2", "3"] == [r["sys_id"] for r in results]
+        ire_client.identify_reconcile.assert_called_once_with(
+            "cmdb_ci_server",
+            [dict(name="a"), dict(name="b", os="AIX"), dict(name="c")],
+            [],
+            dry_run=False,
+        )
+        table_client.list_records.assert_called_once_with(
+            "cmdb_ci_server", dict(sysparm_query="sys_idIN1,2,3")
+        )
+
+    def test_chunks_and_relations(self, mocker, create_module, table_client):
+        module = create_module(
+            params=self.module_params(
+                chunk_size=1,
+                relations=[dict(parent=2, child=0, type="Depends on::Used by")],
+            )
+        )
+        ire_client = mocker.Mock(spec=ire.IREClient)
+        ire_client.identify_reconcile.side_effect = lambda table, items, *a, **kw: [
+            ire.IREItem(dict(operation="NO_CHANGE", sysId=i["name"])) for i in items
+        ]
+        table_client.list_records.side_effect = lambda table, query: [
+            dict(sys_id=s, name=s)
+            for s in query["sysparm_query"][len("sys_idIN") :].split(",")
+        ]
+
+        results, changed, summary = configuration_item_batch.reconcile(
+            module, ire_client, table_client
+        )
+
+        assert changed is False
+        assert ["a", "b", "c"] == [r["sys_id"] for r in results]
+        assert [
+            mocker.call(
+                "cmdb_ci_server",
+                [dict(name="a"), dict(name="c")],
+                [dict(parent=1, child=0, type="Depends on::Used by")],
+                dry_run=False,
+            ),
+            mocker.call(
+                "cmdb_ci_server", [dict(name="b", os="AIX")], [], dry_run=False
+            ),
+        ] == ire_client.identify_reconcile.call_args_list
+
+    def test_check_mode(self, mocker, create_module, table_client):
+        module = create_module(params=self.module_params(), check_mode=True)
+        ire_client = mocker.Mock(spec=ire.IREClient)
+        ire_client.identify_reconcile.return_value = [
+            ire.IREItem(dict(operation="INSERT")),
+            ire.IREItem(dict(operation="UPDATE", sysId="2")),
+            ire.IREItem(dict(operation="UPDATE", sysId="3")),
+        ]
+        table_client.list_records.return_value = [
+            dict(sys_id="2", name="b", os="AIX"),
+            dict(sys_id="3", name="c", os="Linux"),
+        ]
+        module.params["dataset"][2]["os"] = "AIX"
+
+        results, changed, summary = configuration_item_batch.reconcile(
+            module, ire_client, table_client
+        )
+
+        assert changed is True
+        assert [
+            dict(name="a"),
+            dict(sys_id="2", name="b", os="AIX"),
+            dict(sys_id="3", name="c", os="AIX"),
+        ] == results
+        assert ire_client.identify_reconcile.call_args[1] == dict(dry_run=True)
+
+    def test_item_errors(self, mocker, create_module, table_client):
+        module = create_module(params=self.module_params(chunk_size=2))
+        ire_client = mocker.Mock(spec=ire.IREClient)
+        ire_client.identify_reconcile.side_effect = [
+            [
+                ire.IREItem(dict(operation="INSERT", sysId="1")),
+                ire.IREItem(
+                    dict(
+                        operation="NO_CHANGE",
+                        errors=[dict(error="INVALID_INPUT_DATA", message="Bad os")],
+                    )
+                ),
+            ],
+            errors.UnexpectedAPIResponse(400, "Invalid payload"),
+        ]
+        table_client.list_records.return_value = [dict(sys_id="1", name="a")]
+
+        with pytest.raises(configuration_item_batch.ItemErrors) as exc:
+            configuration_item_batch.reconcile(module, ire_client, table_client)
+
+        assert [dict(sys_id="1", name="a"), None, None] == exc.value.results
+        assert exc.value.changed is True
+        assert [1, 2] == [f["index"] for f in exc.value.failures]
+        assert dict(created=1, updated=0, unchanged=0, failed=2) == exc.value.summary
+        assert "INVALID_INPUT_DATA: Bad os" == exc.value.failures[0]["msg"]
+        assert "400" in exc.value.failures[1]["msg"]
+
+
+class TestRetireMissing:
+    @staticmethod
+    def module_params(**params):
+        return dict(
+            dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                dataset=[dict(name="A"), dict(name="b")],
+                scope="discovery_source=AWS",
+                retire_action="retire",
+                retired_values=dict(install_status="7"),
+                concurrency=1,
+            ),
+            **params
+        )
+
+    def test_retire(self, create_module, table_client):
+        module = create_module(params=self.module_params())
+        table_client.iter_records.return_value = iter(
+            [
+                dict(sys_id="1", name="a", install_status="1"),
+                dict(sys_id="2", name="c", install_status="1"),
+                dict(sys_id="3", name="d", install_status="7"),
+                dict(sys_id="4", name="e", install_status="1"),
+            ]
+        )
+        table_client.update_record.side_effect = lambda t, r, p, cm: dict(r, **p)
+
+        retired, failures = configuration_item_batch.retire_missing(
+            module, table_client
+        )
+
+        assert [
+            dict(sys_id="2", name="c", install_status="7"),
+            dict(sys_id="4", name="e", install_status="7"),
+        ] == retired
+        assert [] == failures
+        table_client.iter_records.assert_called_once_with(
+            "cmdb_ci_server",
+            dict(
+                sysparm_query="discovery_source=AWS^sys_class_name=cmdb_ci_server",
+                sysparm_fields="sys_id,name,install_status",
+            ),
+        )
+
+    def test_keep_synced(self, create_module, table_client):
+        # IRE can match records by other fields than the id_column_set.
+        module = create_module(params=self.module_params())
+        table_client.iter_records.return_value = iter(
+            [
+                dict(sys_id="1", name="old-a", install_status="1"),
+                dict(sys_id="2", name="c", install_status="1"),
+            ]
+        )
+        table_client.update_record.side_effect = lambda t, r, p, cm: dict(r, **p)
+
+        retired, failures = configuration_item_batch.retire_missing(
+            module, table_client, set(["1"])
+        )
+
+        assert ["2"] == [r["sys_id"] for r in retired]
+
+    def test_delete(self, create_module, table_client):
+        module = create_module(
+            params=self.module_params(retire_action="delete", concurrency=2)
+        )
+        table_client.iter_records.return_value = iter(
+            [dict(sys_id="1", name="b"), dict(sys_id="2", name="c")]
+        )
+
+        def delete_record(table, record, check_mode):
+            if record["sys_id"] == "2":
+                raise errors.UnexpectedAPIResponse(403, "Forbidden")
+
+        table_client.delete_record.side_effect = delete_record
+        table_client.iter_records.return_value = iter(
+            [
+                dict(sys_id="1", name="c"),
+                dict(sys_id="2", name="d"),
+                dict(sys_id="3", name="b"),
+            ]
+        )
+
+        retired, failures = configuration_item_batch.retire_missing(
+            module, table_client
+        )
+
+        assert [dict(sys_id="1", name="c")] == retired
+        assert ["2"] == [f["sys_id"] for f in failures]
+        assert "403" in failures[0]["msg"]
+        assert (
+            "sys_id,name" == table_client.iter_records.call_args[0][1]["sysparm_fields"]
+        )
+
+    def test_check_mode(self, create_module, table_client):
+        module = create_module(params=self.module_params(), check_mode=True)
+        table_client.iter_records.return_value = iter(
+            [dict(sys_id="2", name="c", install_status="1")]
+        )
+
+        retired, failures = configuration_item_batch.retire_missing(
+            module, table_client
+        )
+
+        assert [dict(sys_id="2", name="c", install_status="7")] == retired
+        table_client.update_record.assert_not_called()
+
+    def test_batch(self, mocker, create_module, table_client):
+        module = create_module(params=self.module_params())
+        table_client.iter_records.return_value = iter(
+            [
+                dict(sys_id="1", name="c", install_status="1"),
+                dict(sys_id="2", name="d", install_status="1"),
+            ]
+        )
+        table_client.path.side_effect = (
+            lambda t, sys_id: "api/now/table/{0}/{1}".format(t, sys_id)
+        )
+        table_client.client = mocker.MagicMock(batch_requests=True)
+        batch = table_client.client.batch.return_value.__enter__.return_value
+        batch.patch.side_effect = [
+            mocker.Mock(
+                response=Response(
+                    200, '{"result": {"sys_id": "1", "install_status": "7"}}'
+                )
+            ),
+            mocker.Mock(response=Response(403, '{"error": "Forbidden"}')),
+        ]
+
+        retired, failures = configuration_item_batch.retire_missing(
+            module, table_client
+        )
+
+        assert [dict(sys_id="1", install_status="7")] == retired
+        assert ["2"] == [f["sys_id"] for f in failures]
+        batch.patch.assert_any_call(
+            "api/now/table/cmdb_ci_server/1",
+            dict(install_status="7"),
+            query=dict(sysparm_exclude_reference_link="true"),
+        )
+        table_client.update_record.assert_not_called()
+
+
+class TestValidateParams:
+    @staticmethod
+    def params(**params):
+        return dict(
+            dict(
+                engine="table",
+                id_column_set=["name"],
+                dataset=[dict(name="a"), dict(name="b")],
+                concurrency=1,
+                chunk_size=100,
+                relations=None,
+                journal=None,
+                sync="merge",
+                scope=None,
+            ),
+            **params
+        )
+
+    def test_valid(self):
+        assert configuration_item_batch.validate_params(self.params()) is None
+        assert (
+            configuration_item_batch.validate_params(
+                self.params(
+                    engine="ire",
+                    id_column_set=None,
+                    relations=[dict(parent=0, child=1, type="Depends on::Used by")],
+                )
+            )
+            is None
+        )
+
+    @pytest.mark.parametrize(
+        "params,msg",
+        [
+            (dict(dataset=None), "dataset_file can only be read on the controller"),
+            (dict(id_column_set=None), "id_column_set should not be empty"),
+            (
+                dict(relations=[dict(parent=0, child=1, type="t")]),
+                "relations can only be used with the ire engine",
+            ),
+            (
+                dict(engine="ire", journal="/tmp/journal"),
+                "journal can only be used with the table engine",
+            ),
+            (
+                dict(engine="ire", id_column_set=None, sync="authoritative"),
+                "id_column_set is required for authoritative sync",
+            ),
+            (dict(sync="authoritative"), "scope is required for authoritative sync"),
+            (
+                dict(sync="authoritative", scope="a=b", dataset=[]),
+                "dataset is empty, which would retire all the records in scope, "
+                "set allow_empty_dataset to do that",
+            ),
+            (dict(concurrency=0), "concurrency should be at least 1"),
+            (dict(engine="ire", chunk_size=0), "chunk_size should be at least 1"),
+            (
+                dict(engine="ire", relations=[dict(parent=0, child=2, type="t")]),
+                "relation child 2 is not a dataset position",
+            ),
+        ],
+    )
+    def test_invalid(self, params, msg):
+        assert msg == configuration_item_batch.validate_params(self.params(**params))
+
+    def test_allow_empty_dataset(self):
+        assert (
+            configuration_item_batch.validate_params(
+                self.params(
+                    sync="authoritative",
+                    scope="a=b",
+                    dataset=[],
+                    allow_empty_dataset=True,
+                )
+            )
+            is None
+        )
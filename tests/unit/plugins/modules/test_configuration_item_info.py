@@ -121,7 +121,7 @@ class TestRun:
                 sysparm_display_value="true",
             )
         )
-        table_client.list_records.return_value = [
+        table_client.iter_records.return_value = [
             dict(p=1, sys_id=1234),
             dict(q=2, sys_id=4321),
             dict(r=3, sys_id=1212),
@@ -142,7 +142,7 @@ class TestRun:
 
         records = configuration_item_info.run(module, table_client, attachment_client)
 
-        table_client.list_records.assert_called_once_with(
+        table_client.iter_records.assert_called_once_with(
             "cmdb_ci",
             dict(
                 sys_id="01a9ec0d3790200044e0bfc8bcbe5dc3", sysparm_display_value="true"
@@ -237,9 +237,9 @@ class TestRun:
             )
         )
 
-        table_client.list_records.return_value = []
+        table_client.iter_records.return_value = []
         attachment_client.list_records.return_value = []
 
         configuration_item_info.run(module, table_client, attachment_client)
 
-        table_client.list_records.assert_called_once_with("cmdb_ci", query)
+        table_client.iter_records.assert_called_once_with("cmdb_ci", query)
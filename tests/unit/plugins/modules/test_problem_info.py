@@ -88,7 +88,7 @@ class TestRun:
                 sysparm_display_value="true",
             )
         )
-        table_client.list_records.return_value = [
+        table_client.iter_records.return_value = [
             dict(p=1, sys_id=1234),
             dict(q=2, sys_id=4321),
             dict(r=3, sys_id=1212),
@@ -109,7 +109,7 @@ class TestRun:
 
         problems = problem_info.run(module, table_client, attachment_client)
 
-        table_client.list_records.assert_called_once_with(
+        table_client.iter_records.assert_called_once_with(
             "problem", dict(number="n", sysparm_display_value="true")
         )
         attachment_client.list_records.assert_any_call(
@@ -74,12 +74,22 @@ class TestBuildPayload:
                 other=None,
             ),
         )
-        table_client.get_record.return_value = {
-            "sys_id": "681ccaf9c0a8016400b98a06818d57c7"
-        }
+        table_client.get_records.return_value = [
+            {"sys_id": "681ccaf9c0a8016400b98a06818d57c7"}
+        ] * 4
 
         result = problem_task.build_payload(module, table_client)
 
+        table_client.get_records.assert_called_once_with(
+            [
+                ("cmdb_ci", dict(name="P1000001")),
+                ("problem", dict(number="PRB0007601")),
+                ("sys_user_group", dict(name="network")),
+                ("sys_user", dict(user_name="admin")),
+            ],
+            must_exist=True,
+        )
+
         assert result["state"] == "new"
         assert result["type"] == "general"
         assert result["configuration_item"] == "P1000001"
@@ -110,9 +120,9 @@ class TestBuildPayload:
                 other=dict(notify="1"),
             ),
         )
-        table_client.get_record.return_value = {
-            "sys_id": "681ccaf9c0a8016400b98a06818d57c7"
-        }
+        table_client.get_records.return_value = [
+            {"sys_id": "681ccaf9c0a8016400b98a06818d57c7"}
+        ] * 2
 
         result = problem_task.build_payload(module, table_client)
 
@@ -145,9 +155,9 @@ class TestEnsurePresent:
                 other=None,
             ),
         )
-        table_client.get_record.return_value = {
-            "sys_id": "681ccaf9c0a8016400b98a06818d57c7"
-        }
+        table_client.get_records.return_value = [
+            {"sys_id": "681ccaf9c0a8016400b98a06818d57c7"}
+        ] * 2
         table_client.create_record.return_value = dict(
             state="151",
             type="general",
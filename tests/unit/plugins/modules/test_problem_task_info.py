@@ -88,11 +88,11 @@ class TestRun:
                 sysparm_display_value="true",
             )
         )
-        table_client.list_records.return_value = [dict(p=1), dict(q=2), dict(r=3)]
+        table_client.iter_records.return_value = [dict(p=1), dict(q=2), dict(r=3)]
 
         problems = problem_task_info.run(module, table_client)
 
-        table_client.list_records.assert_called_once_with(
+        table_client.iter_records.assert_called_once_with(
             "problem_task", dict(number="n", sysparm_display_value="true")
         )
         assert problems == [dict(p=1), dict(q=2), dict(r=3)]